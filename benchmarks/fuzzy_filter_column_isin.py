@@ -0,0 +1,107 @@
+"""
+Benchmark fuzzy `filter_column_isin` on synthetic vendor names.
+
+Compares the n-gram indexed lookup against comparing every pair of strings,
+and shows how the indexed lookup scales with more processes.
+
+Run with:
+
+.. code-block:: bash
+
+    python benchmarks/fuzzy_filter_column_isin.py
+"""
+
+import random
+import string
+import time
+
+import pandas as pd
+
+import janitor  # noqa: F401
+from janitor import NGramIndex
+from janitor.functions import _levenshtein
+
+SYLLABLES = [
+    consonant + vowel + coda
+    for consonant in "bcdfghklmnprstvz"
+    for vowel in "aeiou"
+    for coda in ["", "n", "r", "x"]
+]
+SUFFIXES = ["Inc", "Corp", "Ltd", "GmbH", "LLC", "Group", "Holdings"]
+
+
+def make_name(rng: random.Random) -> str:
+    word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+    return f"{word.capitalize()} {rng.choice(SUFFIXES)}"
+
+
+def make_dirty(name: str, rng: random.Random) -> str:
+    """Apply one or two random typos to a name."""
+    chars = list(name)
+    for _ in range(rng.randint(1, 2)):
+        position = rng.randrange(len(chars))
+        operation = rng.choice(["insert", "delete", "substitute"])
+        if operation == "insert":
+            chars.insert(position, rng.choice(string.ascii_lowercase))
+        elif operation == "delete" and len(chars) > 1:
+            del chars[position]
+        else:
+            chars[position] = rng.choice(string.ascii_lowercase)
+    return "".join(chars)
+
+
+def brute_force(queries, references, threshold):
+    matches = 0
+    for query in queries:
+        for reference in references:
+            max_distance = int(
+                (1 - threshold) * max(len(query), len(reference))
+            )
+            if _levenshtein(query, reference, max_distance) <= max_distance:
+                matches += 1
+                break
+    return matches
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(n_references=20_000, n_queries=20_000, threshold=0.8, seed=42):
+    rng = random.Random(seed)
+    references = list({make_name(rng) for _ in range(n_references)})
+    queries = [
+        make_dirty(rng.choice(references), rng) for _ in range(n_queries)
+    ]
+    df = pd.DataFrame({"vendor": queries})
+
+    index, elapsed = timed(NGramIndex, references)
+    print(f"Built index over {len(references):,} names in {elapsed:.2f}s")
+
+    for n_jobs in [1, 2, 4]:
+        result, elapsed = timed(
+            df.filter_column_isin,
+            "vendor",
+            index,
+            fuzzy=True,
+            threshold=threshold,
+            n_jobs=n_jobs,
+        )
+        print(
+            f"indexed, n_jobs={n_jobs}: {len(result):,} of {len(df):,} rows "
+            f"matched in {elapsed:.2f}s"
+        )
+
+    sample = queries[:200]
+    _, elapsed = timed(brute_force, sample, references, threshold)
+    print(
+        f"all pairs: {elapsed:.2f}s for {len(sample)} queries, i.e. "
+        f"~{elapsed / len(sample) * len(queries):.0f}s extrapolated to "
+        f"{len(queries):,} queries"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Benchmark `limit_column_characters` on very wide frames.
+
+Column names look like those of a pivoted feature frame, so truncating them
+produces many duplicates. The time per column should stay roughly constant
+as the number of columns grows.
+
+Run with:
+
+.. code-block:: bash
+
+    python benchmarks/limit_column_characters.py
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+import janitor  # noqa: F401
+
+
+def make_frame(n_columns: int) -> pd.DataFrame:
+    columns = [
+        f"feature_{i % 1000:04d}_lag_{i // 1000}" for i in range(n_columns)
+    ]
+    return pd.DataFrame(
+        np.zeros((1, n_columns), dtype=np.uint8), columns=columns
+    )
+
+
+def main(sizes=(10_000, 100_000, 1_000_000), column_length=12):
+    for n_columns in sizes:
+        df = make_frame(n_columns)
+        start = time.perf_counter()
+        df.limit_column_characters(column_length)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{n_columns:>9,} columns: {elapsed:7.3f}s "
+            f"({elapsed / n_columns * 1e6:.2f}us per column)"
+        )
+
+
+if __name__ == "__main__":
+    main()
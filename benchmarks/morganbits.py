@@ -0,0 +1,71 @@
+"""
+Benchmark the output layouts of `morganbits`.
+
+Fingerprints of the test SMILES, repeated, are computed in each layout and
+compared against stacking one float64 array per molecule, as `morganbits`
+used to do.
+
+Run with:
+
+.. code-block:: bash
+
+    python benchmarks/morganbits.py
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from rdkit import DataStructs, RDLogger
+from rdkit.Chem import AllChem
+
+import janitor.chemistry  # noqa: F401
+
+TEST_DATA = os.path.join(os.path.dirname(__file__), "..", "tests", "test_data")
+
+
+def stack_float64(mols, radius, nbits):
+    np_fps = []
+    for mol in mols:
+        fp = AllChem.GetMorganFingerprintAsBitVect(mol, radius, nbits)
+        arr = np.zeros((1,))
+        DataStructs.ConvertToNumpyArray(fp, arr)
+        np_fps.append(arr)
+    return pd.DataFrame(np.vstack(np_fps))
+
+
+def main(n_rows=50_000, radius=3, nbits=2048):
+    RDLogger.DisableLog("rdApp.*")
+    smiles = pd.read_csv(
+        os.path.join(TEST_DATA, "corrected_smiles.txt"),
+        sep="\t",
+        header=None,
+        names=["id", "smiles"],
+    )
+    repeats = n_rows // len(smiles) + 1
+    df = pd.concat([smiles] * repeats, ignore_index=True).head(n_rows)
+    df = df.smiles2mol("smiles", "mols")
+
+    start = time.perf_counter()
+    fps = stack_float64(df["mols"], radius, nbits)
+    elapsed = time.perf_counter() - start
+    megabytes = fps.memory_usage(index=False).sum() / 1e6
+    print(
+        f"{len(df):,} mols, float64 vstack: {elapsed:.2f}s, "
+        f"{megabytes:,.1f} MB"
+    )
+
+    for output in ["dense", "packed", "sparse"]:
+        start = time.perf_counter()
+        fps = df.morganbits("mols", radius, nbits, output=output)
+        elapsed = time.perf_counter() - start
+        megabytes = fps.memory_usage(index=False).sum() / 1e6
+        print(
+            f"{len(df):,} mols, output={output}: {elapsed:.2f}s, "
+            f"{megabytes:,.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark `smiles2mol` on a screening library with repeated SMILES.
+
+The library repeats the test SMILES many times, as screening libraries repeat
+scaffolds, and `smiles2mol` is compared against parsing every row with
+`Chem.MolFromSmiles`, as it used to do. The second cached run loads every
+molecule from the cache filled by the first.
+
+Run with:
+
+.. code-block:: bash
+
+    python benchmarks/smiles2mol.py
+"""
+
+import os
+import tempfile
+import time
+
+import pandas as pd
+from rdkit import Chem
+
+import janitor.chemistry  # noqa: F401
+
+TEST_DATA = os.path.join(os.path.dirname(__file__), "..", "tests", "test_data")
+
+
+def make_frame(n_rows: int) -> pd.DataFrame:
+    smiles = pd.read_csv(
+        os.path.join(TEST_DATA, "corrected_smiles.txt"),
+        sep="\t",
+        header=None,
+    )[1]
+    repeats = n_rows // len(smiles) + 1
+    return pd.DataFrame(
+        {"smiles": pd.concat([smiles] * repeats).head(n_rows).to_numpy()}
+    )
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(n_rows=200_000):
+    df = make_frame(n_rows)
+    print(
+        f"{len(df):,} rows, {df['smiles'].nunique():,} distinct SMILES, "
+        f"{os.cpu_count()} CPUs"
+    )
+
+    apply_time = timed(lambda: df["smiles"].apply(Chem.MolFromSmiles))
+    print(f"apply(MolFromSmiles): {apply_time:.2f}s")
+    for n_jobs in [1, -1]:
+        elapsed = timed(
+            lambda: df.copy().smiles2mol("smiles", "mols", n_jobs=n_jobs)
+        )
+        print(f"smiles2mol(n_jobs={n_jobs}): {elapsed:.2f}s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "mols.sqlite")
+        for run in ["empty", "filled"]:
+            elapsed = timed(
+                lambda: df.copy().smiles2mol("smiles", "mols", cache=path)
+            )
+            print(f"smiles2mol(cache={run}): {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
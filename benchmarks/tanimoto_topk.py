@@ -0,0 +1,71 @@
+"""
+Benchmark `tanimoto_topk` against RDKit's `BulkTanimotoSimilarity`.
+
+Random fingerprints with Morgan-like bit densities are searched for their
+top 10 neighbors, with `tanimoto_topk` and with a Python loop of
+`BulkTanimotoSimilarity` calls, one per query.
+
+Run with:
+
+.. code-block:: bash
+
+    python benchmarks/tanimoto_topk.py
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from rdkit import DataStructs
+
+import janitor.chemistry  # noqa: F401
+
+
+def random_fingerprints(n: int, nbits: int, rng) -> pd.DataFrame:
+    bits = rng.random((n, nbits)) < 0.025
+    return pd.DataFrame(np.packbits(bits, axis=1))
+
+
+def to_bitvects(packed: pd.DataFrame):
+    return [
+        DataStructs.CreateFromBitString("".join(map(str, np.unpackbits(row))))
+        for row in packed.to_numpy()
+    ]
+
+
+def bulk_topk(queries, library, k):
+    neighbors = []
+    for query in queries:
+        similarities = np.array(
+            DataStructs.BulkTanimotoSimilarity(query, library)
+        )
+        neighbors.append(np.argsort(-similarities, kind="stable")[:k])
+    return neighbors
+
+
+def main(n_queries=1_000, n_library=100_000, nbits=2048, k=10):
+    rng = np.random.default_rng(0)
+    queries = random_fingerprints(n_queries, nbits, rng)
+    library = random_fingerprints(n_library, nbits, rng)
+    print(
+        f"{n_queries:,} queries x {n_library:,} library, {nbits} bits, "
+        f"{os.cpu_count()} CPUs"
+    )
+
+    library_bitvects = to_bitvects(library)
+    query_bitvects = to_bitvects(queries.head(100))
+    start = time.perf_counter()
+    bulk_topk(query_bitvects, library_bitvects, k)
+    elapsed = (time.perf_counter() - start) * n_queries / 100
+    print(f"BulkTanimotoSimilarity loop: {elapsed:.1f}s (extrapolated)")
+
+    for n_jobs in [1, -1]:
+        start = time.perf_counter()
+        queries.tanimoto_topk(library, k=k, n_jobs=n_jobs)
+        elapsed = time.perf_counter() - start
+        print(f"tanimoto_topk(n_jobs={n_jobs}): {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark the execution modes of `transform_column`.
+
+Times a cheap numeric transform with every engine, both element by element
+and on whole columns, and an expensive pure-Python one element by element.
+The multiprocessing engine uses all CPUs. The Numba timings are skipped if
+Numba is not installed; they include compilation on first use, which is
+reported separately.
+
+Run with:
+
+.. code-block:: bash
+
+    python benchmarks/transform_column.py
+"""
+
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+import janitor  # noqa: F401
+
+
+def polynomial(x):
+    return 3.0 * x * x - 2.0 * x + 1.0
+
+
+def slow_score(x):
+    """A deliberately expensive pure-Python function of one value."""
+    total = 0.0
+    for k in range(1, 200):
+        total += math.sin(x * k) / k
+    return total
+
+
+def timed(df, function, **kwargs):
+    start = time.perf_counter()
+    df.transform_column("x", function, dest_col_name="y", **kwargs)
+    return time.perf_counter() - start
+
+
+def main(n_rows=1_000_000, n_slow_rows=50_000, seed=42):
+    try:
+        import numba  # noqa: F401
+
+        engines = ["python", "numba", "multiprocessing"]
+    except ImportError:
+        print("Numba is not installed, skipping the numba engine.")
+        engines = ["python", "multiprocessing"]
+
+    rng = np.random.RandomState(seed)
+    cases = [
+        ("polynomial", polynomial, pd.DataFrame({"x": rng.rand(n_rows)})),
+        ("slow_score", slow_score, pd.DataFrame({"x": rng.rand(n_slow_rows)})),
+    ]
+    for name, function, df in cases:
+        print(f"{name} on {len(df):,} rows:")
+        for engine in engines:
+            for elementwise in [True, False]:
+                if not elementwise and function is slow_score:
+                    # slow_score only accepts scalars.
+                    continue
+                if engine == "numba":
+                    # The first call includes compilation.
+                    compile_time = timed(
+                        df.head(10).copy(),
+                        function,
+                        engine=engine,
+                        elementwise=elementwise,
+                    )
+                elapsed = timed(
+                    df,
+                    function,
+                    engine=engine,
+                    elementwise=elementwise,
+                    n_jobs=-1,
+                )
+                mode = "elementwise" if elementwise else "whole column"
+                line = f"  {engine:>15} {mode:>12}: {elapsed:8.3f}s"
+                if engine == "numba":
+                    line += f" (+{compile_time:.2f}s compiling)"
+                print(line)
+
+
+if __name__ == "__main__":
+    main()
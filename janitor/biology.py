@@ -2,21 +2,240 @@
 Biology and bioinformatics-oriented data cleaning functions.
 """
 
+import glob
+import gzip
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, Union
+
+import numpy as np
 import pandas as pd
 import pandas_flavor as pf
 
 from .utils import import_message
 
 try:
-    from Bio import SeqIO
+    from Bio.SeqIO.FastaIO import SimpleFastaParser
 except ImportError:
     import_message(
         "biology", "biopython", "conda install -c conda-forge biopython"
     )
 
+_FAI_COLUMNS = ["name", "length", "offset", "linebases", "linewidth"]
+
+
+def _record_layout(sequence: bytes):
+    """
+    The number of bases, bases per line and bytes per line of a record's
+    sequence lines, or None if its lines are of different lengths.
+    """
+    lines = sequence
+    sequence = sequence.rstrip(b"\r\n")
+    line_end = sequence.find(b"\n")
+    if line_end < 0:
+        linewidth = lines.find(b"\n") + 1 or len(lines) + 1
+        return len(sequence), len(sequence), linewidth
+    linewidth = line_end + 1
+    linebases = line_end - sequence.endswith(b"\r", 0, line_end)
+    newlines = sequence.count(b"\n")
+    length = len(sequence) - newlines * (linewidth - linebases)
+    # Every line but the last must be full, so the line ends must be exactly
+    # every `linewidth` bytes.
+    if (
+        linebases == 0
+        or sequence[line_end::linewidth].count(b"\n") != newlines
+        or len(sequence) - newlines * linewidth > linebases
+    ):
+        return None
+    return length, linebases, linewidth
+
+
+def build_fasta_index(filename: str) -> pd.DataFrame:
+    """
+    Index the records of a FASTA file, in the `.fai` format of
+    `samtools faidx`.
+
+    Each row gives a record's ID, its sequence length, the byte offset of
+    its sequence, and the number of bases and bytes per line. As for
+    samtools, all sequence lines of a record but the last must be of the
+    same length.
+
+    :param filename: Path to the FASTA file.
+    :returns: The index, as a DataFrame.
+    :raises ValueError: if a record's lines are of different lengths.
+    """
+    rows = []
+    if os.path.getsize(filename) == 0:
+        return pd.DataFrame(rows, columns=_FAI_COLUMNS)
+    with open(filename, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            if data[:1] == b">":
+                header = 0
+            else:
+                header = data.find(b"\n>")
+                header = header + 1 if header >= 0 else -1
+            # Headers are found with find(), in C, rather than line by line.
+            while header >= 0:
+                start = data.find(b"\n", header) + 1 or size
+                name = (data[header:start][1:].split() or [b""])[0]
+                end = data.find(b"\n>", start - 1) + 1 or size
+                layout = _record_layout(data[start:end])
+                if layout is None:
+                    raise ValueError(
+                        f"Lines of different lengths in record "
+                        f"{name.decode()} of {filename}; it cannot be "
+                        "indexed."
+                    )
+                length, linebases, linewidth = layout
+                rows.append(
+                    [name.decode(), length, start, linebases, linewidth]
+                )
+                header = end if end < size else -1
+    return pd.DataFrame(rows, columns=_FAI_COLUMNS)
+
+
+def read_fasta_index(filename: str) -> pd.DataFrame:
+    """
+    The `.fai` index of a FASTA file, kept next to the file as
+    `<filename>.fai`.
+
+    The index is built if it does not exist or is older than the file, and
+    saved if the directory is writable. Indexes made by `samtools faidx` are
+    used as they are.
+
+    :param filename: Path to the FASTA file.
+    :returns: The index, as a DataFrame.
+    """
+    index_filename = f"{filename}.fai"
+    if os.path.exists(index_filename) and os.path.getmtime(
+        index_filename
+    ) >= os.path.getmtime(filename):
+        return pd.read_csv(
+            index_filename,
+            sep="\t",
+            header=None,
+            names=_FAI_COLUMNS,
+            usecols=range(len(_FAI_COLUMNS)),
+            dtype={"name": str},
+        )
+    index = build_fasta_index(filename)
+    try:
+        index.to_csv(index_filename, sep="\t", header=False, index=False)
+    except OSError:
+        pass
+    return index
+
+
+def _fasta_filenames(filename) -> list:
+    """
+    The FASTA files named by `filename`: a path, a glob pattern, or a list
+    of either.
+    """
+    if isinstance(filename, (str, os.PathLike)):
+        filename = [filename]
+    filenames = []
+    for name in filename:
+        name = os.fspath(name)
+        if glob.has_magic(name):
+            matches = sorted(glob.glob(name))
+            if not matches:
+                raise FileNotFoundError(f"No FASTA files match {name}")
+            filenames.extend(matches)
+        else:
+            filenames.append(name)
+    return filenames
+
+
+def _is_gzipped(filename: str) -> bool:
+    # BGZF files are also gzip files, with the same magic bytes.
+    with open(filename, "rb") as f:
+        return f.read(2) == b"\x1f\x8b"
+
+
+def _parse_fasta_file(wanted: frozenset, filename: str) -> dict:
+    """
+    The sequences of the records of `filename` whose IDs are in `wanted`.
+
+    The file is streamed, so only the wanted sequences are kept in memory.
+    If an ID appears more than once, the first record is used.
+    """
+    opener = gzip.open if _is_gzipped(filename) else open
+    sequences = {}
+    with opener(filename, "rt") as f:
+        for title, sequence in SimpleFastaParser(f):
+            # The ID is the first word of the title, as for SeqIO.
+            name = (title.split(None, 1) or [""])[0]
+            if name in wanted and name not in sequences:
+                sequences[name] = sequence
+    return sequences
+
+
+def _stream_fasta(filenames: list, names: pd.Index, n_jobs: int):
+    """
+    The sequences of the records named in `names`, or NaN where not in any
+    of the files, parsing each file in one of `n_jobs` processes.
+    """
+    parse = partial(_parse_fasta_file, frozenset(names))
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+    if n_jobs == 1 or len(filenames) <= 1:
+        results = list(map(parse, filenames))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(parse, filenames))
+
+    # The first file with a record of an ID wins.
+    found = {}
+    for sequences in results:
+        for name, sequence in sequences.items():
+            found.setdefault(name, sequence)
+    return np.array([found.get(name, np.nan) for name in names], object)
+
+
+def _fetch_indexed(filename: str, names: pd.Index) -> np.ndarray:
+    """
+    The sequences of the records named in `names`, read from `filename`
+    through its index, or NaN where not in the file.
+    """
+    if _is_gzipped(filename):
+        raise ValueError(
+            f"{filename} is compressed; indexed mode needs uncompressed "
+            "FASTA files."
+        )
+    index = read_fasta_index(filename).drop_duplicates("name")
+    positions = pd.Index(index["name"]).get_indexer(names)
+    sequences = np.full(len(names), np.nan, dtype=object)
+    found = np.flatnonzero(positions >= 0)
+    if len(found) == 0:
+        return sequences
+
+    lengths, offsets, linebases, linewidths = (
+        index[_FAI_COLUMNS[1:]].to_numpy(dtype=np.int64)[positions[found]].T
+    )
+    full_lines, rest = np.divmod(lengths, np.maximum(linebases, 1))
+    ends = offsets + full_lines * linewidths + rest
+
+    with open(filename, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for position, start, end in zip(found, offsets, ends):
+                sequence = data[start:end].replace(b"\n", b"")
+                sequences[position] = sequence.replace(b"\r", b"").decode()
+    return sequences
+
 
 @pf.register_dataframe_method
-def join_fasta(df: pd.DataFrame, filename: str, id_col: str, col_name: str):
+def join_fasta(
+    df: pd.DataFrame,
+    filename: Union[str, Iterable[str]],
+    id_col: str,
+    col_name: str,
+    indexed: bool = False,
+    n_jobs: int = 1,
+    dtype=None,
+):
     """
     Convenience method to join in a FASTA file as a column.
 
@@ -29,16 +248,56 @@ def join_fasta(df: pd.DataFrame, filename: str, id_col: str, col_name: str):
     knowledge of what kind of sequence is being read in (nucleotide vs. amino
     acid.)
 
+    Sequences can be spread over several files, such as gzipped shards:
+
+    .. code-block:: python
+
+        df = df.join_fasta(
+            'shards/*.fasta.gz', id_col='accession', col_name='sequence',
+            n_jobs=-1, dtype='category',
+        )
+
+    Files may be gzip or BGZF compressed. They are parsed as streams, in
+    `n_jobs` processes, and only the records whose IDs are in `id_col` are
+    kept. If an ID appears more than once, the record in the first file
+    (and the first record in that file) is used. IDs not found in any file
+    get NaN.
+
+    The sequences are stored as Python strings, unless a `dtype` is given:
+    "category" or "string[pyarrow]" store them far more compactly when they
+    are many or repeated.
+
+    For large, uncompressed FASTA files of which only a few records are
+    needed, pass `indexed=True`. Instead of parsing the whole file, the
+    records are then found through a `.fai` index, as made by
+    `samtools faidx`, and read directly from the memory-mapped file. The
+    index is kept next to the file, as `<filename>.fai`, and built on first
+    use (see `read_fasta_index`).
+
     For more advanced functions, please use phylopandas.
 
     :param df: A pandas DataFrame.
-    :param filename: Path to the FASTA file.
+    :param filename: Path to the FASTA file, a glob pattern of FASTA files,
+        or a list of either.
     :param id_col: The column in the DataFrame that houses sequence IDs.
     :param col_name: The name of the new column.
+    :param indexed: Whether to look up records through an index.
+    :param n_jobs: The number of processes to parse files in. -1 uses all
+        CPUs.
+    :param dtype: (optional) The dtype of the new column.
+    :raises ValueError: if `indexed` is used with compressed files.
     """
-    seqrecords = {
-        x.id: x.seq.__str__() for x in SeqIO.parse(filename, "fasta")
-    }
-    seq_col = [seqrecords[i] for i in df[id_col]]
-    df[col_name] = seq_col
+    filenames = _fasta_filenames(filename)
+    codes, names = pd.factorize(df[id_col])
+    if indexed:
+        sequences = np.full(len(names), np.nan, dtype=object)
+        for name in filenames:
+            missing = np.flatnonzero(pd.isna(sequences))
+            sequences[missing] = _fetch_indexed(name, names[missing])
+    else:
+        sequences = _stream_fasta(filenames, names, n_jobs)
+
+    # Each distinct sequence is converted once, then spread over the rows.
+    sequences = pd.array(sequences, dtype=dtype or object)
+    df[col_name] = sequences.take(codes, allow_fill=True)
     return df
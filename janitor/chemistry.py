@@ -2,17 +2,25 @@
 Chemistry and cheminformatics-oriented data cleaning functions.
 """
 
-from typing import Union
+import hashlib
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing
+from functools import lru_cache, partial
+from typing import Iterable, Union
 
 import numpy as np
 import pandas as pd
 import pandas_flavor as pf
 
+from janitor import check
+
 from .utils import import_message
 
 try:
-    from rdkit import Chem, DataStructs
-    from rdkit.Chem import AllChem
+    from rdkit import Chem
+    from rdkit.Chem import Descriptors, rdFingerprintGenerator
 except ImportError:
     import_message("chemistry", "rdkit", "conda install -c rdkit rdkit")
 
@@ -23,6 +31,140 @@ except ImportError:
     import_message("chemistry", "tqdm", "conda install -c conda-forge tqdm")
 
 
+class MolCache:
+    """
+    A persistent cache of parsed molecules, keyed by SMILES string.
+
+    Molecules are stored as RDKit binary pickles (`Mol.ToBinary()`) in a
+    SQLite database, which is much faster to load than to parse the SMILES
+    again. SMILES strings that RDKit failed to parse are cached too.
+
+    .. code-block:: python
+
+        cache = MolCache("~/.cache/mols.sqlite")
+        df = df.smiles2mol("smiles", "mols", cache=cache)
+
+    :param path: Path to the SQLite database. It is created if needed.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(str(path))
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS mols "
+                "(smiles TEXT PRIMARY KEY, mol BLOB)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path)
+
+    def get_many(self, smiles: Iterable[str]) -> dict:
+        """
+        Look up many SMILES strings at once.
+
+        :param smiles: The SMILES strings to look up.
+        :returns: A dict mapping each cached SMILES string to its binary
+            molecule, or to None if it could not be parsed.
+        """
+        found = {}
+        with closing(self._connect()) as connection:
+            connection.execute("CREATE TEMP TABLE wanted (smiles TEXT)")
+            connection.executemany(
+                "INSERT INTO wanted VALUES (?)", ((s,) for s in smiles)
+            )
+            rows = connection.execute(
+                "SELECT mols.smiles, mols.mol FROM mols "
+                "JOIN wanted ON mols.smiles = wanted.smiles"
+            )
+            for key, mol in rows:
+                found[key] = mol
+        return found
+
+    def put_many(self, entries: Iterable):
+        """
+        Store many molecules at once, in a single transaction.
+
+        :param entries: An iterable of `(smiles, binary_mol)` tuples, where
+            `binary_mol` is None for SMILES strings that failed to parse.
+        """
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO mols VALUES (?, ?)", entries
+            )
+
+    def clear(self):
+        """
+        Remove all cached molecules.
+        """
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM mols")
+
+
+def _progressbar(progressbar: Union[None, str], total: int, desc: str):
+    """
+    A tqdm progressbar of the kind named by `progressbar`, or None.
+    """
+    valid_progress = ["notebook", "terminal", None]
+    if progressbar not in valid_progress:
+        raise ValueError(f"progressbar kwarg must be one of {valid_progress}")
+    if progressbar == "notebook":
+        return tqdmn(total=total, desc=desc)
+    if progressbar == "terminal":
+        return tqdm(total=total, desc=desc)
+    return None
+
+
+def _map_chunks(function, items: list, n_jobs: int = 1, progress=None):
+    """
+    Apply `function` to chunks of `items`, in `n_jobs` processes.
+
+    `function` takes a list of items and returns a list of results, one per
+    item. Results are returned in order. `progress`, if given, is a tqdm
+    progressbar advanced as each chunk finishes.
+    """
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+    # Several chunks per process, so that the progressbar moves and slow
+    # chunks do not hold up the others.
+    chunksize = max(1, min(10_000, int(np.ceil(len(items) / (n_jobs * 8)))))
+    bounds = range(0, len(items) + chunksize, chunksize)
+    chunks = [items[start:stop] for start, stop in zip(bounds, bounds[1:])]
+    results = []
+
+    def collect(chunk_results):
+        results.extend(chunk_results)
+        if progress is not None:
+            progress.update(len(chunk_results))
+
+    if n_jobs == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            collect(function(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            for chunk_results in executor.map(function, chunks):
+                collect(chunk_results)
+    if progress is not None:
+        progress.close()
+    return results
+
+
+def _parse_smiles(smiles: list) -> list:
+    """
+    Parse SMILES strings into binary molecules, or None where invalid.
+
+    Binary molecules are returned, rather than molecules, as they are
+    cheaper to send between processes and can be cached as they are.
+    """
+    binaries = []
+    for s in smiles:
+        mol = Chem.MolFromSmiles(s)
+        binaries.append(None if mol is None else mol.ToBinary())
+    return binaries
+
+
 @pf.register_dataframe_method
 def smiles2mol(
     df: pd.DataFrame,
@@ -30,6 +172,8 @@ def smiles2mol(
     mols_col: str,
     drop_nulls: bool = True,
     progressbar: Union[None, str] = None,
+    n_jobs: int = 1,
+    cache: Union[None, str, MolCache] = None,
 ):
     """
     Convert a column of SMILES strings into RDKit Mol objects.
@@ -45,6 +189,16 @@ def smiles2mol(
             .smiles2mol(smiles_col='smiles', mols_col='mols')
         )
 
+    Each distinct SMILES string is only parsed once, and rows with the same
+    SMILES string share the same Mol object. Parsing can be spread over
+    several processes with `n_jobs`, and parsed molecules can be kept in a
+    persistent `cache` (see `MolCache`), so that they need not be parsed
+    again in later sessions:
+
+    .. code-block:: python
+
+        df = df.smiles2mol('smiles', 'mols', n_jobs=-1, cache='mols.sqlite')
+
     A progressbar can be optionally used.
 
     - Pass in "notebook" to show a tqdm notebook progressbar. (ipywidgets must
@@ -53,27 +207,41 @@ def smiles2mol(
       with scripts.
     - "none" is the default value - progress bar will be not be shown.
 
+    The progressbar counts the distinct SMILES strings that are parsed.
+
     :param df: pandas DataFrame.
     :param smiles_col: Name of column that holds the SMILES strings.
     :param mols_col: Name to be given to the new mols column.
     :param drop_nulls: Whether to drop rows whose mols failed to be
         constructed.
     :param progressbar: Whether to show a progressbar or not.
+    :param n_jobs: The number of processes to parse SMILES strings in. -1
+        uses all CPUs.
+    :param cache: (optional) A MolCache, or the path of its database.
     """
-    valid_progress = ["notebook", "terminal", None]
-    if progressbar not in valid_progress:
-        raise ValueError(f"progressbar kwarg must be one of {valid_progress}")
+    check("n_jobs", n_jobs, [int])
+    codes, uniques = pd.factorize(df[smiles_col])
+    uniques = list(uniques)
 
-    if progressbar is None:
-        df[mols_col] = df[smiles_col].apply(lambda x: Chem.MolFromSmiles(x))
-    else:
-        if progressbar == "notebook":
-            tqdmn().pandas(desc="mols")
-        elif progressbar == "terminal":
-            tqdm.pandas(desc="mols")
-        df[mols_col] = df[smiles_col].progress_apply(
-            lambda x: Chem.MolFromSmiles(x)
-        )
+    binaries = {}
+    if cache is not None:
+        if not isinstance(cache, MolCache):
+            cache = MolCache(cache)
+        binaries = cache.get_many(uniques)
+    to_parse = [s for s in uniques if s not in binaries]
+
+    progress = _progressbar(progressbar, len(to_parse), "mols")
+    parsed = _map_chunks(_parse_smiles, to_parse, n_jobs, progress)
+    if cache is not None:
+        cache.put_many(zip(to_parse, parsed))
+    binaries.update(zip(to_parse, parsed))
+
+    # The last entry is for missing SMILES strings, whose code is -1.
+    mols = np.empty(len(uniques) + 1, dtype=object)
+    mols[:-1] = [
+        None if binaries[s] is None else Chem.Mol(binaries[s]) for s in uniques
+    ]
+    df[mols_col] = mols[codes]
 
     if drop_nulls:
         df.dropna(subset=[mols_col], inplace=True)
@@ -81,9 +249,53 @@ def smiles2mol(
     return df
 
 
+@lru_cache(maxsize=None)
+def _morgan_generator(radius: int, nbits: int):
+    # Generators cannot be pickled, so each process makes its own.
+    return rdFingerprintGenerator.GetMorganGenerator(
+        radius=radius, fpSize=nbits
+    )
+
+
+def _morgan_on_bits(radius: int, nbits: int, mols: list) -> list:
+    """
+    The indices of the bits set in the Morgan fingerprint of each molecule,
+    as int32 arrays. Missing molecules have no bits set.
+    """
+    generator = _morgan_generator(radius, nbits)
+    on_bits = []
+    for mol in mols:
+        if mol is None:
+            on_bits.append(np.empty(0, dtype=np.int32))
+        else:
+            # The fingerprint comes as a NumPy array, built in C++.
+            fp = generator.GetFingerprintAsNumPy(mol)
+            on_bits.append(np.flatnonzero(fp).astype(np.int32))
+    return on_bits
+
+
+def _pack_on_bits(
+    rows: np.ndarray, bits: np.ndarray, n_rows: int, nbits: int
+) -> np.ndarray:
+    """
+    A packed fingerprint matrix, as by `np.packbits`, with the given bits of
+    the given rows set.
+    """
+    packed = np.zeros((n_rows, (nbits + 7) // 8), dtype=np.uint8)
+    # The first bit of each byte is its most significant, as in np.packbits.
+    values = np.left_shift(1, 7 - bits % 8).astype(np.uint8)
+    np.bitwise_or.at(packed, (rows, bits // 8), values)
+    return packed
+
+
 @pf.register_dataframe_method
 def morganbits(
-    df: pd.DataFrame, mols_col: str, radius: int = 3, nbits: int = 2048
+    df: pd.DataFrame,
+    mols_col: str,
+    radius: int = 3,
+    nbits: int = 2048,
+    output: str = "dense",
+    n_jobs: int = 1,
 ):
     """
     Convert a column of RDKIT Mol objects into Morgan Fingerprints.
@@ -107,21 +319,567 @@ def morganbits(
 
         joined = df.join(morgans)
 
+    The fingerprints can be returned in one of three layouts:
+
+    - "dense" (default): one `uint8` column of 0s and 1s per bit.
+    - "packed": the bits packed eight to a byte, as by `np.packbits`, in
+      `nbits / 8` `uint8` columns. This takes an eighth of the memory, and
+      is the input expected by `tanimoto_topk`.
+    - "sparse": one sparse `uint8` column per bit. Morgan fingerprints
+      have few bits set, so this is usually the smallest layout. Use
+      `morgans.sparse.to_coo().tocsr()` to get a SciPy CSR matrix.
+
+    Rows whose mol is missing get no bits set.
+
     :param df: A pandas DataFrame.
     :param mols_col: The name of the column that has the RDKIT mol objects
     :param radius: Radius of Morgan fingerprints. Defaults to 3.
     :param nbits: The length of the fingerprints. Defaults to 2048.
+    :param output: One of "dense", "packed" or "sparse".
+    :param n_jobs: The number of processes to compute fingerprints in. -1
+        uses all CPUs.
     """
-    fps = [
-        AllChem.GetMorganFingerprintAsBitVect(m, radius, nbits)
-        for m in df[mols_col]
-    ]
-    np_fps = []
-    for fp in fps:
-        arr = np.zeros((1,))
-        DataStructs.ConvertToNumpyArray(fp, arr)
-        np_fps.append(arr)
-    np_fps = np.vstack(np_fps)
-    fpdf = pd.DataFrame(np_fps)
+    valid_outputs = ["dense", "packed", "sparse"]
+    if output not in valid_outputs:
+        raise ValueError(f"output kwarg must be one of {valid_outputs}")
+    check("n_jobs", n_jobs, [int])
+
+    on_bits = _map_chunks(
+        partial(_morgan_on_bits, radius, nbits), list(df[mols_col]), n_jobs
+    )
+    counts = np.fromiter(map(len, on_bits), dtype=np.int64, count=len(df))
+    rows = np.repeat(np.arange(len(df)), counts)
+    bits = np.concatenate(on_bits) if on_bits else np.empty(0, np.int32)
+
+    if output == "sparse":
+        from scipy.sparse import csr_matrix
+
+        indptr = np.concatenate([[0], np.cumsum(counts)])
+        matrix = csr_matrix(
+            (np.ones(len(bits), dtype=np.uint8), bits, indptr),
+            shape=(len(df), nbits),
+        )
+        fpdf = pd.DataFrame.sparse.from_spmatrix(matrix)
+    elif output == "packed":
+        fpdf = pd.DataFrame(_pack_on_bits(rows, bits, len(df), nbits))
+    else:
+        dense = np.zeros((len(df), nbits), dtype=np.uint8)
+        dense[rows, bits] = 1
+        fpdf = pd.DataFrame(dense)
     fpdf.index = df.index
     return fpdf
+
+
+def _compute_descriptors(names: list, mols: list) -> np.ndarray:
+    """
+    The descriptors named in `names` for each molecule, as a float32 array
+    with one row per molecule. Missing molecules, and descriptors that fail
+    on a molecule, give NaN.
+    """
+    functions = dict(Descriptors.descList)
+    functions = [functions[name] for name in names]
+    values = np.full((len(mols), len(names)), np.nan, dtype=np.float32)
+    for row, mol in enumerate(mols):
+        if mol is None:
+            continue
+        for column, function in enumerate(functions):
+            try:
+                values[row, column] = function(mol)
+            except Exception:
+                pass
+    return values
+
+
+@pf.register_dataframe_method
+def mol_descriptors(
+    df: pd.DataFrame,
+    mols_col: str,
+    descriptors: Iterable[str] = None,
+    n_jobs: int = 1,
+    progressbar: Union[None, str] = None,
+) -> pd.DataFrame:
+    """
+    Compute RDKit molecular descriptors for a column of RDKIT Mol objects.
+
+    Returns a new dataframe without any of the original data, with one
+    float32 column per descriptor, and the same index as `df`.
+
+    Method chaining usage:
+
+    .. code-block:: python
+
+        df = pd.DataFrame(...)
+        descriptors = df.mol_descriptors(
+            mols_col='mols',
+            descriptors=['MolWt', 'MolLogP', 'TPSA', 'RingCount'],
+        )
+
+    Descriptors are named as in `rdkit.Chem.Descriptors.descList`; by
+    default, all of them are computed. All descriptors of a molecule are
+    computed together, and molecules can be spread over several processes
+    with `n_jobs`.
+
+    Rows whose mol is missing get NaN for all descriptors, and descriptors
+    that RDKit fails to compute for a mol get NaN, rather than stopping the
+    whole batch. Descriptor values too large for float32 become infinite.
+
+    :param df: A pandas DataFrame.
+    :param mols_col: The name of the column that has the RDKIT mol objects
+    :param descriptors: (optional) The names of the descriptors to compute.
+    :param n_jobs: The number of processes to compute descriptors in. -1
+        uses all CPUs.
+    :param progressbar: Whether to show a progressbar or not: "notebook",
+        "terminal" or None, as in `smiles2mol`.
+    :raises ValueError: if a descriptor is not known to RDKit.
+    """
+    check("n_jobs", n_jobs, [int])
+    known = [name for name, _ in Descriptors.descList]
+    if descriptors is None:
+        descriptors = known
+    descriptors = list(descriptors)
+    unknown = sorted(set(descriptors) - set(known))
+    if unknown:
+        raise ValueError(f"Unknown RDKit descriptors: {unknown}")
+
+    progress = _progressbar(progressbar, len(df), "descriptors")
+    rows = _map_chunks(
+        partial(_compute_descriptors, descriptors),
+        list(df[mols_col]),
+        n_jobs,
+        progress,
+    )
+    values = np.empty((len(df), len(descriptors)), dtype=np.float32)
+    if rows:
+        np.stack(rows, out=values)
+    return pd.DataFrame(values, index=df.index, columns=descriptors)
+
+
+# The number of bits set in each 16-bit integer, for NumPy versions without
+# np.bitwise_count.
+_POPCOUNT_16 = np.unpackbits(
+    np.arange(2**16, dtype=np.uint16).view(np.uint8).reshape(-1, 2), axis=1
+).sum(axis=1, dtype=np.uint8)
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """
+    The number of bits set in each element of an array of uint64 words.
+    """
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    pieces = _POPCOUNT_16[words.view(np.uint16)]
+    return pieces.reshape(words.shape + (4,)).sum(axis=-1, dtype=np.uint16)
+
+
+def _as_words(fingerprints) -> np.ndarray:
+    """
+    Packed fingerprints as a C-contiguous array of uint64 words, one row per
+    fingerprint, zero-padded to a whole number of words.
+    """
+    packed = np.asarray(fingerprints, dtype=np.uint8)
+    if packed.ndim == 1:
+        packed = packed[np.newaxis]
+    padding = -packed.shape[1] % 8
+    if padding:
+        packed = np.pad(packed, ((0, 0), (0, padding)))
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+
+# The number of queries compared with the library at once, by each thread.
+_QUERY_BLOCK_SIZE = 1024
+
+
+def _unpack_words(words: np.ndarray) -> np.ndarray:
+    """
+    Rows of uint64 words as rows of bits, in float32 for matrix products.
+    """
+    return np.unpackbits(words.view(np.uint8), axis=1).astype(np.float32)
+
+
+def _tanimoto_block(
+    query_bits: np.ndarray,
+    query_counts: np.ndarray,
+    library: np.ndarray,
+    library_counts: np.ndarray,
+) -> np.ndarray:
+    """
+    The Tanimoto similarities between a block of queries, as unpacked bits,
+    and a block of library fingerprints, as uint64 words.
+
+    The numbers of bits in common are those of a matrix product of the
+    unpacked bits, which BLAS computes much faster than bit counts over
+    every pair of words. They are exact, as float32 holds integers up to
+    2 ** 24.
+    """
+    common = query_bits @ _unpack_words(library).T
+    union = query_counts[:, np.newaxis] + library_counts[np.newaxis, :]
+    union = union - common
+    # Two empty fingerprints are given a similarity of 0.
+    return np.divide(
+        common,
+        union,
+        out=np.zeros(common.shape, dtype=np.float32),
+        where=union > 0,
+    )
+
+
+def _tanimoto_topk_block(
+    queries: np.ndarray,
+    query_counts: np.ndarray,
+    start: int,
+    library: np.ndarray,
+    library_counts: np.ndarray,
+    k: int,
+    block_size: int,
+    exclude_self: bool,
+):
+    """
+    The top `k` library positions and similarities for a block of queries
+    starting at `start`, scanning the library `block_size` rows at a time.
+    """
+    query_bits = _unpack_words(queries)
+    query_counts = query_counts.astype(np.float32)
+    library_counts = library_counts.astype(np.float32)
+    best_positions = np.empty((len(queries), 0), dtype=np.int64)
+    best_similarities = np.empty((len(queries), 0), dtype=np.float32)
+    for library_start in range(0, len(library), block_size):
+        library_stop = library_start + block_size
+        similarities = _tanimoto_block(
+            query_bits,
+            query_counts,
+            library[library_start:library_stop],
+            library_counts[library_start:library_stop],
+        )
+        positions = np.arange(
+            library_start, library_start + similarities.shape[1]
+        )
+        if exclude_self:
+            # Each query is its own closest match; leave it out.
+            rows = np.arange(len(queries))
+            columns = start + rows - library_start
+            inside = (columns >= 0) & (columns < similarities.shape[1])
+            similarities[rows[inside], columns[inside]] = -1
+        positions = np.hstack(
+            [best_positions, np.broadcast_to(positions, similarities.shape)]
+        )
+        similarities = np.hstack([best_similarities, similarities])
+        if similarities.shape[1] > k:
+            keep = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+            similarities = np.take_along_axis(similarities, keep, axis=1)
+            positions = np.take_along_axis(positions, keep, axis=1)
+        best_similarities, best_positions = similarities, positions
+    return best_positions, best_similarities
+
+
+@pf.register_dataframe_method
+def tanimoto_topk(
+    df: pd.DataFrame,
+    library=None,
+    k: int = 5,
+    n_jobs: int = 1,
+    block_size: int = 8192,
+) -> pd.DataFrame:
+    """
+    Find the `k` fingerprints in a library most similar to each fingerprint
+    in `df`, by Tanimoto similarity.
+
+    Fingerprints are bit-packed, as returned by
+    `morganbits(..., output="packed")`. Without a `library`, each
+    fingerprint in `df` is compared with all others in `df`.
+
+    Method chaining usage:
+
+    .. code-block:: python
+
+        library = df.morganbits(mols_col='mols', output='packed')
+        queries = query_df.morganbits(mols_col='mols', output='packed')
+        neighbors = queries.tanimoto_topk(library, k=10, n_jobs=-1)
+
+    Fingerprints stay packed in memory. Bits are counted over 64-bit words,
+    and the bits in common are counted with a matrix product, for blocks of
+    1024 queries and `block_size` library fingerprints at a time. Only the
+    best `k` matches per query are kept between blocks, so memory use is
+    bounded by the block sizes rather than by the size of the library.
+    Query blocks are spread over `n_jobs` threads.
+
+    :param df: A pandas DataFrame of packed fingerprints, one per row.
+    :param library: (optional) A DataFrame or array of packed fingerprints
+        to search.
+    :param k: The number of neighbors to find per query.
+    :param n_jobs: The number of threads to use. -1 uses all CPUs.
+    :param block_size: The number of library fingerprints compared with a
+        block of queries at once.
+    :returns: A DataFrame with one row per query and neighbor, with columns
+        `query` and `neighbor` holding the index labels of the query and of
+        the neighbor, and `similarity`. Neighbors are sorted by decreasing
+        similarity.
+    """
+    check("k", k, [int])
+    check("n_jobs", n_jobs, [int])
+    check("block_size", block_size, [int])
+    exclude_self = library is None
+    if exclude_self:
+        library = df
+    library_labels = (
+        library.index
+        if isinstance(library, pd.DataFrame)
+        else pd.RangeIndex(len(library))
+    )
+    queries = _as_words(df.to_numpy(dtype=np.uint8))
+    library = _as_words(library)
+    if queries.shape[1] != library.shape[1]:
+        raise ValueError(
+            "The fingerprints in df and library must be of the same length."
+        )
+    query_counts = _popcount(queries).sum(axis=1, dtype=np.int32)
+    library_counts = _popcount(library).sum(axis=1, dtype=np.int32)
+    k = max(0, min(k, len(library) - exclude_self))
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+    starts = range(0, len(queries), _QUERY_BLOCK_SIZE)
+
+    def search(start):
+        stop = start + _QUERY_BLOCK_SIZE
+        return _tanimoto_topk_block(
+            queries[start:stop],
+            query_counts[start:stop],
+            start,
+            library,
+            library_counts,
+            k,
+            block_size,
+            exclude_self,
+        )
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        results = list(executor.map(search, starts))
+    positions = np.vstack(
+        [block[0] for block in results] or [np.empty((0, k), np.int64)]
+    )
+    similarities = np.vstack(
+        [block[1] for block in results] or [np.empty((0, k), np.float32)]
+    )
+
+    query_positions = np.repeat(np.arange(len(queries)), k)
+    positions = positions.ravel()
+    similarities = similarities.ravel()
+    order = np.lexsort((positions, -similarities, query_positions))
+    return pd.DataFrame(
+        {
+            "query": df.index.take(query_positions[order]),
+            "neighbor": library_labels.take(positions[order]),
+            "similarity": similarities[order],
+        }
+    )
+
+
+def _on_bits(fp) -> np.ndarray:
+    """
+    The indices of the bits set in an RDKit bit vector, as an int32 array.
+    """
+    # GetOnBits() builds a tuple of Python ints one by one; the bit string
+    # is converted in bulk.
+    bits = np.frombuffer(fp.ToBitString().encode(), dtype=np.uint8)
+    return np.flatnonzero(bits == ord("1")).astype(np.int32)
+
+
+def _pattern_on_bits(fp_size: int, mols: list) -> list:
+    """
+    The indices of the bits set in the pattern fingerprint of each
+    molecule, as int32 arrays. Missing molecules have no bits set.
+    """
+    on_bits = []
+    for mol in mols:
+        if mol is None:
+            on_bits.append(np.empty(0, dtype=np.int32))
+        else:
+            fp = Chem.PatternFingerprint(mol, fpSize=fp_size)
+            on_bits.append(_on_bits(fp))
+    return on_bits
+
+
+@lru_cache(maxsize=128)
+def _smarts_pattern(smarts: str):
+    pattern = Chem.MolFromSmarts(smarts)
+    if pattern is None:
+        raise ValueError(f"Invalid SMARTS pattern: {smarts!r}")
+    return pattern
+
+
+def _has_substruct_matches(smarts: str, mols: list) -> list:
+    pattern = _smarts_pattern(smarts)
+    return [mol.HasSubstructMatch(pattern) for mol in mols]
+
+
+def _screens_key(smiles: pd.Series, mols: np.ndarray, fp_size: int) -> str:
+    """
+    A digest of the SMILES the mols were made from, in order, of which mols
+    are missing, and of `fp_size`, identifying the screens computed for
+    them.
+
+    Describing the mols themselves, e.g. with canonical SMILES, would take
+    longer than screening without the file.
+    """
+    digest = hashlib.sha256(str(fp_size).encode())
+    digest.update(np.packbits(pd.isna(mols)).tobytes())
+    digest.update("\n".join(map(str, smiles)).encode())
+    return digest.hexdigest()
+
+
+def _substructure_screens(
+    df: pd.DataFrame,
+    mols_col: str,
+    fp_size: int,
+    n_jobs: int,
+    screens: Union[None, str],
+    smiles_col: Union[None, str],
+):
+    """
+    The pattern fingerprints of the mols in `df`, as rows of uint64 words.
+
+    They are kept on `df`, along with the mols they were computed for, and
+    reused as long as the column holds the same mol objects. They are also
+    loaded from, or saved to, the `screens` file if given, which is only
+    used for the same SMILES in `smiles_col`, in the same order.
+    """
+    mols = df[mols_col].to_numpy()
+    key = (mols_col, fp_size)
+    cached = df.__dict__.get("substructure_screens", {}).get(key)
+    # The cached mols are kept alive, so their ids cannot be reused by
+    # other objects.
+    if (
+        cached is not None
+        and len(cached[0]) == len(mols)
+        and all(a is b for a, b in zip(cached[0], mols))
+    ):
+        return cached[1]
+
+    words = None
+    if screens is not None:
+        screens_key = _screens_key(df[smiles_col], mols, fp_size)
+        if os.path.exists(screens):
+            with np.load(screens) as saved:
+                if str(saved["key"]) == screens_key:
+                    words = saved["words"]
+    if words is None:
+        on_bits = _map_chunks(
+            partial(_pattern_on_bits, fp_size), list(mols), n_jobs
+        )
+        counts = np.fromiter(map(len, on_bits), np.int64, count=len(mols))
+        rows = np.repeat(np.arange(len(mols)), counts)
+        bits = np.concatenate(on_bits) if on_bits else np.empty(0, np.int32)
+        words = _as_words(_pack_on_bits(rows, bits, len(mols), fp_size))
+        if screens is not None:
+            with open(screens, "wb") as f:
+                np.savez(f, key=screens_key, words=words)
+    _store_screens(df, key, mols, words)
+    return words
+
+
+def _store_screens(df: pd.DataFrame, key, mols: np.ndarray, words):
+    if "substructure_screens" not in df.__dict__:
+        df.__dict__["substructure_screens"] = {}
+    df.__dict__["substructure_screens"][key] = (mols, words)
+
+
+@pf.register_dataframe_method
+def filter_substructure(
+    df: pd.DataFrame,
+    mols_col: str,
+    smarts: str,
+    complement: bool = False,
+    n_jobs: int = 1,
+    fp_size: int = 2048,
+    screens: str = None,
+    smiles_col: str = None,
+) -> pd.DataFrame:
+    """
+    Filter a column of RDKIT Mol objects according to whether they contain
+    a substructure, given as a SMARTS pattern.
+
+    This is the chemistry counterpart of `filter_string`:
+
+    .. code-block:: python
+
+        df = (
+            pd.DataFrame(...)
+            .smiles2mol(smiles_col='smiles', mols_col='mols')
+            .filter_substructure('mols', smarts='c1ccccc1C(=O)O')
+        )
+
+    Matching a substructure is slow, so most mols are first ruled out with
+    RDKit pattern fingerprints: a mol can only contain the substructure if
+    its fingerprint has all the bits of the pattern's fingerprint set. Only
+    the remaining mols are matched with `HasSubstructMatch`, spread over
+    `n_jobs` processes.
+
+    The fingerprints of the mols are computed once, and kept on the
+    dataframe and on the filtered dataframe that is returned, so that
+    further filters on either are screened without recomputing them. To
+    reuse them across sessions, pass the path of a `screens` file, and the
+    column of SMILES the mols were made from as `smiles_col`. The file is
+    written on first use, and loaded afterwards as long as the SMILES, in
+    order, are the same; otherwise, the fingerprints are computed again and
+    the file is overwritten.
+
+    .. code-block:: python
+
+        df = (
+            pd.read_csv('library.csv')
+            .smiles2mol(smiles_col='smiles', mols_col='mols')
+            .filter_substructure(
+                'mols', 'c1ccccc1', screens='library.npz', smiles_col='smiles'
+            )
+        )
+
+    Missing mols never match.
+
+    :param df: A pandas DataFrame.
+    :param mols_col: The name of the column that has the RDKIT mol objects
+    :param smarts: The SMARTS pattern of the substructure.
+    :param complement: Whether to return the complement of the filter or
+        not.
+    :param n_jobs: The number of processes to use. -1 uses all CPUs.
+    :param fp_size: The length of the pattern fingerprints.
+    :param screens: (optional) Path of a `.npz` file of the fingerprints of
+        the mols.
+    :param smiles_col: (optional) The column of SMILES the mols were made
+        from. Needed with `screens`.
+    :raises ValueError: if `smarts` is not a valid SMARTS pattern, or if
+        `screens` is given without `smiles_col`.
+    """
+    check("n_jobs", n_jobs, [int])
+    check("fp_size", fp_size, [int])
+    if screens is not None and smiles_col is None:
+        raise ValueError("`smiles_col` must be given to use a screens file")
+    pattern_bits = _pattern_on_bits(fp_size, [_smarts_pattern(smarts)])[0]
+    pattern_words = _as_words(
+        _pack_on_bits(np.zeros_like(pattern_bits), pattern_bits, 1, fp_size)
+    )[0]
+    words = _substructure_screens(
+        df, mols_col, fp_size, n_jobs, screens, smiles_col
+    )
+
+    mols = df[mols_col].to_numpy()
+    candidates = pd.notna(mols)
+    # Only test the words with bits set in the pattern, one at a time.
+    for word in np.flatnonzero(pattern_words):
+        needed = pattern_words[word]
+        candidates &= (words[:, word] & needed) == needed
+    candidates = np.flatnonzero(candidates)
+
+    criteria = np.zeros(len(df), dtype=bool)
+    criteria[candidates] = _map_chunks(
+        partial(_has_substruct_matches, smarts),
+        list(mols[candidates]),
+        n_jobs,
+    )
+    if complement:
+        criteria = ~criteria
+
+    filtered = df[criteria]
+    _store_screens(
+        filtered, (mols_col, fp_size), mols[criteria], words[criteria]
+    )
+    return filtered
@@ -3,14 +3,31 @@ Finance-specific data cleaning functions.
 """
 
 import json
-from datetime import date, datetime
-from functools import lru_cache
-
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from datetime import date, datetime, timedelta
+from typing import Iterable, Tuple
+
+import numpy as np
+import pandas as pd
 import pandas_flavor as pf
 import requests
+from requests.adapters import HTTPAdapter
 
 from janitor import check
 
+# The exchange rate API to fetch rates from. Any server implementing the
+# exchangeratesapi.io interface may be used.
+API_URL = "https://api.exchangeratesapi.io"
+
+# Seconds to wait for the API to connect or respond.
+REQUEST_TIMEOUT = 30
+
 currency_set = {
     "AUD",
     "BGN",
@@ -56,7 +73,210 @@ def _check_currency(currency):
         )
 
 
-@lru_cache(maxsize=32)
+class RateCache:
+    """
+    A persistent cache of exchange rates, stored in a SQLite database.
+
+    Each entry holds all rates for one base currency on one date, as
+    returned by the API. Historical rates never change, so they are kept
+    until evicted; the latest rates expire after `ttl` seconds. When the
+    cache holds more than `max_entries` entries, the least recently fetched
+    ones are evicted.
+
+    The cache used by `convert_currency` is set with
+    `configure_rate_cache`.
+
+    :param path: Path to the SQLite database, which is created if needed.
+        ":memory:" is not supported, as every access opens a new connection.
+    :param ttl: Seconds after which the latest rates are fetched again.
+    :param max_entries: The maximum number of entries to keep.
+    """
+
+    def __init__(
+        self, path: str, ttl: float = 3600, max_entries: int = 100_000
+    ):
+        check("ttl", ttl, [int, float])
+        check("max_entries", max_entries, [int])
+        self.path = str(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rates ("
+                "base TEXT, date TEXT, fetched_at REAL, rates TEXT, "
+                "PRIMARY KEY (base, date))"
+            )
+
+    def _connect(self):
+        # A connection per call keeps the cache usable from several threads.
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, base: str, date_key: str):
+        """
+        Get the cached rates for a base currency.
+
+        :param base: The base currency.
+        :param date_key: An ISO date, or "latest".
+        :returns: A dict of rates per currency, or None if not cached (or
+            expired).
+        """
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT fetched_at, rates FROM rates "
+                "WHERE base = ? AND date = ?",
+                (base, date_key),
+            ).fetchone()
+        if row is None:
+            return None
+        fetched_at, rates = row
+        if date_key == "latest" and time.time() - fetched_at > self.ttl:
+            return None
+        return json.loads(rates)
+
+    def put(self, base: str, date_key: str, rates: dict):
+        """
+        Store the rates for a base currency.
+
+        :param base: The base currency.
+        :param date_key: An ISO date, or "latest".
+        :param rates: A dict of rates per currency.
+        """
+        self.put_many([(base, date_key, rates)])
+
+    def put_many(self, entries):
+        """
+        Store many entries at once, in a single transaction.
+
+        :param entries: An iterable of `(base, date_key, rates)` tuples.
+        """
+        now = time.time()
+        rows = [
+            (base, date_key, now, json.dumps(rates))
+            for base, date_key, rates in entries
+        ]
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO rates VALUES (?, ?, ?, ?)", rows
+            )
+            connection.execute(
+                "DELETE FROM rates WHERE rowid NOT IN ("
+                "SELECT rowid FROM rates ORDER BY fetched_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        """
+        Remove all cached rates.
+        """
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM rates")
+
+
+_DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "pyjanitor", "exchange_rates.sqlite"
+)
+_rate_cache = None
+_session = None
+_session_lock = threading.Lock()
+
+
+def configure_rate_cache(
+    path: str = _DEFAULT_CACHE_PATH,
+    ttl: float = 3600,
+    max_entries: int = 100_000,
+) -> RateCache:
+    """
+    Set up the persistent cache of exchange rates used by
+    `convert_currency`.
+
+    By default, rates are cached in `~/.cache/pyjanitor`, and the latest
+    rates are refreshed after an hour.
+
+    :param path: Path to the SQLite database.
+    :param ttl: Seconds after which the latest rates are fetched again.
+    :param max_entries: The maximum number of cached entries, each holding
+        all rates for one base currency and date.
+    :returns: The new RateCache.
+    """
+    global _rate_cache
+    _rate_cache = RateCache(path, ttl, max_entries)
+    return _rate_cache
+
+
+def _get_rate_cache() -> RateCache:
+    if _rate_cache is None:
+        return configure_rate_cache()
+    return _rate_cache
+
+
+def _get_session() -> requests.Session:
+    """
+    The HTTP session shared by all requests, to reuse connections.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def _request_rates(path: str, params: dict) -> dict:
+    """
+    Make a GET request to the exchange rate API, returning the JSON body.
+    """
+    result = _get_session().get(
+        f"{API_URL}/{path}", params=params, timeout=REQUEST_TIMEOUT
+    )
+
+    if result.status_code != 200:
+        raise ConnectionError(
+            "Exchange Rate API failed to receive a 200 "
+            "response from the server. "
+            "Please try again later."
+        )
+
+    return json.loads(result.text)
+
+
+def _fetch_rates(base: str, date_key: str) -> dict:
+    """
+    All rates for one base currency, from the cache or the API.
+
+    :param base: The base currency.
+    :param date_key: An ISO date, or "latest".
+    """
+    cache = _get_rate_cache()
+    rates = cache.get(base, date_key)
+    if rates is None:
+        rates = _request_rates(date_key, {"base": base})["rates"]
+        cache.put(base, date_key, rates)
+    return rates
+
+
+def _date_key(historical_date) -> str:
+    """
+    The API path for a date: the ISO date, or "latest" if None.
+    """
+    if not historical_date:
+        return "latest"
+    check("historical_date", historical_date, [datetime, date])
+    if isinstance(historical_date, datetime):
+        if historical_date < datetime(1999, 1, 4):
+            raise ValueError(
+                "historical_date:datetime must be later than 1999-01-04!"
+            )
+        return str(historical_date)[:10]
+    if historical_date < date(1999, 1, 4):
+        raise ValueError("historical_date:date must be later than 1999-01-04!")
+    return str(historical_date)
+
+
 def _convert_currency(
     from_currency: str = None,
     to_currency: str = None,
@@ -68,45 +288,352 @@ def _convert_currency(
     Helper function for `convert_currency` method.
 
     The API used is: https://exchangeratesapi.io/
+
+    All rates for `from_currency` are fetched in one request, and kept in
+    the persistent rate cache (see `configure_rate_cache`).
     """
+    date_key = _date_key(historical_date)
 
-    url = "https://api.exchangeratesapi.io"
+    _check_currency(from_currency)
+    _check_currency(to_currency)
 
-    if historical_date:
-        check("historical_date", historical_date, [datetime, date])
-        if isinstance(historical_date, datetime):
-            if historical_date < datetime(1999, 1, 4):
-                raise ValueError(
-                    "historical_date:datetime must be later than 1999-01-04!"
-                )
-            string_date = str(historical_date)[:10]
-        else:
-            if historical_date < date(1999, 1, 4):
-                raise ValueError(
-                    "historical_date:date must be later than 1999-01-04!"
-                )
-            string_date = str(historical_date)
-        url = url + "/%s" % string_date
+    if from_currency == to_currency:
+        return 1.0
+    return _fetch_rates(from_currency, date_key)[to_currency]
+
+
+def prefetch_rates(
+    dates: Iterable,
+    currency_pairs: Iterable[Tuple[str, str]],
+    max_workers: int = 8,
+    use_history: bool = True,
+):
+    """
+    Fetch the exchange rates for many dates at once, into the rate cache.
+
+    Later calls to `convert_currency` for these dates and currencies are then
+    served from the cache (see `configure_rate_cache`), without waiting on
+    one request per date:
+
+    .. code-block:: python
+
+        prefetch_rates(
+            pd.date_range("2015-01-01", "2019-12-31"),
+            [("USD", "EUR"), ("GBP", "EUR")],
+        )
+
+    Rates already cached are not fetched again. The others are fetched
+    concurrently, with at most `max_workers` requests at a time. Where
+    possible, all dates for one base currency are fetched with a single
+    request to the API's time-series (`/history`) endpoint; otherwise, one
+    request is made per date.
+
+    :param dates: The dates to fetch rates for. None fetches the latest.
+    :param currency_pairs: `(from_currency, to_currency)` pairs to fetch
+        rates for. All rates for each `from_currency` are fetched.
+    :param max_workers: The maximum number of concurrent requests.
+    :param use_history: Whether to use the time-series endpoint.
+    """
+    bases = set()
+    for from_currency, to_currency in currency_pairs:
+        _check_currency(from_currency)
+        _check_currency(to_currency)
+        bases.add(from_currency)
+    date_keys = {
+        _date_key(None if pd.isnull(day) else pd.Timestamp(day))
+        for day in dates
+    }
+    _prefetch(bases, date_keys, max_workers, use_history)
+
+
+def _prefetch(
+    bases: Iterable[str],
+    date_keys: Iterable[str],
+    max_workers: int = 8,
+    use_history: bool = True,
+) -> dict:
+    """
+    Make sure the rates for every base and date are cached.
+
+    :returns: A dict mapping `(base, date_key)` to the rates for that base
+        and date.
+    """
+    cache = _get_rate_cache()
+    fetched = {}
+    missing = []
+    for base in bases:
+        for date_key in date_keys:
+            rates = cache.get(base, date_key)
+            if rates is None:
+                missing.append((base, date_key))
+            else:
+                fetched[base, date_key] = rates
+    cached = set(fetched)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if use_history:
+            history_keys = {}
+            for base, date_key in missing:
+                if date_key != "latest":
+                    history_keys.setdefault(base, []).append(date_key)
+            histories = executor.map(
+                lambda item: _fetch_history(*item), history_keys.items()
+            )
+            for history in histories:
+                fetched.update(history)
+            missing = [key for key in missing if key not in fetched]
+
+        responses = executor.map(
+            lambda key: _request_rates(key[1], {"base": key[0]})["rates"],
+            missing,
+        )
+        for key, rates in zip(missing, responses):
+            fetched[key] = rates
+
+    cache.put_many(
+        (base, date_key, rates)
+        for (base, date_key), rates in fetched.items()
+        if (base, date_key) not in cached
+    )
+    return fetched
+
+
+def _fetch_history(base: str, date_keys: list) -> dict:
+    """
+    Fetch the rates of a base currency on many dates with one time-series
+    request.
+
+    Dates without rates of their own, such as weekends, get the rates of the
+    closest earlier date, as the API does for single dates. Dates that
+    cannot be filled that way, or all of them if the request fails, are
+    left out.
+
+    :returns: A dict mapping `(base, date_key)` to rates.
+    """
+    # Start a week early, so that leading weekends and holidays are filled.
+    first = datetime.strptime(min(date_keys), "%Y-%m-%d").date()
+    start = first - timedelta(days=7)
+    params = {"base": base, "start_at": str(start), "end_at": max(date_keys)}
+    try:
+        history = _request_rates("history", params)["rates"]
+    except (ConnectionError, requests.RequestException, KeyError, ValueError):
+        return {}
+    days = sorted(history)
+    fetched = {}
+    for date_key in date_keys:
+        position = bisect_right(days, date_key)
+        if position:
+            fetched[base, date_key] = history[days[position - 1]]
+    return fetched
+
+
+def _api_rate_table(dates, base_currency: str) -> pd.DataFrame:
+    """
+    A table of rates against `base_currency`, for use by
+    `_convert_with_rate_table`, fetched from the API.
+
+    :param dates: The dates needed, or None for the latest rates.
+    """
+    if dates is None:
+        date_keys = {"latest"}
     else:
-        url = url + "/latest"
+        date_keys = {
+            _date_key(pd.Timestamp(day)) for day in pd.unique(dates.dropna())
+        }
+    fetched = _prefetch([base_currency], date_keys)
+    today = pd.Timestamp.today().normalize()
+    rows = [
+        (today if date_key == "latest" else date_key, currency, rate)
+        for (_, date_key), rates in fetched.items()
+        for currency, rate in rates.items()
+    ]
+    return pd.DataFrame(rows, columns=["date", "currency", "rate"])
+
+
+def read_rate_table(
+    filename: str,
+    base_currency: str = "EUR",
+    date_col: str = "date",
+    currency_col: str = "currency",
+    rate_col: str = "rate",
+) -> pd.DataFrame:
+    """
+    Read a table of exchange rates from a CSV or Parquet file.
 
-    _check_currency(from_currency)
-    _check_currency(to_currency)
+    The rates are the amount of each currency that one unit of
+    `base_currency` buys, on each date. They may be stored in long format,
+    with one row per date and currency:
 
-    payload = {"base": from_currency, "symbols": to_currency}
+    .. code-block:: text
 
-    result = requests.get(url, params=payload)
+        date,currency,rate
+        2019-01-02,USD,1.1397
+        2019-01-02,GBP,0.9017
 
-    if result.status_code != 200:
-        raise ConnectionError(
-            "Exchange Rate API failed to receive a 200 "
-            "response from the server. "
-            "Please try again later."
+    or in wide format, with one column per currency:
+
+    .. code-block:: text
+
+        date,USD,GBP
+        2019-01-02,1.1397,0.9017
+
+    The result can be passed as `rates` to `convert_currency`:
+
+    .. code-block:: python
+
+        rates = read_rate_table("ecb_rates.parquet", base_currency="EUR")
+        df = df.convert_currency(
+            "amount",
+            to_currency="USD",
+            rates=rates,
+            currency_col="currency",
+            date_col="booked_on",
         )
 
-    currency_dict = json.loads(result.text)
-    rate = currency_dict["rates"][to_currency]
-    return rate
+    :param filename: Path to the file. Files ending in `.parquet` or `.pq`
+        are read as Parquet, everything else as CSV.
+    :param base_currency: The currency the rates are quoted against.
+    :param date_col: Name of the date column.
+    :param currency_col: Name of the currency column, in long format.
+    :param rate_col: Name of the rate column, in long format.
+    :returns: A DataFrame in long format, with columns `date`, `currency`
+        and `rate`, sorted by date. It includes a rate of 1 for
+        `base_currency` itself on every date.
+    """
+    if str(filename).endswith((".parquet", ".pq")):
+        table = pd.read_parquet(filename)
+    else:
+        table = pd.read_csv(filename)
+    return _normalize_rate_table(
+        table, base_currency, date_col, currency_col, rate_col
+    )
+
+
+def _normalize_rate_table(
+    table: pd.DataFrame,
+    base_currency: str,
+    date_col: str = "date",
+    currency_col: str = "currency",
+    rate_col: str = "rate",
+) -> pd.DataFrame:
+    """
+    Bring a long or wide table of rates into the long format used by
+    `convert_currency`.
+    """
+    if currency_col in table.columns and rate_col in table.columns:
+        rates = table[[date_col, currency_col, rate_col]]
+        rates.columns = ["date", "currency", "rate"]
+    else:
+        rates = table.melt(
+            id_vars=[date_col], var_name="currency", value_name="rate"
+        ).rename(columns={date_col: "date"})
+    rates = rates.assign(
+        date=pd.to_datetime(rates["date"]),
+        rate=pd.to_numeric(rates["rate"]).astype(float),
+    ).dropna(subset=["rate"])
+
+    if base_currency not in set(rates["currency"]):
+        base_rates = pd.DataFrame(
+            {"date": rates["date"].unique(), "currency": base_currency}
+        ).assign(rate=1.0)
+        rates = pd.concat([rates, base_rates], ignore_index=True)
+    return rates.sort_values("date", kind="stable").reset_index(drop=True)
+
+
+def _lookup_rates(
+    rates: pd.DataFrame, currencies: pd.Series, dates: pd.Series = None
+) -> np.ndarray:
+    """
+    Look up the rate of each currency in `currencies` in one pass.
+
+    Each row gets the latest rate on or before its date, as with
+    `pd.merge_asof`; without `dates`, the latest rate in the table. Rows
+    without a rate get NaN.
+    """
+    if dates is None:
+        latest = rates.groupby("currency")["rate"].last()
+        return currencies.map(latest).to_numpy(dtype=float)
+
+    # Matching on integer codes is much faster than on currency strings, and
+    # each distinct (date, currency) pair only needs to be matched once.
+    codes, currency_names = pd.factorize(rates["currency"])
+    right = pd.DataFrame(
+        {
+            "date": rates["date"].to_numpy(),
+            "code": codes,
+            "rate": rates["rate"].to_numpy(),
+        }
+    )
+    date_codes, unique_dates = pd.factorize(pd.to_datetime(dates))
+    currency_codes = currency_names.get_indexer(currencies)
+    num_codes = len(currency_names) + 1
+    pair_codes, unique_pairs = pd.factorize(
+        date_codes.astype(np.int64) * num_codes + currency_codes + 1
+    )
+    # Missing dates and currencies not in the table have negative codes.
+    pair_ids = np.flatnonzero(
+        (unique_pairs >= 0) & (unique_pairs % num_codes > 0)
+    )
+    left = pd.DataFrame(
+        {
+            "date": unique_dates.take(unique_pairs[pair_ids] // num_codes),
+            "code": unique_pairs[pair_ids] % num_codes - 1,
+            "pair": pair_ids,
+        }
+    )
+    merged = pd.merge_asof(
+        left.sort_values("date", kind="stable"),
+        right,
+        on="date",
+        by="code",
+        direction="backward",
+    )
+    pair_rates = np.full(len(unique_pairs), np.nan)
+    pair_rates[merged["pair"].to_numpy()] = merged["rate"].to_numpy()
+    return pair_rates[pair_codes]
+
+
+def _convert_with_rate_table(
+    df,
+    colname: str,
+    from_currency: str,
+    to_currency: str,
+    historical_date,
+    rates: pd.DataFrame,
+    currency_col: str,
+    date_col: str,
+    base_currency: str,
+) -> pd.Series:
+    """
+    Convert a column with a table of rates against `base_currency`.
+
+    Amounts are converted into the base currency and from there into
+    `to_currency`, so any two currencies in the table can be converted.
+    """
+    if isinstance(rates, pd.DataFrame):
+        rates = _normalize_rate_table(rates, base_currency)
+    else:
+        rates = read_rate_table(rates, base_currency)
+
+    if currency_col is not None:
+        from_currencies = df[currency_col]
+    elif from_currency is not None:
+        from_currencies = pd.Series(from_currency, index=df.index)
+    else:
+        raise ValueError("One of from_currency or currency_col is required.")
+
+    if date_col is not None:
+        dates = df[date_col]
+    elif historical_date is not None:
+        dates = pd.Series(pd.Timestamp(historical_date), index=df.index)
+    else:
+        dates = None
+
+    to_currencies = pd.Series(to_currency, index=df.index)
+    rate = _lookup_rates(rates, to_currencies, dates) / _lookup_rates(
+        rates, from_currencies, dates
+    )
+    return df[colname] * rate
 
 
 @pf.register_dataframe_method
@@ -117,11 +644,22 @@ def convert_currency(
     to_currency: str = None,
     historical_date: date = None,
     make_new_column: bool = False,
+    rates=None,
+    currency_col: str = None,
+    date_col: str = None,
+    base_currency: str = "EUR",
 ):
     """
     Converts a column from one currency to another, with an option to
     convert based on historical exchange values.
 
+    By default, the exchange rate is fetched from an online API. Given a
+    local table of `rates` instead (see `read_rate_table`), the whole column
+    is converted in one vectorized pass, without any network access. Each
+    row may then have its own source currency, from `currency_col`, and its
+    own date, from `date_col`. Rows are converted at the latest rate on or
+    before their date, via the table's `base_currency`.
+
     :param df: A pandas dataframe.
     :param colname: Name of the new column. Should be a string, in order
         for the column name to be compatible with the Feather binary
@@ -141,6 +679,17 @@ def convert_currency(
     :param historical_date: If supplied, get exchange rate on a certain\
     date. If not supplied, get the latest exchange rate. The exchange\
     rates go back to Jan. 4, 1999.
+    :param make_new_column: Whether to store the converted values in a new
+        column, named `<colname>_<to_currency>`.
+    :param rates: (optional) A table of exchange rates, as a DataFrame in
+        the long or wide format described in `read_rate_table`, or the path
+        of a CSV or Parquet file with such a table.
+    :param currency_col: (optional) Name of the column holding each row's
+        source currency, when converting with `rates`. Replaces
+        `from_currency`.
+    :param date_col: (optional) Name of the column holding each row's date,
+        when converting with `rates`. Replaces `historical_date`.
+    :param base_currency: The currency the `rates` are quoted against.
 
     :Setup:
 
@@ -186,13 +735,37 @@ def convert_currency(
 
     """
 
-    rate = _convert_currency(from_currency, to_currency, historical_date)
+    if rates is None and (currency_col is not None or date_col is not None):
+        # Fetch all rates needed at once, and convert as with a local table.
+        if date_col is not None:
+            dates = df[date_col]
+        elif historical_date is not None:
+            dates = pd.Series([pd.Timestamp(historical_date)])
+        else:
+            dates = None
+        rates = _api_rate_table(dates, base_currency)
+
+    if rates is not None:
+        converted = _convert_with_rate_table(
+            df,
+            colname,
+            from_currency,
+            to_currency,
+            historical_date,
+            rates,
+            currency_col,
+            date_col,
+            base_currency,
+        )
+    else:
+        rate = _convert_currency(from_currency, to_currency, historical_date)
+        converted = df[colname] * rate
 
     if make_new_column:
         new_col_name = colname + "_" + to_currency
-        df[new_col_name] = df[colname] * rate
+        df[new_col_name] = converted
 
     else:
-        df[colname] = df[colname] * rate
+        df[colname] = converted
 
     return df
@@ -2,19 +2,23 @@
 General purpose data cleaning functions.
 """
 import datetime as dt
+import json
+import os
 import re
 import warnings
-from functools import partial, reduce
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial, reduce
+from itertools import islice
 from typing import Dict, Iterable, List, Union
 from fnmatch import translate
 
 import numpy as np
 import pandas as pd
 import pandas_flavor as pf
-from scipy.stats import mode
 from sklearn.preprocessing import LabelEncoder
 
 from .errors import JanitorError
+from .utils import import_message
 
 
 def _strip_underscores(df, strip_underscores=None):
@@ -1104,15 +1108,666 @@ def filter_date(
     return df.loc[_date_filter_conditions(_filter_list), :]
 
 
+def _chunked(iterable: Iterable, chunksize: int):
+    """
+    Yield successive lists of at most `chunksize` items from `iterable`.
+
+    Only one chunk is held in memory at a time, which lets us stream through
+    allow-lists that are too large to materialize.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_file_lines(filename):
+    with open(filename, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def _iter_file_values(filename, dtype=None, chunksize: int = 1_000_000):
+    """
+    Lazily yield the newline-delimited values stored in a text file.
+
+    Surrounding whitespace is stripped and blank lines are skipped. Values
+    are strings, unless a `dtype` is given, in which case they are
+    converted with `pandas.Series.astype`, `chunksize` values at a time.
+    """
+    lines = _iter_file_lines(filename)
+    if dtype is None:
+        yield from lines
+        return
+    for chunk in _chunked(lines, chunksize):
+        yield from pd.Series(chunk, dtype=object).astype(dtype)
+
+
+_TIME_TYPES = (dt.datetime, dt.timedelta, np.datetime64, np.timedelta64)
+
+
+def _hash_values(values) -> np.ndarray:
+    """
+    Hash an array-like of values into 64-bit unsigned integers.
+
+    Numeric values are normalized to float64 first, so that values which
+    compare equal in `pandas.Series.isin` (e.g. `1`, `1.0` and `True`) also
+    hash equally. Datetimes and timedeltas, whether in datetime64 arrays or
+    as `Timestamp`, `datetime64` or `datetime` objects, are hashed as their
+    nanoseconds. Everything else is hashed through its string
+    representation.
+    """
+    if isinstance(values, (list, tuple)):
+        # np.asarray would turn a list mixing numbers and strings into
+        # strings, so that the numbers no longer hash as numbers.
+        values = pd.array(values, dtype=object)
+    values = np.asarray(values)
+    if values.dtype.kind in "biuf":
+        return _hash_numeric(values)
+    if values.dtype.kind in "mM":
+        return _hash_numeric(_time_ns(values))
+
+    values = values.astype(object)
+    inferred = pd.api.types.infer_dtype(values, skipna=False)
+    numeric = {
+        "integer",
+        "integer-na",
+        "floating",
+        "mixed-integer-float",
+        "boolean",
+    }
+    if inferred in numeric:
+        return _hash_numeric(values.astype(float))
+    hashes = pd.util.hash_array(values, categorize=False)
+    if inferred in {"string", "bytes", "empty"}:
+        return hashes
+    is_numeric = np.array(
+        [
+            isinstance(v, (int, float, np.number))
+            and not isinstance(v, np.timedelta64)
+            for v in values
+        ],
+        dtype=bool,
+    )
+    hashes[is_numeric] = _hash_numeric(values[is_numeric].astype(float))
+    is_time = np.array(
+        [isinstance(v, _TIME_TYPES) for v in values], dtype=bool
+    )
+    if is_time.any():
+        hashes[is_time] = _hash_numeric(_time_ns(values[is_time]))
+    return hashes
+
+
+def _time_ns(values: np.ndarray) -> np.ndarray:
+    """
+    Datetimes and timedeltas as float nanoseconds, with NaT as NaN.
+    """
+    if values.dtype == object:
+        ns = np.full(len(values), np.nan)
+        for i, value in enumerate(values):
+            if pd.isna(value):
+                continue
+            if isinstance(value, (dt.timedelta, np.timedelta64)):
+                ns[i] = pd.Timedelta(value).value
+            else:
+                # Timezone-aware Timestamps give their UTC time, as in `isin`.
+                ns[i] = pd.Timestamp(value).value
+        return ns
+    values = values.astype(f"{values.dtype.kind}8[ns]")
+    ns = values.view("int64").astype(float)
+    ns[np.isnat(values)] = np.nan
+    return ns
+
+
+def _hash_numeric(values: np.ndarray) -> np.ndarray:
+    # Adding 0.0 folds -0.0 onto 0.0; every NaN is mapped onto the same NaN.
+    values = values.astype(float) + 0.0
+    values[np.isnan(values)] = np.nan
+    return pd.util.hash_array(values)
+
+
+class BloomFilter:
+    """
+    A compact, probabilistic set membership structure.
+
+    A Bloom filter never produces false negatives, but may produce false
+    positives at (approximately) the configured `error_rate`. Bits are
+    stored packed, so a filter holding 100 million values at a 1% error rate
+    takes up roughly 120 MB, regardless of how large the values themselves
+    are.
+
+    It is primarily intended as a prefilter for `filter_column_isin`, on
+    allow-lists that do not fit into memory as a Python set:
+
+    .. code-block:: python
+
+        bloom = BloomFilter.from_file(
+            "allowed_ids.txt", error_rate=0.001, dtype=int
+        )
+        bloom.save("allowed_ids.bloom")
+
+        # Later on, possibly in a different process:
+        bloom = BloomFilter.load("allowed_ids.bloom")
+        df = df.filter_column_isin(
+            "id", "allowed_ids.txt", bloom_filter=bloom, dtype=int
+        )
+
+    :param capacity: The number of values the filter is expected to hold.
+    :param error_rate: The target false positive rate, once `capacity`
+        values have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        check("capacity", capacity, [int])
+        check("error_rate", error_rate, [float])
+        if capacity < 1:
+            raise ValueError("`capacity` must be 1 or greater")
+        if not 0 < error_rate < 1:
+            raise ValueError("`error_rate` must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        num_bits = int(
+            np.ceil(-capacity * np.log(error_rate) / np.log(2) ** 2)
+        )
+        self.num_bits = max(num_bits, 8)
+        self.num_hashes = max(
+            int(round(self.num_bits / capacity * np.log(2))), 1
+        )
+        self.bits = np.zeros(int(np.ceil(self.num_bits / 8)), dtype=np.uint8)
+
+    def _positions(self, values):
+        """
+        Yield the bit positions of `values`, one array per hash function.
+
+        Uses double hashing, i.e. the i-th position is `h1 + i * h2`.
+        """
+        hashes = _hash_values(values)
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        num_bits = np.uint64(self.num_bits)
+        for i in range(self.num_hashes):
+            yield (h1 + np.uint64(i) * h2) % num_bits
+
+    def add(self, values):
+        """
+        Add an array-like of values to the filter.
+
+        :param values: A list, tuple, numpy array or pandas Series.
+        :returns: The BloomFilter, to allow for chaining.
+        """
+        for positions in self._positions(values):
+            byte = positions >> np.uint64(3)
+            bit = (positions & np.uint64(7)).astype(np.uint8)
+            # Fancy-indexed `|=` drops repeated indices, so we set one bit
+            # offset at a time: within a single offset, repeats are harmless.
+            for offset in range(8):
+                selected = byte[bit == offset]
+                self.bits[selected] |= np.uint8(1 << offset)
+        return self
+
+    def contains(self, values) -> np.ndarray:
+        """
+        Test an array-like of values for membership.
+
+        :param values: A list, tuple, numpy array or pandas Series.
+        :returns: A boolean numpy array. `False` entries are definitely not
+            in the filter; `True` entries probably are.
+        """
+        found = np.ones(len(values), dtype=bool)
+        for positions in self._positions(values):
+            byte = positions >> np.uint64(3)
+            bit = (positions & np.uint64(7)).astype(np.uint8)
+            found &= ((self.bits[byte] >> bit) & 1).astype(bool)
+        return found
+
+    def __contains__(self, value) -> bool:
+        return bool(self.contains([value])[0])
+
+    @classmethod
+    def from_iterable(
+        cls,
+        iterable: Iterable,
+        capacity: int = None,
+        error_rate: float = 0.01,
+        chunksize: int = 1_000_000,
+    ):
+        """
+        Build a BloomFilter by streaming through an iterable.
+
+        The iterable is consumed in chunks of `chunksize` values, so it may
+        be a generator yielding far more values than fit into memory.
+
+        :param iterable: The values to add to the filter.
+        :param capacity: The number of values the filter is expected to
+            hold. May be omitted if `iterable` has a length.
+        :param error_rate: The target false positive rate.
+        :param chunksize: The number of values hashed at a time.
+        :returns: A BloomFilter.
+        """
+        if capacity is None:
+            if not hasattr(iterable, "__len__"):
+                raise ValueError(
+                    "`capacity` must be provided when `iterable` has no "
+                    "length, e.g. for generators."
+                )
+            capacity = max(len(iterable), 1)
+
+        bloom = cls(capacity, error_rate)
+        if isinstance(iterable, (np.ndarray, pd.Series, pd.Index)):
+            values = np.asarray(iterable)
+            for start in range(0, len(values), chunksize):
+                stop = start + chunksize
+                bloom.add(values[start:stop])
+        else:
+            for chunk in _chunked(iterable, chunksize):
+                bloom.add(chunk)
+        return bloom
+
+    @classmethod
+    def from_file(
+        cls,
+        filename: str,
+        capacity: int = None,
+        error_rate: float = 0.01,
+        chunksize: int = 1_000_000,
+        dtype=None,
+    ):
+        """
+        Build a BloomFilter from a file holding one value per line.
+
+        Values are read as strings, unless a `dtype` is given. To filter a
+        numeric column, read the values as numbers, e.g. with `dtype=int`,
+        so that they hash like the column's values. If `capacity` is
+        omitted, the file is read once beforehand to count its values.
+
+        :param filename: Path to the text file.
+        :param capacity: The number of values the filter is expected to
+            hold.
+        :param error_rate: The target false positive rate.
+        :param chunksize: The number of values hashed at a time.
+        :param dtype: (optional) The dtype to convert the values to.
+        :returns: A BloomFilter.
+        """
+        if capacity is None:
+            capacity = max(sum(1 for _ in _iter_file_lines(filename)), 1)
+        return cls.from_iterable(
+            _iter_file_values(filename, dtype, chunksize),
+            capacity=capacity,
+            error_rate=error_rate,
+            chunksize=chunksize,
+        )
+
+    def save(self, filename: str):
+        """
+        Save the filter to disk, as a numpy `.npz` archive.
+
+        :param filename: The path to save to.
+        """
+        with open(filename, "wb") as f:
+            np.savez(
+                f,
+                bits=self.bits,
+                capacity=self.capacity,
+                error_rate=self.error_rate,
+                num_bits=self.num_bits,
+                num_hashes=self.num_hashes,
+            )
+
+    @classmethod
+    def load(cls, filename: str):
+        """
+        Load a filter previously written with `BloomFilter.save`.
+
+        :param filename: The path to load from.
+        :returns: A BloomFilter.
+        """
+        with np.load(filename) as data:
+            bloom = cls(int(data["capacity"]), float(data["error_rate"]))
+            bloom.num_bits = int(data["num_bits"])
+            bloom.num_hashes = int(data["num_hashes"])
+            bloom.bits = data["bits"]
+        return bloom
+
+
+def _isin_streaming(values: pd.Series, iterable: Iterable, chunksize: int):
+    """
+    Exact `values.isin(iterable)` that streams through `iterable` in chunks.
+
+    Only `values` and one chunk of `iterable` are held in memory at a time.
+    """
+    found = np.zeros(len(values), dtype=bool)
+    for chunk in _chunked(iterable, chunksize):
+        found |= values.isin(chunk).to_numpy()
+        if found.all():
+            break
+    return found
+
+
+def _filter_column_isin_bloom(
+    column: pd.Series,
+    iterable: Iterable,
+    bloom_filter: BloomFilter,
+    chunksize: int,
+    dtype=None,
+) -> np.ndarray:
+    """
+    Exact `isin` criteria for `column`, prefiltered by a Bloom filter.
+
+    Helper function for `filter_column_isin`.
+    """
+    check("bloom_filter", bloom_filter, [BloomFilter])
+    if isinstance(iterable, (str, os.PathLike)):
+        iterable = _iter_file_values(iterable, dtype, chunksize)
+
+    candidates = bloom_filter.contains(column)
+    # drop_duplicates keeps the column's dtype, which pd.Series would infer
+    # anew, e.g. turning NaN among datetimes into NaT.
+    candidate_values = column[candidates].drop_duplicates()
+    confirmed = candidate_values[
+        _isin_streaming(candidate_values, iterable, chunksize)
+    ]
+    return candidates & column.isin(confirmed).to_numpy()
+
+
+def _levenshtein(a: str, b: str, max_distance: int) -> int:
+    """
+    Levenshtein (edit) distance between two strings.
+
+    Only the diagonal band of width `max_distance` of the dynamic programming
+    table is computed, and the computation gives up early once the distance
+    is known to exceed `max_distance`. In that case `max_distance + 1` is
+    returned.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    too_far = max_distance + 1
+    if len(a) - len(b) > max_distance:
+        return too_far
+
+    previous = [min(j, too_far) for j in range(len(b) + 1)]
+    for i, char_a in enumerate(a, 1):
+        current = [too_far] * (len(b) + 1)
+        current[0] = min(i, too_far)
+        lowest = max(1, i - max_distance)
+        highest = min(len(b), i + max_distance)
+        for j in range(lowest, highest + 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != b[j - 1]),
+                too_far,
+            )
+        if min(current) == too_far:
+            return too_far
+        previous = current
+    return previous[-1]
+
+
+class NGramIndex:
+    """
+    Character n-gram inverted index over a list of reference strings.
+
+    Used by `filter_column_isin` for fuzzy matching. Similarity between two
+    strings is defined as `1 - levenshtein(a, b) / max(len(a), len(b))`.
+
+    Rather than comparing a query against every reference string, the index
+    looks up the references that share n-grams with the query, and discards
+    those that cannot possibly reach the similarity threshold, using the
+    length filter and the q-gram count filter. Only the survivors have
+    their edit distance computed.
+
+    Building the index once and reusing it across calls avoids rebuilding it
+    on every filter:
+
+    .. code-block:: python
+
+        index = NGramIndex(reference_names)
+        df = df.filter_column_isin("vendor", index, fuzzy=True)
+
+    :param references: The reference strings.
+    :param n: The length of the character n-grams.
+    """
+
+    def __init__(self, references: Iterable[str], n: int = 3):
+        check("n", n, [int])
+        if n < 1:
+            raise ValueError("`n` must be 1 or greater")
+
+        self.n = n
+        self.references = list(references)
+        self._exact = {}
+        self._lengths = np.zeros(len(self.references), dtype=np.int64)
+        self._num_grams = np.zeros(len(self.references), dtype=np.int64)
+
+        postings = {}
+        for idx, reference in enumerate(self.references):
+            self._exact.setdefault(reference, idx)
+            grams = self._grams(reference)
+            self._lengths[idx] = len(reference)
+            self._num_grams[idx] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(idx)
+        self._postings = {
+            gram: np.array(ids, dtype=np.int64)
+            for gram, ids in postings.items()
+        }
+        self._ids_by_length = {
+            length: np.flatnonzero(self._lengths == length)
+            for length in np.unique(self._lengths)
+        }
+        self._min_grams_by_length = {
+            length: self._num_grams[ids].min()
+            for length, ids in self._ids_by_length.items()
+        }
+
+    def __len__(self):
+        return len(self.references)
+
+    def _grams(self, string: str) -> set:
+        padding = "\0" * (self.n - 1)
+        padded = padding + string + padding
+        # Each gram ends `n` characters after it starts.
+        ends = range(self.n, len(padded) + 1)
+        return {padded[start:end] for start, end in enumerate(ends)}
+
+    def _may_match_unshared(
+        self, query_length, query_grams, length, threshold
+    ) -> bool:
+        """
+        Whether references of `length` may be similar enough to the query
+        without sharing a single n-gram with it.
+        """
+        max_distance = int((1 - threshold) * max(query_length, length) + 1e-9)
+        num_grams = max(query_grams, self._min_grams_by_length[length])
+        return (
+            abs(query_length - length) <= max_distance
+            and num_grams <= self.n * max_distance
+        )
+
+    def match(self, query: str, threshold: float = 0.8):
+        """
+        Find the most similar reference string to `query`.
+
+        :param query: The string to look up.
+        :param threshold: The minimum similarity, between 0 and 1, for a
+            reference string to count as a match.
+        :returns: A tuple of the position of the best match in
+            `references` and its similarity. If nothing reaches the
+            threshold, the position is -1 and the similarity is NaN.
+        """
+        if not isinstance(query, str):
+            return -1, np.nan
+        if query in self._exact:
+            return self._exact[query], 1.0
+
+        grams = self._grams(query)
+        postings = [self._postings[g] for g in grams if g in self._postings]
+        postings.append(np.array([], dtype=np.int64))
+        ids, shared = np.unique(np.concatenate(postings), return_counts=True)
+
+        # Very short strings may be within the threshold without sharing any
+        # n-gram at all, so those references have to be added explicitly.
+        unshared = [
+            ids_of_length
+            for length, ids_of_length in self._ids_by_length.items()
+            if self._may_match_unshared(
+                len(query), len(grams), length, threshold
+            )
+        ]
+        if unshared:
+            unshared = np.setdiff1d(np.concatenate(unshared), ids)
+            ids = np.concatenate([ids, unshared])
+            shared = np.concatenate([shared, np.zeros_like(unshared)])
+
+        lengths = self._lengths[ids]
+        max_distances = np.floor(
+            (1 - threshold) * np.maximum(lengths, len(query)) + 1e-9
+        ).astype(np.int64)
+        # Each edit destroys at most `n` of the n-grams of a string, which
+        # bounds from below how many n-grams two close strings must share.
+        min_shared = (
+            np.maximum(self._num_grams[ids], len(grams))
+            - self.n * max_distances
+        )
+        keep = (np.abs(lengths - len(query)) <= max_distances) & (
+            shared >= min_shared
+        )
+        ids, shared, max_distances = (
+            ids[keep],
+            shared[keep],
+            max_distances[keep],
+        )
+
+        best_id, best_score = -1, np.nan
+        for i in np.argsort(-shared, kind="stable"):
+            reference = self.references[ids[i]]
+            longest = max(len(query), len(reference))
+            max_distance = max_distances[i]
+            if best_id != -1:
+                # Only strictly closer references can replace the best match.
+                max_distance = min(
+                    max_distance,
+                    int(np.ceil((1 - best_score) * longest - 1e-9)) - 1,
+                )
+                min_shared = (
+                    max(self._num_grams[ids[i]], len(grams))
+                    - self.n * max_distance
+                )
+                if max_distance < 0 or shared[i] < min_shared:
+                    continue
+            distance = _levenshtein(query, reference, max_distance)
+            if distance > max_distance:
+                continue
+            score = 1 - distance / longest
+            if score < threshold:
+                continue
+            best_id, best_score = ids[i], score
+        return best_id, best_score
+
+
+_FUZZY_INDEX = None
+
+
+def _init_fuzzy_worker(index: NGramIndex):
+    global _FUZZY_INDEX
+    _FUZZY_INDEX = index
+
+
+def _fuzzy_match_chunk(queries: List[str], threshold: float):
+    return [_FUZZY_INDEX.match(query, threshold) for query in queries]
+
+
+def _fuzzy_match(
+    index: NGramIndex, queries: List[str], threshold: float, n_jobs: int
+):
+    """
+    Match every query against the index, using `n_jobs` processes.
+
+    Helper function for `filter_column_isin`.
+    """
+    if n_jobs == 1 or len(queries) < 2:
+        matches = [index.match(query, threshold) for query in queries]
+    else:
+        if n_jobs == -1:
+            n_jobs = os.cpu_count()
+        chunksize = int(np.ceil(len(queries) / (n_jobs * 4)))
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_fuzzy_worker,
+            initargs=(index,),
+        ) as executor:
+            chunks = executor.map(
+                partial(_fuzzy_match_chunk, threshold=threshold),
+                list(_chunked(queries, chunksize)),
+            )
+            matches = [match for chunk in chunks for match in chunk]
+
+    ids = np.array([match[0] for match in matches], dtype=np.int64)
+    scores = np.array([match[1] for match in matches], dtype=float)
+    return ids, scores
+
+
+def _filter_column_isin_fuzzy(
+    df: pd.DataFrame,
+    column: str,
+    iterable: Iterable,
+    complement: bool,
+    threshold: float,
+    n_jobs: int,
+) -> pd.DataFrame:
+    """
+    Fuzzy `isin` filter of `df` on `column`.
+
+    Helper function for `filter_column_isin`.
+    """
+    check("threshold", threshold, [float, int])
+    if not 0 < threshold <= 1:
+        raise ValueError("`threshold` must be between 0 and 1")
+
+    index = iterable
+    if not isinstance(index, NGramIndex):
+        index = NGramIndex(iterable)
+
+    # Each distinct value only needs to be matched once.
+    codes, uniques = pd.factorize(df[column])
+    queries = list(uniques)
+    ids, scores = _fuzzy_match(index, queries, threshold, n_jobs)
+
+    ids = np.append(ids, -1)[codes]
+    criteria = ids != -1
+    if complement:
+        return df[~criteria]
+
+    references = np.array(index.references + [None], dtype=object)
+    df = df[criteria].copy()
+    df[f"{column}_match"] = references[ids[criteria]]
+    df[f"{column}_score"] = np.append(scores, np.nan)[codes][criteria]
+    return df
+
+
 @pf.register_dataframe_method
 def filter_column_isin(
-    df: pd.DataFrame, column: str, iterable: Iterable, complement: bool = False
+    df: pd.DataFrame,
+    column: str,
+    iterable: Iterable,
+    complement: bool = False,
+    bloom_filter: BloomFilter = None,
+    chunksize: int = 1_000_000,
+    fuzzy: bool = False,
+    threshold: float = 0.8,
+    n_jobs: int = 1,
+    dtype=None,
 ):
     """
     Filters a dataframe based on whether the values of a given column are
     present inside another iterable.
 
-    Assumes exact matching; fuzzy matching not implemented
+    Assumes exact matching, unless `fuzzy=True` is passed.
 
     The below example syntax will filter the DataFrame such that we only get
     rows for which the "names" are exactly "James" and "John".
@@ -1132,13 +1787,72 @@ def filter_column_isin(
 
         df = df[df['names'].isin(['James', 'John'])]
 
+    For allow-lists that are too large to hold in memory, a prebuilt
+    `BloomFilter` of the allow-list can be passed in. The filter runs
+    first; only the (unique) values that pass it are then checked exactly,
+    by streaming through `iterable` in chunks. The result is identical to
+    the exact filter, for both `complement=False` and `complement=True`.
+
+    .. code-block:: python
+
+        bloom = BloomFilter.load("allowed_ids.bloom")
+        df = df.filter_column_isin(
+            "id", "allowed_ids.txt", bloom_filter=bloom, dtype=int
+        )
+
+    Values read from a file are strings, unless a `dtype` is given; for a
+    numeric column such as "id" above, read them as numbers so that they
+    can match.
+
+    With `fuzzy=True`, string values are kept if they are similar enough to
+    one of the strings in `iterable`, where similarity is
+    `1 - levenshtein(a, b) / max(len(a), len(b))`. The best matching
+    reference string and its similarity are added to the returned rows as
+    the `<column>_match` and `<column>_score` columns. Candidates are looked
+    up through a character n-gram index (see `NGramIndex`), so that not
+    every pair of strings is compared.
+
+    .. code-block:: python
+
+        df = df.filter_column_isin(
+            "vendor", reference_names, fuzzy=True, threshold=0.85, n_jobs=4
+        )
+
     :param df: A pandas DataFrame
     :param column: The column on which to filter.
     :param iterable: An iterable. Could be a list, tuple, another pandas
-        Series.
+        Series. If `bloom_filter` is provided, this may also be a generator,
+        or the path to a file holding one value per line.
     :param complement: Whether to return the complement of the selection or
         not.
+    :param bloom_filter: (optional) A `BloomFilter` built from the values of
+        `iterable`, used as a prefilter.
+    :param chunksize: The number of values of `iterable` held in memory at a
+        time while checking the prefiltered candidates exactly. Only used
+        with `bloom_filter`.
+    :param fuzzy: Whether to match strings approximately. `iterable` may
+        then also be a prebuilt `NGramIndex`.
+    :param threshold: The minimum similarity, between 0 and 1, of a fuzzy
+        match. Only used with `fuzzy=True`.
+    :param n_jobs: The number of processes used for fuzzy matching. -1 uses
+        all CPUs. Only used with `fuzzy=True`.
+    :param dtype: (optional) The dtype to convert the values of a file
+        `iterable` to, such as `int`. Only used with `bloom_filter`.
     """
+    if fuzzy:
+        return _filter_column_isin_fuzzy(
+            df, column, iterable, complement, threshold, n_jobs
+        )
+
+    if bloom_filter is not None:
+        criteria = _filter_column_isin_bloom(
+            df[column], iterable, bloom_filter, chunksize, dtype
+        )
+        if complement:
+            return df[~criteria]
+        else:
+            return df[criteria]
+
     if len(iterable) == 0:
         raise ValueError(
             "`iterable` kwarg must be given an iterable of length 1 or greater"
@@ -1167,15 +1881,144 @@ def remove_columns(df: pd.DataFrame, columns: List):
     :param df: A pandas DataFrame
     :param columns: The columns to remove.
     """
-    for col in columns:
-        del df[col]
+    df.drop(columns=columns, inplace=True)
     return df
 
 
+def _expand_column_patterns(df: pd.DataFrame, patterns) -> List:
+    """
+    Expand column names and shell-style glob patterns into column names.
+
+    Names that exist in the DataFrame are taken as-is; otherwise, strings
+    containing glob characters (`*`, `?`, `[`) are matched against all
+    string column names. A tuple that is a column name, as with MultiIndex
+    columns, is one name rather than several.
+    """
+    try:
+        is_label = patterns in df.columns
+    except TypeError:
+        # Unhashable, e.g. a list of patterns.
+        is_label = False
+    if (
+        is_label
+        or isinstance(patterns, str)
+        or not isinstance(patterns, Iterable)
+    ):
+        patterns = [patterns]
+
+    columns = []
+    for pattern in patterns:
+        if pattern in df.columns:
+            columns.append(pattern)
+        elif isinstance(pattern, str) and any(c in pattern for c in "*?["):
+            regex = re.compile(translate(pattern))
+            columns.extend(
+                col
+                for col in df.columns
+                if isinstance(col, str) and regex.match(col)
+            )
+        else:
+            raise KeyError(f"{pattern} not present in dataframe columns!")
+    return columns
+
+
+# Above this many columns, `_replace_columns` rebuilds the DataFrame.
+_MAX_COLUMN_ASSIGNMENTS = 10
+
+
+def _replace_columns(df: pd.DataFrame, new_columns: Dict) -> pd.DataFrame:
+    """
+    Replace the given columns of the DataFrame.
+
+    A few columns are assigned one by one, as with `df[col] = series`, to
+    a shallow copy of the DataFrame, which leaves `df` unchanged. Each such
+    assignment copies the rest of the column's block, so when many columns
+    are replaced, the DataFrame is instead rebuilt once, from the untouched
+    columns and the new ones.
+
+    :param new_columns: A DataFrame of new columns, or a dict mapping
+        existing column names to Series.
+    """
+    few = len(new_columns.keys()) <= _MAX_COLUMN_ASSIGNMENTS
+    if few or not df.columns.is_unique:
+        df = df.copy(deep=False)
+        for col, series in new_columns.items():
+            df[col] = series
+        return df
+    if isinstance(new_columns, pd.DataFrame):
+        new = new_columns
+    else:
+        new = pd.concat(list(new_columns.values()), axis=1)
+        new.columns = df.columns[df.columns.get_indexer(list(new_columns))]
+    result = pd.concat([df.drop(columns=new.columns), new], axis=1)
+    return result.reindex(columns=df.columns)
+
+
+_NUMERIC_DOWNCAST_DTYPES = {
+    "i": ["int8", "uint8", "int16", "uint16", "int32", "uint32", "int64"],
+    "u": ["uint8", "uint16", "uint32", "uint64"],
+    "f": ["float32", "float64"],
+}
+
+
+def _smallest_numeric_dtype(series: pd.Series, dtype=None):
+    """
+    Find the narrowest dtype that holds all values of a numeric Series.
+
+    Integers are fitted to the observed minimum and maximum. Floats are only
+    downcast to float32 if every value survives the round trip exactly.
+    Nullable (extension) dtypes are downcast to nullable dtypes.
+
+    :param series: A numeric pandas Series.
+    :param dtype: (optional) The dtype the Series will be converted to. Its
+        kind (int, unsigned int or float) determines the candidate dtypes.
+        Defaults to the dtype of the Series.
+    :returns: The smallest dtype, or `dtype` if no smaller one was found.
+    """
+    target = pd.api.types.pandas_dtype(
+        series.dtype if dtype is None else dtype
+    )
+    nullable = isinstance(target, pd.api.extensions.ExtensionDtype)
+    numpy_target = getattr(target, "numpy_dtype", target)
+    if not isinstance(numpy_target, np.dtype):
+        return target
+    if numpy_target.kind not in _NUMERIC_DOWNCAST_DTYPES:
+        return target
+
+    values = series.dropna().to_numpy(dtype=float)
+    if len(values) == 0:
+        return target
+    minimum, maximum = values.min(), values.max()
+
+    for candidate in _NUMERIC_DOWNCAST_DTYPES[numpy_target.kind]:
+        candidate = np.dtype(candidate)
+        if candidate.itemsize >= numpy_target.itemsize:
+            break
+        if candidate.kind == "f":
+            fits = np.array_equal(
+                values.astype(candidate).astype(float), values
+            )
+        else:
+            info = np.iinfo(candidate)
+            fits = info.min <= minimum and maximum <= info.max
+        if fits:
+            if nullable:
+                return pd.api.types.pandas_dtype(_nullable_name(candidate))
+            return candidate
+    return target
+
+
 @pf.register_dataframe_method
-def change_type(df, column: str, dtype):
+def change_type(
+    df,
+    column,
+    dtype=None,
+    errors: str = "raise",
+    downcast: str = None,
+    report: bool = False,
+):
     """
-    Changes the type of a column.
+    Changes the type of one or more columns.
 
     Intended to be the method-chaining alternative to::
 
@@ -1187,15 +2030,254 @@ def change_type(df, column: str, dtype):
 
         df = pd.DataFrame(...).change_type('col1', str)
 
+    Several columns can be converted at once, either by passing a list of
+    columns or glob patterns together with a single `dtype`, or by passing a
+    `{column: dtype}` mapping. All conversions are then applied in a single
+    `DataFrame.astype` call.
+
+    .. code-block:: python
+
+        df = pd.DataFrame(...).change_type(
+            {"price_*": float, "store_id": "category"}
+        )
+
+    With `downcast="smallest"`, numeric columns are converted to the
+    narrowest integer or float dtype that holds all of their values, e.g.
+    `int64` values between 0 and 200 become `uint8`. If `dtype` is not
+    given, columns are downcast within their current kind.
+
+    .. code-block:: python
+
+        df = pd.DataFrame(...).change_type("sensor_*", downcast="smallest")
+
     :param df: A pandas dataframe.
-    :param column: A column in the dataframe.
+    :param column: A column in the dataframe, a shell-style glob pattern
+        (e.g. `"price_*"`), a list of either, or a dict mapping either to
+        dtypes.
     :param dtype: The datatype to convert to. Should be one of the standard
-        Python types, or a numpy datatype.
+        Python types, or a numpy datatype. Not needed if `column` is a dict.
+    :param errors: One of "raise", "ignore" or "coerce". With "coerce",
+        values that can't be parsed as numbers become NaN when converting to
+        a numeric dtype. Integer columns that end up holding NaNs are given
+        the equivalent nullable integer dtype.
+    :param downcast: (optional) Pass "smallest" to downcast numeric columns
+        to the narrowest dtype that holds their values.
+    :param report: Whether to measure the memory used by the converted
+        columns. The report is stored as a DataFrame in the `memory_report`
+        attribute of the returned DataFrame, with one row per column.
+    :returns: A pandas DataFrame.
     """
-    df[column] = df[column].astype(dtype)
+    check("errors", errors, [str])
+    if errors not in {"raise", "ignore", "coerce"}:
+        raise ValueError("`errors` must be one of 'raise', 'ignore', 'coerce'")
+    if downcast not in {None, "smallest"}:
+        raise ValueError("`downcast` must be one of None, 'smallest'")
+
+    if isinstance(column, dict):
+        patterns = column.items()
+    else:
+        if dtype is None and downcast is None:
+            raise ValueError("`dtype` must be provided unless downcasting")
+        patterns = [(column, dtype)]
+
+    conversions = {}
+    for pattern, target in patterns:
+        for col in _expand_column_patterns(df, pattern):
+            conversions[col] = target
+
+    before = df[list(conversions)]
+
+    if errors == "coerce":
+        coerced = {
+            col: pd.to_numeric(df[col], errors="coerce")
+            for col, target in conversions.items()
+            if not pd.api.types.is_numeric_dtype(df[col])
+            and (target is None or _is_numeric_dtype(target))
+        }
+        df = _replace_columns(df, coerced)
+        for col in coerced:
+            target = conversions[col]
+            if target is not None and df[col].isnull().any():
+                conversions[col] = _nullable_dtype(target)
+
+    for col, target in conversions.items():
+        if downcast == "smallest" and pd.api.types.is_numeric_dtype(
+            df[col] if target is None else pd.api.types.pandas_dtype(target)
+        ):
+            conversions[col] = _smallest_numeric_dtype(df[col], target)
+        elif target is None:
+            conversions[col] = df[col].dtype
+
+    after = df[list(conversions)]
+    if errors == "ignore":
+        # Column by column, so that a failing column leaves the others of
+        # the same dtype converted.
+        after = after.astype(conversions, errors="ignore")
+    elif conversions:
+        # Coercion has already happened, so anything failing now should
+        # raise. All columns of a dtype are cast at once; `astype` with a
+        # dict would cast them, and rebuild the DataFrame, one by one.
+        columns_by_dtype = {}
+        for col, target in conversions.items():
+            columns_by_dtype.setdefault(target, []).append(col)
+        after = pd.concat(
+            [
+                after[cols].astype(target)
+                for target, cols in columns_by_dtype.items()
+            ],
+            axis=1,
+        )
+    df = _replace_columns(df, after)
+
+    if report:
+        memory_report = pd.DataFrame(
+            {
+                "dtype_before": before.dtypes,
+                "dtype_after": after.dtypes,
+                "bytes_before": before.memory_usage(index=False, deep=True),
+                "bytes_after": after.memory_usage(index=False, deep=True),
+            }
+        )
+        memory_report["bytes_saved"] = (
+            memory_report["bytes_before"] - memory_report["bytes_after"]
+        )
+        df.__dict__["memory_report"] = memory_report
     return df
 
 
+@pf.register_dataframe_method
+def optimize_memory(
+    df: pd.DataFrame,
+    categorical_threshold: float = 0.5,
+    sparse_threshold: float = 0.9,
+    arrow_strings: bool = True,
+) -> pd.DataFrame:
+    """
+    Convert every column to a more compact representation, where possible.
+
+    Each column is profiled once, and converted as follows:
+
+    - Integer columns holding only 0s and 1s become `bool`.
+    - Other integer and float columns are downcast to the narrowest dtype
+      that holds their values (see `change_type`).
+    - Float columns that are mostly null become sparse.
+    - String columns with few distinct values become categorical (see
+      `encode_categorical`); other string columns become Arrow-backed
+      strings, if `pyarrow` is installed.
+
+    All dtype conversions happen in a single `change_type` call.
+
+    Method chaining example:
+
+    .. code-block:: python
+
+        df = pd.read_csv(...).optimize_memory()
+        print(df.memory_report)
+
+    :param df: A pandas DataFrame.
+    :param categorical_threshold: String columns whose ratio of distinct
+        values to non-null values is at most this are made categorical.
+    :param sparse_threshold: Float columns whose fraction of null values is
+        at least this are made sparse.
+    :param arrow_strings: Whether to convert the remaining string columns to
+        the `string[pyarrow]` dtype.
+    :returns: A pandas DataFrame. A per-column report with the chosen
+        optimization and the bytes used before and after is stored as a
+        DataFrame in its `memory_report` attribute.
+    """
+    check("categorical_threshold", categorical_threshold, [float, int])
+    check("sparse_threshold", sparse_threshold, [float, int])
+    arrow_strings = arrow_strings and _has_pyarrow()
+
+    conversions = {}
+    categorical = []
+    optimizations = {}
+    for col, series in df.items():
+        dtype = series.dtype
+        if not isinstance(dtype, np.dtype):
+            continue
+
+        if dtype.kind in "iu":
+            if series.isin([0, 1]).all():
+                conversions[col], optimizations[col] = bool, "bool"
+            else:
+                conversions[col] = _smallest_numeric_dtype(series)
+                optimizations[col] = "downcast"
+        elif dtype.kind == "f":
+            smallest = _smallest_numeric_dtype(series)
+            if len(series) and series.isnull().mean() >= sparse_threshold:
+                conversions[col] = pd.SparseDtype(smallest, np.nan)
+                optimizations[col] = "sparse"
+            else:
+                conversions[col], optimizations[col] = smallest, "downcast"
+        elif dtype == object and pd.api.types.infer_dtype(series) == "string":
+            num_values = series.count()
+            if series.nunique() <= categorical_threshold * num_values:
+                categorical.append(col)
+                optimizations[col] = "categorical"
+            elif arrow_strings:
+                conversions[col] = "string[pyarrow]"
+                optimizations[col] = "arrow_string"
+
+    before = df[list(optimizations)]
+    df = df.change_type(conversions).encode_categorical(categorical)
+    after = df[list(optimizations)]
+
+    memory_report = pd.DataFrame(
+        {
+            "optimization": pd.Series(optimizations, dtype=object),
+            "dtype_before": before.dtypes,
+            "dtype_after": after.dtypes,
+            "bytes_before": before.memory_usage(index=False, deep=True),
+            "bytes_after": after.memory_usage(index=False, deep=True),
+        },
+        index=before.columns,
+    )
+    memory_report["bytes_saved"] = (
+        memory_report["bytes_before"] - memory_report["bytes_after"]
+    )
+    df.__dict__["memory_report"] = memory_report
+    return df
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _is_numeric_dtype(dtype) -> bool:
+    """
+    Whether `dtype` is an integer or float dtype, including nullable ones.
+    """
+    try:
+        dtype = pd.api.types.pandas_dtype(dtype)
+    except TypeError:
+        return False
+    return dtype.kind in "iuf"
+
+
+def _nullable_dtype(dtype):
+    """
+    The nullable extension dtype equivalent to a numpy integer dtype.
+
+    Other dtypes are returned unchanged.
+    """
+    dtype = pd.api.types.pandas_dtype(dtype)
+    if isinstance(dtype, np.dtype) and dtype.kind in "iu":
+        return pd.api.types.pandas_dtype(_nullable_name(dtype))
+    return dtype
+
+
+def _nullable_name(dtype: np.dtype) -> str:
+    # e.g. int8 -> Int8, uint16 -> UInt16, float32 -> Float32
+    if dtype.kind == "u":
+        return "U" + dtype.name[1:].capitalize()
+    return dtype.name.capitalize()
+
+
 @pf.register_dataframe_method
 def add_column(df, col_name: str, value, fill_remaining: bool = False):
     """
@@ -1224,10 +2306,14 @@ def add_column(df, col_name: str, value, fill_remaining: bool = False):
     :param col_name: Name of the new column. Should be a string, in order
         for the column name to be compatible with the Feather binary
         format (this is a useful thing to have).
-    :param value: Either a single value, or a list/tuple of values.
+    :param value: Either a single value, or a list/tuple of values. Arrays,
+        Series, and generators or other iterators are accepted as well.
     :param fill_remaining: If value is a tuple or list that is smaller than
         the number of rows in the DataFrame, repeat the list or tuple
-        (R-style) to the end of the DataFrame.
+        (R-style) to the end of the DataFrame. Values are repeated into a
+        typed array, which preserves extension dtypes such as categoricals
+        and nullable integers. Only as many values as there are rows are
+        taken from iterators.
 
     :Setup:
 
@@ -1310,6 +2396,18 @@ def add_column(df, col_name: str, value, fill_remaining: bool = False):
 
     """
 
+    df[col_name] = _column_values(df, col_name, value, fill_remaining)
+    return df
+
+
+def _column_values(df, col_name: str, value, fill_remaining: bool = False):
+    """
+    Validate the values of a new column, and repeat them if required.
+
+    Helper function for `add_column` and `add_columns`.
+
+    :returns: Either a scalar, or an iterable as long as the DataFrame.
+    """
     check("col_name", col_name, [str])
 
     if col_name in df.columns:
@@ -1319,6 +2417,15 @@ def add_column(df, col_name: str, value, fill_remaining: bool = False):
 
     nrows = df.shape[0]
 
+    if (
+        hasattr(value, "__iter__")
+        and not hasattr(value, "__len__")
+        and not isinstance(value, (str, bytes, bytearray))
+    ):
+        # if `value` is a generator or iterator, only consume as many
+        # values as needed (plus one, to detect overly long iterators).
+        value = list(islice(value, nrows if fill_remaining else nrows + 1))
+
     if hasattr(value, "__len__") and not isinstance(
         value, (str, bytes, bytearray)
     ):
@@ -1339,24 +2446,29 @@ def add_column(df, col_name: str, value, fill_remaining: bool = False):
             raise ValueError(
                 f"Values has to be an iterable of minimum length 1"
             )
-        len_value = len(value)
-    elif fill_remaining:
-        # relevant if a scalar val was passed, yet fill_remaining == True
-        len_value = 1
-        value = [value]
+        if fill_remaining:
+            return _repeat_values(value, nrows)
 
-    nrows = df.shape[0]
+    # Scalars are broadcast by pandas, whether or not `fill_remaining`.
+    return value
 
-    if fill_remaining:
-        times_to_loop = int(np.ceil(nrows / len_value))
 
-        fill_values = list(value) * times_to_loop
+def _repeat_values(value, nrows: int):
+    """
+    Repeat `value` (R-style) until it is `nrows` long.
 
-        df[col_name] = fill_values[:nrows]
-    else:
-        df[col_name] = value
+    Values are repeated into a typed array rather than a Python list.
+    Extension arrays (categoricals, nullable integers, Arrow-backed data,
+    etc.) keep their dtype.
+    """
+    if isinstance(value, (pd.Series, pd.Index)):
+        value = value.array
+    elif not isinstance(value, (np.ndarray, pd.api.extensions.ExtensionArray)):
+        value = pd.Series(value).array
 
-    return df
+    if isinstance(value.dtype, np.dtype):
+        return np.resize(np.asarray(value), nrows)
+    return value.take(np.resize(np.arange(len(value)), nrows))
 
 
 @pf.register_dataframe_method
@@ -1382,16 +2494,136 @@ def add_columns(df: pd.DataFrame, fill_remaining: bool = False, **kwargs):
     :param fill_remaining: If value is a tuple or list that is smaller than
         the number of rows in the DataFrame, repeat the list or tuple
         (R-style) to the end of the DataFrame. (Passed to `add_column`)
-    :param kwargs: column, value pairs which are looped through in
-        `add_column` calls.
+    :param kwargs: column, value pairs. Values are validated as in
+        `add_column`, and all columns are then added in a single operation.
+    """
+    new_columns = {
+        col_name: _column_values(df, col_name, values, fill_remaining)
+        for col_name, values in kwargs.items()
+    }
+    return _insert_columns(df, new_columns)
+
+
+def _insert_columns(df: pd.DataFrame, new_columns: Dict) -> pd.DataFrame:
     """
+    Append new columns to the DataFrame in a single concatenation.
+
+    Adding columns one at a time fragments the DataFrame's internal blocks,
+    which makes every subsequent insertion slower.
 
-    # Note: error checking can pretty much be handled in `add_column`
+    :param new_columns: A dict mapping column names to either scalars or
+        iterables as long as the DataFrame.
+    """
+    if not new_columns:
+        return df
+    return pd.concat([df, pd.DataFrame(new_columns, index=df.index)], axis=1)
 
-    for col_name, values in kwargs.items():
-        df = df.add_column(col_name, values, fill_remaining=fill_remaining)
 
-    return df
+class ColumnMutations:
+    """
+    Collects column additions and removals, and applies them all at once.
+
+    Calling `add_column` and `remove_columns` many times in a row fragments
+    the DataFrame's internal blocks. Within a `mutate_columns` block, the
+    same operations are only recorded; on exit, all removals are applied in
+    a single `drop` and all additions in a single concatenation.
+
+    .. code-block:: python
+
+        with df.mutate_columns() as mutations:
+            mutations.remove_columns(["tmp1", "tmp2"])
+            mutations.add_column("ratio", df["a"] / df["b"])
+            mutations.add_columns(x=1, y=np.arange(len(df)))
+        df = mutations.df
+
+    Values are validated immediately, with the same rules as `add_column`.
+    Removals are applied before additions, so a column may be removed and
+    added back under the same name.
+
+    :param df: A pandas DataFrame.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._removals = []
+        self._additions = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.apply()
+        return False
+
+    def add_column(self, col_name: str, value, fill_remaining: bool = False):
+        """
+        Record a column addition. See `add_column` for the parameters.
+        """
+        exists = col_name in self.df.columns and col_name not in self._removals
+        if exists or col_name in self._additions:
+            raise ValueError(
+                f"Attempted to add column that already exists: {col_name}."
+            )
+        # Only the row count matters here; existence was checked above.
+        self._additions[col_name] = _column_values(
+            self.df.iloc[:, :0], col_name, value, fill_remaining
+        )
+        return self
+
+    def add_columns(self, fill_remaining: bool = False, **kwargs):
+        """
+        Record several column additions. See `add_columns` for the
+        parameters.
+        """
+        for col_name, values in kwargs.items():
+            self.add_column(col_name, values, fill_remaining=fill_remaining)
+        return self
+
+    def remove_columns(self, columns: List):
+        """
+        Record column removals. See `remove_columns` for the parameters.
+        """
+        missing = [col for col in columns if col not in self.df.columns]
+        if missing:
+            raise KeyError(f"{missing} not found in axis")
+        self._removals.extend(columns)
+        return self
+
+    def apply(self) -> pd.DataFrame:
+        """
+        Apply the recorded mutations, and reset the recorded state.
+
+        Called automatically when leaving the `with` block.
+
+        :returns: The mutated DataFrame, which is also stored as `df`.
+        """
+        df = self.df
+        if self._removals:
+            df = df.drop(columns=self._removals)
+        self.df = _insert_columns(df, self._additions)
+        self._removals, self._additions = [], {}
+        return self.df
+
+
+@pf.register_dataframe_method
+def mutate_columns(df: pd.DataFrame) -> ColumnMutations:
+    """
+    Batch several column additions and removals into a single operation.
+
+    Returns a context manager; see `ColumnMutations` for details.
+
+    .. code-block:: python
+
+        with df.mutate_columns() as mutations:
+            mutations.remove_columns(["tmp"])
+            mutations.add_columns(x=1, y=np.arange(len(df)))
+        df = mutations.df
+
+    :param df: A pandas DataFrame.
+    :returns: A `ColumnMutations` context manager.
+    """
+    return ColumnMutations(df)
 
 
 @pf.register_dataframe_method
@@ -1481,30 +2713,20 @@ def limit_column_characters(df, column_length: int, col_separator: str = "_"):
     col_names = df.columns
     col_names = [col_name[:column_length] for col_name in col_names]
 
-    col_name_set = set(col_names)
-    col_name_count = dict()
-
-    # If no columns are duplicates, we can skip the loops below.
-    if len(col_name_set) == len(col_names):
+    # If no columns are duplicates, we can skip the counting below.
+    if len(set(col_names)) == len(col_names):
         df.columns = col_names
         return df
 
-    for col_name_to_check in col_name_set:
-        count = 0
-        for idx, col_name in enumerate(col_names):
-            if col_name_to_check == col_name:
-                col_name_count[idx] = count
-                count += 1
-
+    # Number each occurrence of a truncated name in a single pass.
+    col_name_count = dict()
     final_col_names = []
-    for idx, col_name in enumerate(col_names):
-        if col_name_count[idx] > 0:
-            col_name_to_append = (
-                col_name + col_separator + str(col_name_count[idx])
-            )
-            final_col_names.append(col_name_to_append)
-        else:
-            final_col_names.append(col_name)
+    for col_name in col_names:
+        count = col_name_count.get(col_name, 0)
+        col_name_count[col_name] = count + 1
+        if count > 0:
+            col_name = col_name + col_separator + str(count)
+        final_col_names.append(col_name)
 
     df.columns = final_col_names
     return df
@@ -1625,18 +2847,34 @@ def row_to_names(
 
 @pf.register_dataframe_method
 def round_to_fraction(
-    df, col_name: str = None, denominator: float = None, digits: float = np.inf
+    df,
+    col_name: Union[str, Iterable[str]] = None,
+    denominator: float = None,
+    digits: float = np.inf,
+    inplace: bool = False,
 ):
     """
     Round all values in a column to a fraction.
 
     Also, optionally round to a specified number of digits.
 
-    :param number: The number to round
+    Values are rounded with NumPy over whole columns. Ties are rounded to the
+    nearest even value ("banker's rounding"), as Python's `round` does, so
+    rounding 2.5 to a whole number gives 2.0 and rounding 3.5 gives 4.0.
+    When rounding to `digits`, NumPy scales each value by a power of ten
+    before rounding, while Python's `round` rounds the exact decimal value
+    of the float. The two can disagree on values whose last digit is a 5
+    and which are not exactly representable, e.g. `round(2.675, 2)` gives
+    2.67. NaN and infinite values are left as they are.
+
+    :param col_name: Name of the column to round, a list of column names, or
+        None to round every numeric column.
     :param denominator: The denominator of the fraction for rounding
     :param digits: The number of digits for rounding after rounding to the
         fraction. Default is np.inf (i.e. no subsequent rounding)
-
+    :param inplace: Whether to round float columns within their existing
+        memory instead of a copy. This saves memory on very large frames,
+        but also changes any other DataFrame sharing that memory.
     Taken from https://github.com/sfirke/janitor/issues/235
 
     :Example Setup:
@@ -1680,7 +2918,7 @@ def round_to_fraction(
     .. code-block:: python
 
         example_dataframe2 = pd.DataFrame(data_dict)
-        example_dataframe2.limit_column_characters('a', 3)
+        example_dataframe2.round_to_fraction('a', 3)
 
     :Output:
 
@@ -1703,7 +2941,7 @@ def round_to_fraction(
     .. code-block:: python
 
         example_dataframe2 = pd.DataFrame(data_dict)
-        example_dataframe2.limit_column_characters('a', 3, 4)
+        example_dataframe2.round_to_fraction('a', 3, 4)
 
     :Output:
 
@@ -1722,7 +2960,11 @@ def round_to_fraction(
 
     """
 
-    check("col_name", col_name, [str])
+    if col_name is None:
+        col_name = df.select_dtypes(include=np.number).columns.tolist()
+    check("col_name", col_name, [str, list, tuple])
+    if isinstance(col_name, str):
+        col_name = [col_name]
 
     if denominator:
         check("denominator", denominator, [float, int])
@@ -1730,23 +2972,30 @@ def round_to_fraction(
     if digits:
         check("digits", digits, [float, int])
 
-    def _round_to_fraction(number, denominator, digits=np.inf):
-        num = round(number * denominator, 0) / denominator
+    for col in col_name:
+        values = df[col].to_numpy(dtype=float, copy=not inplace)
+        if not values.flags.writeable:
+            values = values.copy()
+        np.multiply(values, denominator, out=values)
+        np.round(values, out=values)
+        np.divide(values, denominator, out=values)
         if not np.isinf(digits):
-            num = round(num, digits)
-        return num
-
-    _round_to_fraction_partial = partial(
-        _round_to_fraction, denominator=denominator, digits=digits
-    )
-
-    df[col_name] = df[col_name].apply(_round_to_fraction_partial)
+            np.round(values, int(digits), out=values)
+        df[col] = values
 
     return df
 
 
 @pf.register_dataframe_method
-def transform_column(df, col_name: str, function, dest_col_name: str = None):
+def transform_column(
+    df,
+    col_name: str,
+    function,
+    dest_col_name: str = None,
+    elementwise: bool = True,
+    engine: str = "python",
+    n_jobs: int = 1,
+):
     """
     Transforms the given column in-place using the provided function.
 
@@ -1775,23 +3024,273 @@ def transform_column(df, col_name: str, function, dest_col_name: str = None):
         df = pd.DataFrame(...)
         df = transform_column(df, col_name, function)
 
+    Functions that work on a whole column at once, such as most NumPy
+    functions, are much faster with `elementwise=False`:
+
+    .. code-block:: python
+
+        df = df.transform_column(col_name, np.log10, elementwise=False)
+
+    The `engine` decides how the function is run:
+
+    - `"python"` calls the function directly.
+    - `"numba"` compiles the function with Numba before calling it on the
+      column's NumPy array. This suits numeric functions written with plain
+      Python loops or arithmetic. Numba must be installed.
+    - `"multiprocessing"` splits the column into chunks and transforms them
+      in `n_jobs` processes. This suits slow, pure-Python functions. The
+      function must be picklable, e.g. defined at the top level of a module.
+
     :param df: A pandas DataFrame.
     :param col_name: The column to transform.
     :param function: A function to apply on the column.
     :param dest_col_name: The column name to store the transformation result
         in. By default, replaces contents of original column.
+    :param elementwise: Whether to call the function on each value of the
+        column. If False, the function is called on the whole column (on a
+        chunk of it with `engine="multiprocessing"`) and must return
+        something of the same length.
+    :param engine: One of "python", "numba" or "multiprocessing".
+    :param n_jobs: The number of processes used by the multiprocessing
+        engine. -1 uses all CPUs.
+    :returns: A pandas DataFrame with a transformed column.
     """
+    check("elementwise", elementwise, [bool])
+    check("engine", engine, [str])
 
     if dest_col_name is None:
         dest_col_name = col_name
 
-    df[dest_col_name] = df[col_name].apply(function)
+    if engine == "python":
+        if elementwise:
+            result = df[col_name].apply(function)
+        else:
+            result = function(df[col_name])
+    elif engine == "numba":
+        compiled = _numba_compile(function, elementwise)
+        result = compiled(df[col_name].to_numpy())
+    elif engine == "multiprocessing":
+        result = _transform_in_processes(
+            df[col_name], function, elementwise, n_jobs
+        )
+    else:
+        raise JanitorError(
+            "engine must be one of 'python', 'numba' or 'multiprocessing'."
+        )
+
+    df[dest_col_name] = result
     return df
 
 
+@lru_cache(maxsize=32)
+def _numba_compile(function, elementwise: bool):
+    """
+    Compile `function` with Numba, as a ufunc if it works on scalars.
+
+    Compiled functions are cached, so repeated calls with the same function
+    are only compiled once.
+    """
+    try:
+        import numba
+    except ImportError:
+        import_message("functions", "numba", "conda install -c numba numba")
+        raise
+    if elementwise:
+        return numba.vectorize(function)
+    return numba.njit(function)
+
+
+def _transform_chunk(function, elementwise: bool, chunk: pd.Series):
+    if elementwise:
+        return chunk.apply(function)
+    return pd.Series(function(chunk), index=chunk.index)
+
+
+def _transform_in_processes(
+    series: pd.Series, function, elementwise: bool, n_jobs: int
+) -> pd.Series:
+    """
+    Transform `series` in chunks, spread over `n_jobs` processes.
+    """
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+    chunksize = max(1, int(np.ceil(len(series) / (n_jobs * 4))))
+    bounds = range(0, len(series) + chunksize, chunksize)
+    chunks = [
+        series.iloc[start:stop] for start, stop in zip(bounds, bounds[1:])
+    ]
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        results = executor.map(
+            partial(_transform_chunk, function, elementwise), chunks
+        )
+        results = list(results)
+    if not results:
+        return series.copy()
+    return pd.concat(results)
+
+
+def _min_max_transform(
+    df: pd.DataFrame, columns, old_min, old_max, new_min, new_max, dtype
+) -> pd.DataFrame:
+    """
+    Scale `columns` of `df` from `[old_min, old_max]` to `[new_min, new_max]`.
+
+    `old_min` and `old_max` are scalars, or arrays with one value per column.
+    The scaled values are computed within a single array of `dtype`. Columns
+    whose old range is zero are mapped to `new_min`.
+    """
+    subset = df[columns]
+    values = subset.to_numpy(dtype=dtype, copy=True)
+    old_min = np.asarray(old_min, dtype=dtype)
+    old_range = np.asarray(old_max, dtype=dtype) - old_min
+    old_range = np.where(old_range == 0, 1, old_range)
+    np.subtract(values, old_min, out=values)
+    np.multiply(values, (new_max - new_min) / old_range, out=values)
+    np.add(values, new_min, out=values)
+    scaled = pd.DataFrame(values, index=df.index, columns=subset.columns)
+    return _replace_columns(df, scaled)
+
+
+class MinMaxScaler:
+    """
+    Scale columns to between a minimum and maximum value, using bounds
+    learned from data.
+
+    The per-column minimum and maximum can be learned from a whole
+    DataFrame with `fit`, or incrementally from a stream of chunks that do
+    not fit into memory together with `partial_fit`. The fitted scaler can
+    then be saved, and reused to transform new data on the same scale:
+
+    .. code-block:: python
+
+        scaler = MinMaxScaler()
+        for chunk in pd.read_csv("train.csv", chunksize=100_000):
+            scaler.partial_fit(chunk[["a", "b"]])
+        scaler.save("scaler.json")
+
+        # Later on, possibly in a different process:
+        scaler = MinMaxScaler.load("scaler.json")
+        df = pd.read_csv("test.csv").min_max_scale(scaler=scaler)
+
+    Missing values are ignored when learning the bounds, and stay missing.
+
+    :param new_min: The minimum value of the data after it has been scaled.
+    :param new_max: The maximum value of the data after it has been scaled.
+    """
+
+    def __init__(self, new_min: float = 0, new_max: float = 1):
+        check("new_min", new_min, [float, int])
+        check("new_max", new_max, [float, int])
+        if new_max <= new_min:
+            raise ValueError("`new_max` should be greater than `new_min`")
+        self.new_min = new_min
+        self.new_max = new_max
+        self.data_min = None
+        self.data_max = None
+
+    def partial_fit(self, df: pd.DataFrame):
+        """
+        Update the per-column minimum and maximum with another chunk of data.
+
+        :param df: A pandas DataFrame. Later chunks must have the same columns
+            as the first one.
+        :returns: The scaler itself.
+        """
+        data_min = df.min()
+        data_max = df.max()
+        if self.data_min is not None:
+            if not data_min.index.equals(self.data_min.index):
+                raise ValueError(
+                    "The columns of each chunk must match those already fit."
+                )
+            data_min = np.fmin(self.data_min, data_min)
+            data_max = np.fmax(self.data_max, data_max)
+        self.data_min = data_min.astype(float)
+        self.data_max = data_max.astype(float)
+        return self
+
+    def fit(self, df: pd.DataFrame):
+        """
+        Learn the per-column minimum and maximum of a DataFrame.
+
+        :param df: A pandas DataFrame.
+        :returns: The scaler itself.
+        """
+        self.data_min = None
+        self.data_max = None
+        return self.partial_fit(df)
+
+    def transform(self, df: pd.DataFrame, dtype=np.float64) -> pd.DataFrame:
+        """
+        Scale the fitted columns of a DataFrame.
+
+        Other columns are left untouched.
+
+        :param df: A pandas DataFrame containing the fitted columns.
+        :param dtype: The float dtype to compute and return the scaled
+            columns in. `np.float32` halves the memory used.
+        :returns: A pandas DataFrame.
+        """
+        if self.data_min is None:
+            raise JanitorError("The scaler must be fit before transforming.")
+        columns = self.data_min.index.tolist()
+        return _min_max_transform(
+            df,
+            columns,
+            self.data_min.to_numpy(),
+            self.data_max.to_numpy(),
+            self.new_min,
+            self.new_max,
+            dtype,
+        )
+
+    def save(self, filename: str):
+        """
+        Save the scaler to disk, as JSON.
+
+        :param filename: The path to save to.
+        """
+        if self.data_min is None:
+            raise JanitorError("The scaler must be fit before saving.")
+        with open(filename, "w") as f:
+            json.dump(
+                {
+                    "new_min": self.new_min,
+                    "new_max": self.new_max,
+                    "columns": self.data_min.index.tolist(),
+                    "data_min": self.data_min.tolist(),
+                    "data_max": self.data_max.tolist(),
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, filename: str):
+        """
+        Load a scaler previously written with `MinMaxScaler.save`.
+
+        :param filename: The path to load from.
+        :returns: A MinMaxScaler.
+        """
+        with open(filename) as f:
+            data = json.load(f)
+        scaler = cls(data["new_min"], data["new_max"])
+        scaler.data_min = pd.Series(data["data_min"], index=data["columns"])
+        scaler.data_max = pd.Series(data["data_max"], index=data["columns"])
+        return scaler
+
+
 @pf.register_dataframe_method
 def min_max_scale(
-    df, old_min=None, old_max=None, col_name=None, new_min=0, new_max=1
+    df,
+    old_min=None,
+    old_max=None,
+    col_name=None,
+    new_min=0,
+    new_max=1,
+    per_column: bool = False,
+    scaler: MinMaxScaler = None,
+    dtype=np.float64,
 ):
     """
     Scales data to between a minimum and maximum value.
@@ -1805,7 +3304,12 @@ def min_max_scale(
     transformed data being bounded between `new_min` and `new_max`.
 
     If a particular column name is specified, then only that column of data
-    are scaled. Otherwise, the entire dataframe is scaled.
+    are scaled. Otherwise, the entire dataframe is scaled. By default, all
+    scaled columns share one minimum and maximum; with `per_column=True`,
+    each column is scaled by its own minimum and maximum instead.
+
+    To scale new data by bounds learned earlier, pass a fitted
+    `MinMaxScaler` as `scaler`.
 
     Method chaining example:
 
@@ -1852,9 +3356,20 @@ def min_max_scale(
         maximum values of the data to be transformed.
     :param new_min, new_max (optional): The minimum and maximum values of the
         data after it has been scaled.
-    :param col_name (optional): The column on which to perform scaling.
+    :param col_name (optional): The column, or list of columns, on which to
+        perform scaling.
+    :param per_column: Whether to scale each column by its own minimum and
+        maximum.
+    :param scaler: A fitted MinMaxScaler. If given, it is used to scale the
+        columns it was fit on, and all other scaling arguments are ignored.
+    :param dtype: The float dtype to compute and return the scaled columns
+        in. `np.float32` halves the memory used. The scaled values are
+        computed within a single array, without full-size temporaries.
     :returns: df
     """
+    if scaler is not None:
+        return scaler.transform(df, dtype=dtype)
+
     if (
         (old_min is not None)
         and (old_max is not None)
@@ -1865,25 +3380,27 @@ def min_max_scale(
     if new_max <= new_min:
         raise ValueError("`new_max` should be greater than `new_min`")
 
-    new_range = new_max - new_min
+    if col_name is None:
+        columns = df.columns.tolist()
+    elif isinstance(col_name, list):
+        columns = col_name
+    else:
+        columns = [col_name]
 
-    if col_name:
+    if per_column:
         if old_min is None:
-            old_min = df[col_name].min()
+            old_min = df[columns].min().to_numpy()
         if old_max is None:
-            old_max = df[col_name].max()
-        old_range = old_max - old_min
-        df[col_name] = (
-            df[col_name] - old_min
-        ) * new_range / old_range + new_min
+            old_max = df[columns].max().to_numpy()
     else:
         if old_min is None:
-            old_min = df.min().min()
+            old_min = df[columns].min().min()
         if old_max is None:
-            old_max = df.max().max()
-        old_range = old_max - old_min
-        df = (df - old_min) * new_range / old_range + new_min
-    return df
+            old_max = df[columns].max().max()
+
+    return _min_max_transform(
+        df, columns, old_min, old_max, new_min, new_max, dtype
+    )
 
 
 @pf.register_dataframe_method
@@ -1927,17 +3444,44 @@ def collapse_levels(df: pd.DataFrame, sep: str = "_"):
     check("sep", sep, [str])
 
     # if already single-level, just return the DataFrame
-    if not isinstance(df.columns.values[0], tuple):
+    if not isinstance(df.columns, pd.MultiIndex):
         return df
 
-    df.columns = [
-        sep.join([str(el) for el in tup if str(el) != ""])
-        for tup in df.columns.values
-    ]
+    df.columns = _join_levels(df.columns, sep)
 
     return df
 
 
+def _join_levels(index: pd.MultiIndex, sep: str) -> np.ndarray:
+    """
+    Join the labels of each entry of a MultiIndex into a single string.
+
+    Empty labels are skipped. Each level's distinct labels are converted to
+    strings, and prefixed with `sep`, only once; the joining is then done
+    level by level over whole arrays.
+    """
+    joined = None
+    n_sep = len(sep)
+    for level, codes in zip(index.levels, index.codes):
+        # Missing labels have code -1, which picks the trailing "nan".
+        labels = np.append(level.map(str).to_numpy(dtype=object), "nan")
+        if joined is None:
+            joined = labels[codes]
+            leading_empty = joined == ""
+            continue
+        pieces = np.array(
+            [sep + label if label != "" else "" for label in labels],
+            dtype=object,
+        )
+        joined = joined + pieces[codes]
+        # Entries whose labels so far were all empty got a leading `sep`.
+        is_empty = (labels == "")[codes]
+        strip = leading_empty & ~is_empty
+        joined[strip] = [label[n_sep:] for label in joined[strip]]
+        leading_empty &= is_empty
+    return joined
+
+
 @pf.register_dataframe_method
 def reset_index_inplace(df: pd.DataFrame, *args, **kwargs):
     """
@@ -2015,76 +3559,21 @@ def check(varname: str, value, expected_types: list):
         )
 
 
-def _clean_accounting_column(x):
+def _clean_accounting_column(column: pd.Series) -> pd.Series:
     """
     This function performs the logic for the `type == "accounting"`
     attribute in currency_column_to_numeric.
 
-    It is intended to be used in a pandas `apply` method.
-    """
-
-    y = x.strip()
-    y = y.replace(",", "")
-    y = y.replace(")", "")
-    y = y.replace("(", "-")
-    if y == "-":
-        return 0.00
-    return float(y)
-
-
-def _currency_column_to_numeric(x, cast_non_numeric=None):
-    """
-    This function performs the logic for the changing cell values in
-    the currency_column_to_numeric function.
-
-    It is intended to be used in a pandas `apply` method, after being passed
-    through `partial`.
+    Thousands separators are dropped, values in parentheses are made
+    negative, and a lone "-" is read as zero.
     """
-    acceptable_currency_characters = {
-        "-",
-        ".",
-        "1",
-        "2",
-        "3",
-        "4",
-        "5",
-        "6",
-        "7",
-        "8",
-        "9",
-        "0",
-    }
-    if len(x) == 0:
-        return "ORIGINAL_NA"
-
-    if cast_non_numeric:
-        if x in cast_non_numeric.keys():
-            check(
-                "{%r: %r}" % (x, str(cast_non_numeric[x])),
-                cast_non_numeric[x],
-                [int, float],
-            )
-            return cast_non_numeric[x]
-        else:
-            return "".join(i for i in x if i in acceptable_currency_characters)
-    else:
-        return "".join(i for i in x if i in acceptable_currency_characters)
-
-
-def _replace_empty_string_with_none(x):
-    if isinstance(x, int):
-        return x
-
-    elif isinstance(x, float):
-        return x
-
-    elif len(x):
-        return x
-
-
-def _replace_original_empty_string_with_none(x):
-    if x != "ORIGINAL_NA":
-        return x
+    cleaned = (
+        column.str.strip()
+        .str.replace(",", "", regex=False)
+        .str.replace(")", "", regex=False)
+        .str.replace("(", "-", regex=False)
+    )
+    return pd.to_numeric(cleaned.mask(cleaned == "-", "0")).astype(float)
 
 
 @pf.register_dataframe_method
@@ -2095,6 +3584,7 @@ def currency_column_to_numeric(
     cast_non_numeric: dict = None,
     fill_all_non_numeric: float = None,
     remove_non_numeric: bool = False,
+    number_format: str = None,
 ):
     """
     This method allows one to take a column containing currency values,\
@@ -2102,6 +3592,13 @@ def currency_column_to_numeric(
     usually the case when reading CSV files that were modified in Excel.\
     Empty strings (i.e. `''`) are retained as `NaN` values.
 
+    By default, only the characters `-.0-9` of each value are kept. To parse
+    numbers written in other formats, such as `"1.234,56 €"` or
+    `"1 234,56-"`, pass their `number_format`. In that mode, currency
+    symbols, codes and thousands separators are dropped, the format's decimal
+    separator is used, and values with a minus sign (`-` or `−`, in front or
+    at the end) or in parentheses are negative.
+
     :param df: The DataFrame
     :param col_name: The column to modify
     :param type: What type of cleaning to perform. If None, standard cleaning
@@ -2114,6 +3611,10 @@ def currency_column_to_numeric(
         make everything that doesn't coerce to a currency 1.
     :param remove_non_numeric: Will remove rows of a DataFrame that contain
         non-numeric values in the `col_name` column. Defaults to `False`.
+    :param number_format: (optional) How the numbers are written. Either the
+        decimal separator, "." or ",", a locale with that separator, e.g.
+        "en", "ja" or "ch" for "." and "de", "fr" or "es" for ",", or "auto"
+        to infer it from (at most) 1000 distinct values of the column.
     :return: A mutated DataFrame
 
     :Example Setup:
@@ -2271,37 +3772,203 @@ def currency_column_to_numeric(
 
     column_series = df[col_name]
     if type == "accounting":
-        df.loc[:, col_name] = df[col_name].apply(_clean_accounting_column)
+        df[col_name] = _clean_accounting_column(column_series)
         return df
 
     if cast_non_numeric:
         check("cast_non_numeric", cast_non_numeric, [dict])
+    if fill_all_non_numeric is not None:
+        check("fill_all_non_numeric", fill_all_non_numeric, [int, float])
 
-    _make_cc_patrial = partial(
-        _currency_column_to_numeric, cast_non_numeric=cast_non_numeric
-    )
+    # Currency columns repeat the same strings a lot, so each distinct
+    # string is only parsed once.
+    codes, uniques = pd.factorize(column_series)
+    uniques = pd.Series(uniques, dtype=object)
 
-    column_series = column_series.apply(_make_cc_patrial)
+    decimal = None
+    if number_format == "auto":
+        decimal = _infer_decimal_separator(uniques)
+    elif number_format is not None:
+        if number_format not in _DECIMAL_SEPARATORS:
+            raise ValueError(
+                "`number_format` must be 'auto' or one of "
+                f"{sorted(_DECIMAL_SEPARATORS)}"
+            )
+        decimal = _DECIMAL_SEPARATORS[number_format]
+
+    values, is_non_numeric = _parse_currency_strings(
+        uniques, cast_non_numeric, fill_all_non_numeric, decimal
+    )
+    if (codes == -1).any():
+        values = np.append(values.astype(float), np.nan)
+        is_non_numeric = np.append(is_non_numeric, False)
+    column_series = pd.Series(
+        values[codes], index=column_series.index, name=col_name
+    )
+    is_non_numeric = is_non_numeric[codes]
 
     if remove_non_numeric:
-        df = df.loc[column_series != "", :]
+        df = df.loc[~is_non_numeric, :]
+        column_series = column_series[~is_non_numeric]
 
-    # _replace_empty_string_with_none is applied here after the check on
-    # remove_non_numeric since "" is our indicator that a string was coerced
-    # in the original column
-    column_series = column_series.apply(_replace_empty_string_with_none)
+    df = df.assign(**{col_name: column_series})
 
-    if fill_all_non_numeric is not None:
-        check("fill_all_non_numeric", fill_all_non_numeric, [int, float])
-        column_series = column_series.fillna(fill_all_non_numeric)
+    return df
 
-    column_series = column_series.apply(
-        _replace_original_empty_string_with_none
+
+def _replace_regex(strings: pd.Series, pattern: str, repl: str) -> np.ndarray:
+    """
+    `strings.str.replace(pattern, repl)` as an object array.
+
+    Uses Arrow's compute kernels when pyarrow is installed, which are much
+    faster than the per-string replacement pandas does on object columns.
+    The pattern must be supported by both Python's `re` and RE2.
+    """
+    if _has_pyarrow() and pd.api.types.infer_dtype(strings) == "string":
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        replaced = pc.replace_substring_regex(
+            pa.array(strings.to_numpy(), type=pa.string()), pattern, repl
+        )
+        return replaced.to_numpy(zero_copy_only=False).astype(object)
+    replaced = strings.str.replace(pattern, repl, regex=True)
+    return replaced.to_numpy(dtype=object)
+
+
+_DECIMAL_SEPARATORS = {
+    ".": ".",
+    ",": ",",
+    # Locales writing numbers like 1,234.56 (or 1'234.56 and 1 234.56).
+    "en": ".",
+    "us": ".",
+    "uk": ".",
+    "ch": ".",
+    "in": ".",
+    "ja": ".",
+    "zh": ".",
+    "ko": ".",
+    # Locales writing numbers like 1.234,56 (or 1 234,56).
+    "de": ",",
+    "eu": ",",
+    "fr": ",",
+    "es": ",",
+    "it": ",",
+    "nl": ",",
+    "pt": ",",
+    "ru": ",",
+    "pl": ",",
+    "se": ",",
+}
+
+
+def _clean_formatted_numbers(strings: pd.Series, decimal: str) -> np.ndarray:
+    """
+    Turn formatted numbers into strings `pd.to_numeric` can parse.
+
+    All characters except digits and the decimal separator are dropped.
+    Strings with a minus sign or parentheses become negative, and strings
+    without any digits become empty.
+    """
+    numbers = pd.Series(
+        _replace_regex(strings, f"[^0-9{re.escape(decimal)}]", ""),
+        index=strings.index,
     )
+    if decimal != ".":
+        numbers = numbers.str.replace(decimal, ".", regex=False)
+    is_negative = strings.str.contains(r"[-\u2212]|\(.*\)", regex=True)
+    has_digits = numbers.str.contains(r"[0-9]", regex=True)
 
-    df = df.assign(**{col_name: pd.to_numeric(column_series)})
+    numbers = numbers.to_numpy(dtype=object)
+    is_negative = is_negative.to_numpy(dtype=bool)
+    numbers[is_negative] = "-" + numbers[is_negative]
+    numbers[~has_digits.to_numpy(dtype=bool)] = ""
+    return numbers
 
-    return df
+
+def _infer_decimal_separator(strings: pd.Series, sample_size=1000) -> str:
+    """
+    Infer whether numbers are written with a "." or "," decimal separator.
+
+    Each of (at most) `sample_size` non-empty strings votes for a separator,
+    if it can tell:
+
+    - If both "." and "," appear, the last one is the decimal separator.
+    - If only one of them appears, but more than once, it separates
+      thousands, so the other is the decimal separator.
+    - If only one of them appears, once, and is not followed by exactly
+      three digits, it is the decimal separator.
+
+    Defaults to "." if no string can tell.
+    """
+    votes = {".": 0, ",": 0}
+    other = {".": ",", ",": "."}
+    sample = strings[strings.str.len() > 0].head(sample_size)
+    for string in sample:
+        separators = re.findall(r"[.,]", string)
+        if not separators:
+            continue
+        last = separators[-1]
+        if other[last] in separators:
+            votes[last] += 1
+        elif len(separators) > 1:
+            votes[other[last]] += 1
+        elif not re.search(r"[.,][0-9]{3}(?![0-9])", string):
+            votes[last] += 1
+    return "," if votes[","] > votes["."] else "."
+
+
+def _parse_currency_strings(
+    strings: pd.Series,
+    cast_non_numeric: dict,
+    fill_all_non_numeric,
+    decimal: str = None,
+):
+    """
+    This function performs the logic for changing the values in
+    currency_column_to_numeric, on all strings at once.
+
+    If `decimal` is given, numbers are parsed with that decimal separator by
+    `_clean_formatted_numbers`.
+
+    :returns: The parsed numbers as an array, and a boolean array of which
+        strings were non-numeric.
+    """
+    # Empty strings in the original column are kept as NaN, and are
+    # neither removed nor filled.
+    is_original_na = (strings == "").to_numpy()
+
+    is_cast = np.zeros(len(strings), dtype=bool)
+    if cast_non_numeric:
+        is_cast = strings.isin(cast_non_numeric.keys()).to_numpy()
+        for key in strings[is_cast]:
+            check(
+                "{%r: %r}" % (key, str(cast_non_numeric[key])),
+                cast_non_numeric[key],
+                [int, float],
+            )
+
+    if decimal is None:
+        # Keep only the characters that can be part of a number.
+        values = _replace_regex(strings, r"[^-.0-9]", "")
+    else:
+        values = _clean_formatted_numbers(strings, decimal)
+    values[is_cast] = [cast_non_numeric[key] for key in strings[is_cast]]
+
+    # Strings with no numeric characters at all are non-numeric values.
+    is_non_numeric = (values == "") & ~is_original_na & ~is_cast
+    is_missing = is_non_numeric | is_original_na
+    values[is_missing] = None
+
+    if fill_all_non_numeric is not None:
+        values[pd.isnull(values) & ~is_original_na] = fill_all_non_numeric
+
+    values = pd.to_numeric(pd.Series(values, dtype=object)).to_numpy()
+    # Like a column of numbers with missing values, cast values mixed with
+    # missing values are float, even when the missing values were filled.
+    if is_missing.any() and is_cast.any() and is_cast[~is_missing].all():
+        values = values.astype(float)
+    return values, is_non_numeric
 
 
 @pf.register_dataframe_method
@@ -2317,31 +3984,143 @@ def select_columns(df: pd.DataFrame, search_cols: List, invert: bool = False):
 
         df = pd.DataFrame(...).select_columns(['a', 'b', 'col_*'], invert=True)
 
+    Selecting columns by regular expression, dtype or a predicate:
+
+    .. code-block:: python
+
+        df = pd.DataFrame(...).select_columns(
+            [re.compile(r"price_\\d+"), np.number, lambda s: s.isnull().any()]
+        )
+
+    Columns are returned in the order of the search terms that select them,
+    and in their original order for each term. A column selected by several
+    terms is only returned once, at the position of the first such term.
+
+    All string search terms are combined into a single regular expression,
+    which is cached, so selecting from very wide DataFrames only takes one
+    pass over the column names.
+
     :param df: A pandas DataFrame.
     :param search_cols: A list of column names or search strings to be used\
         to select. Valid inputs include:
         1) an exact column name to look for
         2) a shell-style glob string (e.g., `*_thing_*`)
+        3) a compiled regular expression, matched against the start of each
+        column name
+        4) a dtype, or a NumPy type such as `np.number` or `np.datetime64`,
+        selecting the columns of that (sub)type
+        5) a callable, which is passed each column as a Series and returns
+        whether to select it
     :param invert: Whether or not to invert the selection.
         This will result in selection of the complement of the columns\
         provided.
     :returns: A pandas DataFrame with the columns selected.
     """
+    num_terms = len(search_cols)
+    # The index of the first search term selecting each column.
+    first_term = np.full(len(df.columns), num_terms)
+
+    def select(term_idx, mask):
+        np.minimum(
+            first_term, np.where(mask, term_idx, num_terms), out=first_term
+        )
+
+    glob_terms = []
+    for term_idx, term in enumerate(search_cols):
+        if isinstance(term, str):
+            glob_terms.append((term_idx, term))
+        elif isinstance(term, _PATTERN_TYPE):
+            select(term_idx, _match_column_names(df.columns, term))
+        elif isinstance(
+            term, (type, np.dtype, pd.api.extensions.ExtensionDtype)
+        ):
+            select(term_idx, _match_column_dtypes(df.dtypes, term))
+        elif callable(term):
+            select(term_idx, [bool(term(series)) for _, series in df.items()])
+        else:
+            mask = np.zeros(len(df.columns), dtype=bool)
+            positions = df.columns.get_indexer_for([term])
+            mask[positions[positions >= 0]] = True
+            select(term_idx, mask)
+
+    if glob_terms:
+        regex = _compile_column_globs(tuple(glob_terms))
+        prefix = len("term")
+        for position, col in enumerate(df.columns):
+            match = regex.match(col) if isinstance(col, str) else None
+            if match is not None:
+                term_idx = int(match.lastgroup[prefix:])
+                first_term[position] = min(first_term[position], term_idx)
+
+    if invert:
+        positions = np.flatnonzero(first_term == num_terms)
+    else:
+        positions = np.flatnonzero(first_term < num_terms)
+        positions = positions[np.argsort(first_term[positions], kind="stable")]
+    return df.iloc[:, positions]
+
+
+# re.Pattern only exists from Python 3.7.
+_PATTERN_TYPE = type(re.compile(""))
+
 
-    full_column_list = []
+@lru_cache(maxsize=128)
+def _compile_column_globs(glob_terms: tuple):
+    """
+    Compile glob search terms into a single regular expression.
 
-    for col in search_cols:
-        search_string = translate(col)
-        columns = [col for col in df if re.match(search_string, col)]
-        full_column_list.extend(columns)
+    Each term becomes a named group, `term<i>` for the term at index `i` of
+    the search terms, which also matches the term as an exact name. When
+    several terms match, the earliest one is reported.
 
-    return (
-        df.drop(columns=full_column_list) if invert else df[full_column_list]
+    :param glob_terms: A tuple of `(index, glob)` pairs.
+    """
+    return re.compile(
+        "|".join(
+            "(?P<term{}>{}\\Z|{})".format(
+                idx, re.escape(term), translate(term)
+            )
+            for idx, term in glob_terms
+        )
     )
 
 
+def _match_column_names(columns: pd.Index, pattern) -> np.ndarray:
+    """
+    Which string column names match the start of a compiled regex.
+    """
+    return np.array(
+        [isinstance(col, str) and bool(pattern.match(col)) for col in columns],
+        dtype=bool,
+    )
+
+
+def _match_column_dtypes(dtypes: pd.Series, dtype) -> np.ndarray:
+    """
+    Which columns have the given dtype, or a subtype of it.
+    """
+
+    def matches(col_dtype):
+        if col_dtype == dtype:
+            return True
+        try:
+            return np.issubdtype(col_dtype, dtype)
+        except TypeError:
+            return False
+
+    # Check every distinct dtype only once.
+    is_match = {col_dtype: matches(col_dtype) for col_dtype in set(dtypes)}
+    return dtypes.map(is_match).to_numpy(dtype=bool)
+
+
 @pf.register_dataframe_method
-def impute(df, column: str, value=None, statistic=None):
+def impute(
+    df,
+    column: Union[str, List[str]],
+    value=None,
+    statistic=None,
+    by: Union[str, List[str]] = None,
+):
     """
     Method-chainable imputation of values in a column.
 
@@ -2358,6 +4137,8 @@ def impute(df, column: str, value=None, statistic=None):
             .impute(column='sales', value=0.0)
             # Impute null values with median
             .impute(column='score', statistic='median')
+            # Impute null values with the median of each store
+            .impute(column=['price', 'cost'], statistic='median', by='store')
         )
 
     Either one of ``value`` or ``statistic`` should be provided.
@@ -2366,7 +4147,9 @@ def impute(df, column: str, value=None, statistic=None):
         take on the value provided.
 
     If ``statistic`` is provided, then all null values in the selected column
-    will take on the summary statistic value of other non-null values.
+    will take on the summary statistic value of other non-null values. With
+    ``by``, the statistic is computed separately for each group, and only
+    used within that group.
 
     Currently supported ``statistic``s include:
 
@@ -2376,10 +4159,17 @@ def impute(df, column: str, value=None, statistic=None):
     - ``minimum`` (also aliased by ``min``)
     - ``maximum`` (also aliased by ``max``)
 
+    If several values are equally common, ``mode`` picks the smallest.
+
     :param df: A pandas DataFrame
-    :param column: The name of the column on which to impute values.
+    :param column: The name of the column on which to impute values, or a
+        list of column names.
     :param value: (optional) The value to impute.
     :param statistic: (optional) The column statistic to impute.
+    :param by: (optional) A column name, or list of column names, to group
+        by when computing ``statistic``. Rows whose group is null are not
+        imputed.
+    :returns: A pandas DataFrame with the null values imputed.
     """
 
     # Firstly, we check that only one of `value` or `statistic` are provided.
@@ -2388,35 +4178,84 @@ def impute(df, column: str, value=None, statistic=None):
             "Only one of `value` or `statistic` should be provided"
         )
 
+    columns = column if isinstance(column, list) else [column]
+
     # If statistic is provided, then we compute the relevant summary statistic
     # from the other data.
     funcs = {
-        "mean": np.mean,
-        "average": np.mean,  # aliased
-        "median": np.median,
-        "mode": mode,
-        "minimum": np.min,
-        "min": np.min,  # aliased
-        "maximum": np.max,
-        "max": np.max,  # aliased
+        "mean": "mean",
+        "average": "mean",  # aliased
+        "median": "median",
+        "mode": "mode",
+        "minimum": "min",
+        "min": "min",  # aliased
+        "maximum": "max",
+        "max": "max",  # aliased
     }
     if statistic is not None:
         # Check that the statistic keyword argument is one of the approved.
         if statistic not in funcs.keys():
             raise KeyError(f"`statistic` must be one of {funcs.keys()}")
+        func = funcs[statistic]
+
+        # Each column gets its own statistic, looked up by column name.
+        if by is None:
+            if func == "mode":
+                fills = {col: _mode(df[col]) for col in columns}
+            else:
+                fills = getattr(df[columns], func)()
+        else:
+            if isinstance(by, str):
+                by = [by]
+            if func == "mode":
+                fills = pd.DataFrame(
+                    {col: _grouped_mode(df, by, col) for col in columns},
+                    index=df.index,
+                )
+            else:
+                fills = df.groupby(by)[columns].transform(func)
+    elif value is not None:
+        # A user-supplied `value` goes to `fillna` as it is, so that dicts
+        # and Series keep their `fillna` meaning.
+        fills = {col: value for col in columns}
+    else:
+        return df
 
-        value = funcs[statistic](df[column].dropna().values)
-        # special treatment for mode, because scipy stats mode returns a
-        # moderesult object.
-        if statistic is "mode":
-            value = value.mode[0]
-
-    # The code is architected this way - if `value` is not provided but
-    # statistic is, we then overwrite the None value taken on by `value`, and
-    # use it to set the imputation column.
-    if value is not None:
-        df[column] = df[column].fillna(value)
-    return df
+    return _replace_columns(
+        df, {col: df[col].fillna(fills[col]) for col in columns}
+    )
+
+
+def _mode(series: pd.Series):
+    """
+    The most common non-null value of a Series, or the smallest of them if
+    there is a tie. Returns NaN if all values are null.
+    """
+    counts = series.value_counts(sort=False, dropna=True)
+    if counts.empty:
+        return np.nan
+    try:
+        return counts.index[counts.to_numpy() == counts.max()].min()
+    except TypeError:
+        # Values that cannot be compared, e.g. of mixed types.
+        return counts.idxmax()
+
+
+def _grouped_mode(df: pd.DataFrame, by: List[str], column: str) -> pd.Series:
+    """
+    The mode of `column` within each group of `by`, broadcast to all rows.
+
+    As with `_mode`, the smallest value wins a tie.
+    """
+    # Sizes are sorted by group, then value, so the first largest size in
+    # each group belongs to the smallest most common value.
+    sizes = df.groupby(by + [column], observed=True).size()
+    modes = sizes.groupby(level=by).idxmax().map(lambda key: key[-1])
+    if len(by) == 1:
+        keys = pd.Index(df[by[0]])
+    else:
+        keys = pd.MultiIndex.from_frame(df[by])
+    return pd.Series(modes.reindex(keys).to_numpy(), index=df.index)
 
 
 @pf.register_dataframe_method
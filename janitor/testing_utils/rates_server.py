@@ -0,0 +1,146 @@
+"""
+A local stand-in for the exchange rate API, for testing.
+"""
+
+import json
+import threading
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlparse
+
+# Units of each currency per EUR, before the daily drift.
+BASE_RATES = {"EUR": 1.0, "USD": 1.25, "GBP": 0.8, "JPY": 125.0}
+LATEST_DATE = date(2020, 1, 31)
+
+
+def _per_eur(currency: str, day: date) -> float:
+    # Each currency drifts against EUR at its own pace, so that rates differ
+    # from day to day while staying consistent across currencies.
+    pace = list(BASE_RATES).index(currency)
+    days = (_business_day(day) - date(1999, 1, 4)).days
+    return BASE_RATES[currency] * (1 + pace * days / 100_000)
+
+
+def rate_on(base: str, currency: str, day: date) -> float:
+    """
+    The stub's rate of `currency` per unit of `base` on `day`. As with the
+    real API, there are no rates on weekends; those of the Friday before are
+    used instead.
+    """
+    if base == currency:
+        return 1.0
+    return _per_eur(currency, day) / _per_eur(base, day)
+
+
+def rates_on(base: str, day: date) -> dict:
+    return {
+        currency: rate_on(base, currency, day)
+        for currency in BASE_RATES
+        if currency != base
+    }
+
+
+def _parse_date(text: str) -> date:
+    # date.fromisoformat needs Python 3.7.
+    return datetime.strptime(text, "%Y-%m-%d").date()
+
+
+def _business_day(day: date) -> date:
+    return day - timedelta(days=max(day.weekday() - 4, 0))
+
+
+def _history(params: dict) -> dict:
+    base = params.get("base", "EUR")
+    start = _parse_date(params["start_at"])
+    end = _parse_date(params["end_at"])
+    days = (start + timedelta(days=n) for n in range((end - start).days + 1))
+    return {
+        "base": base,
+        "start_at": str(start),
+        "end_at": str(end),
+        "rates": {
+            str(day): rates_on(base, day) for day in days if day.weekday() < 5
+        },
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {
+            key: values[0] for key, values in parse_qs(url.query).items()
+        }
+        self.server.requests.append((url.path, params))
+        base = params.get("base", "EUR")
+        path = url.path.strip("/")
+
+        try:
+            if path == "history" and self.server.history:
+                body = _history(params)
+            else:
+                day = LATEST_DATE if path == "latest" else _parse_date(path)
+                body = {
+                    "base": base,
+                    "date": str(_business_day(day)),
+                    "rates": rates_on(base, day),
+                }
+        except (KeyError, ValueError):
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    # As http.server.ThreadingHTTPServer, which needs Python 3.7.
+    daemon_threads = True
+
+
+class RatesServer:
+    """
+    Serve stub exchange rates over HTTP from a background thread.
+
+    Use as a context manager; `url` is the API URL to use, and `requests`
+    lists the `(path, params)` of every request received. Without
+    `history`, the time-series endpoint is not served.
+    """
+
+    def __init__(self, history: bool = True):
+        self._server = _ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.requests = []
+        self._server.history = history
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> list:
+        return self._server.requests
+
+    @property
+    def history(self) -> bool:
+        return self._server.history
+
+    @history.setter
+    def history(self, value: bool):
+        self._server.history = value
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,111 @@
+import gzip
+
+import numpy as np
+import pandas as pd
+import pytest
+from Bio import bgzf
+
+RECORDS = {f"seq{i}": "ACGT"[i % 4] * (i + 1) + "TTGA" * i for i in range(12)}
+
+
+def fasta_text(records):
+    return "".join(
+        f">{name} description\n{sequence}\n"
+        for name, sequence in records.items()
+    )
+
+
+@pytest.fixture
+def shards(tmp_path):
+    """
+    The records split over a plain, a gzip and a BGZF file.
+    """
+    names = list(RECORDS)
+    parts = [
+        {name: RECORDS[name] for name in part}
+        for part in (names[:4], names[4:8], names[8:])
+    ]
+    (tmp_path / "shard0.fasta").write_text(fasta_text(parts[0]))
+    with gzip.open(tmp_path / "shard1.fasta.gz", "wt") as f:
+        f.write(fasta_text(parts[1]))
+    with bgzf.BgzfWriter(str(tmp_path / "shard2.fasta.bgz"), "w") as f:
+        f.write(fasta_text(parts[2]))
+    return tmp_path
+
+
+@pytest.fixture
+def ids():
+    return pd.DataFrame(
+        {"id": ["seq11", "seq0", "seq5", "missing", "seq0", None, "seq9"]}
+    )
+
+
+def expected(ids):
+    return [RECORDS.get(i, np.nan) for i in ids["id"]]
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+@pytest.mark.biology
+def test_join_fasta_glob(shards, ids, n_jobs):
+    df = ids.join_fasta(
+        str(shards / "shard*"), "id", "sequence", n_jobs=n_jobs
+    )
+    assert df["sequence"].equals(pd.Series(expected(ids), name="sequence"))
+
+
+@pytest.mark.biology
+def test_join_fasta_list_first_file_wins(shards, ids, tmp_path):
+    override = tmp_path / "override.fasta"
+    override.write_text(">seq5\nNNNN\n>seq5\nCCCC\n")
+    filenames = [override, shards / "shard1.fasta.gz", shards / "shard2*"]
+    df = ids.join_fasta(filenames, "id", "sequence")
+
+    sequences = expected(ids)
+    sequences[1] = sequences[4] = np.nan
+    sequences[2] = "NNNN"
+    assert df["sequence"].equals(pd.Series(sequences, name="sequence"))
+
+
+@pytest.mark.parametrize("dtype", ["category", "string[pyarrow]"])
+@pytest.mark.biology
+def test_join_fasta_dtype(shards, ids, dtype):
+    df = ids.join_fasta(str(shards / "shard*"), "id", "sequence", dtype=dtype)
+    assert df["sequence"].dtype == dtype
+    assert df["sequence"].isna().tolist() == [
+        s is np.nan for s in expected(ids)
+    ]
+    assert df["sequence"].dropna().tolist() == [
+        s for s in expected(ids) if s is not np.nan
+    ]
+
+
+@pytest.mark.biology
+def test_join_fasta_indexed_files(shards, ids):
+    df = ids.join_fasta(
+        [shards / "shard0.fasta", shards / "shard0.fasta"],
+        "id",
+        "sequence",
+        indexed=True,
+    )
+    # Only the records of the plain shard are found.
+    assert df["sequence"][1] == RECORDS["seq0"]
+    assert df["sequence"].notna().tolist() == [
+        False,
+        True,
+        False,
+        False,
+        True,
+        False,
+        False,
+    ]
+
+    with pytest.raises(ValueError):
+        ids.join_fasta(
+            str(shards / "shard1.fasta.gz"), "id", "sequence", indexed=True
+        )
+
+
+@pytest.mark.biology
+def test_join_fasta_no_files(shards, ids):
+    with pytest.raises(FileNotFoundError):
+        ids.join_fasta(str(shards / "nothing*"), "id", "sequence")
@@ -0,0 +1,102 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from janitor.biology import build_fasta_index
+
+RECORDS = {
+    "seq1": "ACGTACGTAC" * 5 + "ACG",
+    "seq2": "TTGCA",
+    "seq3": "GGGCCCAAAT" * 3,
+}
+
+
+def write_fasta(path, records, width=10, newline="\n"):
+    with open(path, "w", newline="") as f:
+        for name, sequence in records.items():
+            f.write(f">{name} some description{newline}")
+            for start in range(0, len(sequence), width):
+                end = start + width
+                f.write(sequence[start:end] + newline)
+    return str(path)
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+@pytest.mark.biology
+def test_join_fasta_indexed(tmp_path, newline):
+    filename = write_fasta(tmp_path / "seqs.fasta", RECORDS, newline=newline)
+    df = pd.DataFrame({"id": ["seq3", "seq1", "missing", "seq3", "seq2"]})
+
+    indexed = df.copy().join_fasta(filename, "id", "sequence", indexed=True)
+    parsed = df.copy().join_fasta(filename, "id", "sequence")
+
+    expected = pd.Series([RECORDS.get(i, np.nan) for i in df["id"]])
+    assert indexed["sequence"].equals(expected.rename("sequence"))
+    assert indexed.equals(parsed)
+    assert os.path.exists(filename + ".fai")
+
+
+@pytest.mark.biology
+def test_fasta_index_format(tmp_path):
+    filename = write_fasta(tmp_path / "seqs.fasta", RECORDS)
+    pd.DataFrame({"id": ["seq1"]}).join_fasta(
+        filename, "id", "sequence", indexed=True
+    )
+
+    # As written by `samtools faidx`.
+    with open(filename + ".fai") as f:
+        assert f.read() == (
+            "seq1\t53\t23\t10\t11\n"
+            "seq2\t5\t105\t5\t6\n"
+            "seq3\t30\t134\t10\t11\n"
+        )
+
+
+@pytest.mark.biology
+def test_join_fasta_indexed_reuses_index(tmp_path):
+    filename = write_fasta(tmp_path / "seqs.fasta", RECORDS)
+    df = pd.DataFrame({"id": ["seq2"]})
+    df.join_fasta(filename, "id", "sequence", indexed=True)
+
+    # A stale, but newer, index is used as it is.
+    index = build_fasta_index(filename)
+    index["name"] = index["name"].str.replace("seq", "renamed")
+    index.to_csv(filename + ".fai", sep="\t", header=False, index=False)
+    df = df.join_fasta(filename, "id", "sequence", indexed=True)
+    assert df["sequence"].isna().all()
+
+    # A newer FASTA file is indexed again.
+    os.utime(filename + ".fai", (0, 0))
+    df = df.join_fasta(filename, "id", "sequence", indexed=True)
+    assert df["sequence"].tolist() == [RECORDS["seq2"]]
+
+
+@pytest.mark.biology
+def test_build_fasta_index_irregular_lines(tmp_path):
+    filename = tmp_path / "irregular.fasta"
+    filename.write_text(">seq1\nACGT\nAC\nACGT\n")
+    with pytest.raises(ValueError):
+        build_fasta_index(str(filename))
+
+
+@pytest.mark.biology
+def test_build_fasta_index_edge_cases(tmp_path):
+    filename = tmp_path / "edge.fasta"
+    filename.write_bytes(
+        b"; comment\n>empty\n>one\r\nACGT\r\n>last desc\nAC\nGT\n\n"
+    )
+    index = build_fasta_index(str(filename))
+    assert index.values.tolist() == [
+        ["empty", 0, 17, 0, 1],
+        ["one", 4, 23, 4, 6],
+        ["last", 4, 40, 2, 3],
+    ]
+
+    df = pd.DataFrame({"id": ["one", "last", "empty"]})
+    df = df.join_fasta(str(filename), "id", "sequence", indexed=True)
+    assert df["sequence"].tolist() == ["ACGT", "ACGT", ""]
+
+    filename.write_text("no records\n")
+    assert build_fasta_index(str(filename)).empty
@@ -107,3 +107,18 @@ def chemdf():
 def pytest_configure():
     pytest.TEST_DATA_DIR = TEST_DATA_DIR
     pytest.EXAMPLES_DIR = EXAMPLES_DIR
+
+
+@pytest.fixture
+def rates_api(tmp_path, monkeypatch):
+    """
+    A local exchange rate API with an empty rate cache.
+    """
+    import janitor.finance
+    from janitor.testing_utils.rates_server import RatesServer
+
+    with RatesServer() as server:
+        monkeypatch.setattr(janitor.finance, "API_URL", server.url)
+        monkeypatch.setattr(janitor.finance, "_rate_cache", None)
+        janitor.finance.configure_rate_cache(tmp_path / "rates.sqlite")
+        yield server
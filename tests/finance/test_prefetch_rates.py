@@ -0,0 +1,96 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import janitor.finance
+from janitor.finance import prefetch_rates
+from janitor.testing_utils.rates_server import rate_on
+
+DATES = pd.date_range("2019-06-01", "2019-06-30")
+
+
+@pytest.mark.finance
+def test_prefetch_rates_one_request_per_base(rates_api):
+    prefetch_rates(DATES, [("USD", "EUR"), ("GBP", "EUR"), ("USD", "JPY")])
+
+    paths = sorted(
+        (path, params["base"]) for path, params in rates_api.requests
+    )
+    assert paths == [("/history", "GBP"), ("/history", "USD")]
+
+    cache = janitor.finance._get_rate_cache()
+    for day in DATES:
+        rates = cache.get("USD", str(day.date()))
+        # Weekends get the rates of the Friday before.
+        assert rates["JPY"] == rate_on("USD", "JPY", day.date())
+        assert cache.get("GBP", str(day.date())) is not None
+
+
+@pytest.mark.finance
+def test_prefetch_rates_skips_cached(rates_api):
+    prefetch_rates(DATES[:10], [("USD", "EUR")])
+    prefetch_rates(DATES, [("USD", "EUR")])
+
+    assert rates_api.requests[1] == (
+        "/history",
+        {"base": "USD", "start_at": "2019-06-04", "end_at": "2019-06-30"},
+    )
+    prefetch_rates(DATES, [("USD", "EUR")])
+    assert len(rates_api.requests) == 2
+
+
+@pytest.mark.finance
+def test_prefetch_rates_without_history(rates_api):
+    rates_api.history = False
+    prefetch_rates(DATES[:5], [("USD", "EUR")], max_workers=2)
+
+    paths = sorted(path for path, _ in rates_api.requests)
+    assert paths == [f"/{day.date()}" for day in DATES[:5]] + ["/history"]
+
+    df = pd.DataFrame({"a": [1.0]})
+    df = df.convert_currency("a", "USD", "JPY", date(2019, 6, 1))
+    assert len(rates_api.requests) == 6
+    assert df["a"].iloc[0] == rate_on("USD", "JPY", date(2019, 6, 1))
+
+
+@pytest.mark.finance
+def test_prefetch_rates_invalid_date(rates_api):
+    with pytest.raises(ValueError):
+        prefetch_rates([date(1998, 1, 1)], [("USD", "EUR")])
+
+
+@pytest.mark.finance
+def test_fetch_history_unreachable(monkeypatch):
+    # Nothing listens on port 1, so the connection is refused.
+    monkeypatch.setattr(janitor.finance, "API_URL", "http://127.0.0.1:1")
+    assert janitor.finance._fetch_history("USD", ["2019-06-03"]) == {}
+
+
+@pytest.mark.finance
+def test_convert_currency_date_col_from_api(rates_api):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "amount": rng.uniform(0, 100, 200),
+            "currency": rng.choice(["USD", "GBP", "EUR"], 200),
+            "date": rng.choice(DATES, 200),
+        }
+    )
+    result = df.convert_currency(
+        "amount",
+        to_currency="JPY",
+        currency_col="currency",
+        date_col="date",
+        make_new_column=True,
+    )
+
+    assert [path for path, _ in rates_api.requests] == ["/history"]
+    expected = [
+        amount * rate_on(currency, "JPY", day.date())
+        for amount, currency, day in zip(
+            df["amount"], df["currency"], df["date"]
+        )
+    ]
+    np.testing.assert_allclose(result["amount_JPY"], expected, rtol=1e-12)
@@ -0,0 +1,57 @@
+import time
+from datetime import date
+
+import pytest
+
+import janitor.finance
+from janitor.finance import RateCache
+from janitor.testing_utils.rates_server import rate_on
+
+
+@pytest.mark.finance
+def test_convert_currency_fetches_each_base_once(dataframe, rates_api):
+    df = dataframe.convert_currency("a", "USD", "EUR", make_new_column=True)
+    df = df.convert_currency("a", "USD", "GBP", make_new_column=True)
+
+    assert rates_api.requests == [("/latest", {"base": "USD"})]
+    expected = dataframe["a"] * rate_on("USD", "GBP", date(2020, 1, 31))
+    assert (df["a_GBP"] == expected).all()
+
+
+@pytest.mark.finance
+def test_convert_currency_cache_persists(dataframe, rates_api, tmp_path):
+    historical_date = date(2019, 6, 3)
+    dataframe.convert_currency(
+        "a", "USD", "JPY", historical_date, make_new_column=True
+    )
+    # A new cache on the same file, as in a new process.
+    janitor.finance.configure_rate_cache(tmp_path / "rates.sqlite", ttl=0)
+    df = dataframe.convert_currency(
+        "a", "USD", "GBP", historical_date, make_new_column=True
+    )
+
+    assert rates_api.requests == [("/2019-06-03", {"base": "USD"})]
+    expected = dataframe["a"] * rate_on("USD", "GBP", historical_date)
+    assert (df["a_GBP"] == expected).all()
+
+
+@pytest.mark.finance
+def test_rate_cache_ttl(tmp_path):
+    cache = RateCache(tmp_path / "rates.sqlite", ttl=0.05)
+    cache.put("USD", "latest", {"EUR": 0.8})
+    cache.put("USD", "2019-06-03", {"EUR": 0.9})
+    assert cache.get("USD", "latest") == {"EUR": 0.8}
+
+    time.sleep(0.1)
+    assert cache.get("USD", "latest") is None
+    assert cache.get("USD", "2019-06-03") == {"EUR": 0.9}
+
+
+@pytest.mark.finance
+def test_rate_cache_max_entries(tmp_path):
+    cache = RateCache(tmp_path / "rates.sqlite", max_entries=2)
+    for day in ["2019-06-03", "2019-06-04", "2019-06-05"]:
+        cache.put("USD", day, {"EUR": 0.9})
+        time.sleep(0.01)
+    assert cache.get("USD", "2019-06-03") is None
+    assert cache.get("USD", "2019-06-05") == {"EUR": 0.9}
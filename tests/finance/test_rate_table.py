@@ -0,0 +1,91 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from janitor.finance import read_rate_table
+
+
+@pytest.fixture
+def rates_long():
+    return pd.DataFrame(
+        {
+            "date": ["2019-01-02"] * 2 + ["2019-01-04"] * 2,
+            "currency": ["USD", "GBP"] * 2,
+            "rate": [1.2, 0.9, 1.1, 0.8],
+        }
+    )
+
+
+@pytest.fixture
+def transactions():
+    return pd.DataFrame(
+        {
+            "amount": [100.0, 100.0, 100.0, 100.0, 100.0],
+            "currency": ["USD", "GBP", "EUR", "USD", "USD"],
+            "booked_on": pd.to_datetime(
+                [
+                    "2019-01-03",
+                    "2019-01-05",
+                    "2019-01-04",
+                    "2019-01-01",
+                    "2019-01-04",
+                ]
+            ),
+        }
+    )
+
+
+@pytest.mark.finance
+@pytest.mark.parametrize("extension", ["csv", "parquet"])
+def test_read_rate_table_long_and_wide(tmp_path, rates_long, extension):
+    wide = rates_long.pivot(index="date", columns="currency", values="rate")
+    wide = wide.reset_index()
+    if extension == "parquet":
+        pytest.importorskip("pyarrow")
+    for name, table in [("long", rates_long), ("wide", wide)]:
+        filename = tmp_path / f"{name}.{extension}"
+        if extension == "csv":
+            table.to_csv(filename, index=False)
+        else:
+            table.to_parquet(filename)
+        rates = read_rate_table(filename)
+        rates = rates.set_index(["date", "currency"])["rate"]
+        assert rates[(pd.Timestamp("2019-01-04"), "GBP")] == 0.8
+        assert rates[(pd.Timestamp("2019-01-02"), "EUR")] == 1.0
+
+
+@pytest.mark.finance
+def test_convert_currency_rate_table_per_row(rates_long, transactions):
+    df = transactions.convert_currency(
+        "amount",
+        to_currency="USD",
+        rates=rates_long,
+        currency_col="currency",
+        date_col="booked_on",
+        make_new_column=True,
+    )
+    expected = [100.0, 100 / 0.8 * 1.1, 110.0, np.nan, 100.0]
+    np.testing.assert_allclose(df["amount_USD"], expected)
+    assert (df["amount"] == 100).all()
+
+
+@pytest.mark.finance
+def test_convert_currency_rate_table_scalar(tmp_path, rates_long):
+    rates_long.to_csv(tmp_path / "rates.csv", index=False)
+    df = pd.DataFrame({"amount": [10.0, 20.0]})
+
+    latest = df.copy().convert_currency(
+        "amount", "GBP", "USD", rates=tmp_path / "rates.csv"
+    )
+    np.testing.assert_allclose(latest["amount"], [10 / 0.8 * 1.1, 27.5])
+
+    historical = df.convert_currency(
+        "amount",
+        "GBP",
+        "USD",
+        historical_date=date(2019, 1, 3),
+        rates=rates_long,
+    )
+    np.testing.assert_allclose(historical["amount"], [10 / 0.9 * 1.2, 80 / 3])
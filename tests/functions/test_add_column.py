@@ -113,3 +113,41 @@ def test_add_column_iterator_repeat_subtraction(dataframe):
     df = dataframe.add_column("city_pop", dataframe.a - dataframe.a)
     assert df.city_pop.sum() == 0
     assert df.city_pop.iloc[0] == 0
+
+
+@pytest.mark.functions
+@pytest.mark.parametrize(
+    "values",
+    [
+        pd.Categorical(["a", "b"]),
+        pd.array([1, None], dtype="Int64"),
+        pd.Series([1.5, 2.5], dtype="float32"),
+        np.array([True, False]),
+    ],
+)
+def test_add_column_fill_remaining_keeps_dtype(dataframe, values):
+    df = dataframe.add_column("filled", values, fill_remaining=True)
+    assert df["filled"].dtype == values.dtype
+    expected = pd.Series(values).take([0, 1] * 4 + [0]).reset_index(drop=True)
+    pd.testing.assert_series_equal(df["filled"], expected, check_names=False)
+
+
+@pytest.mark.functions
+def test_add_column_fill_remaining_generator(dataframe):
+    def naturals():
+        n = 0
+        while True:
+            yield n
+            n += 1
+
+    df = dataframe.add_column("naturals", naturals(), fill_remaining=True)
+    assert list(df["naturals"]) == list(range(9))
+
+    df = df.add_column("repeated", iter([1, 2]), fill_remaining=True)
+    assert list(df["repeated"]) == [1, 2] * 4 + [1]
+
+
+@pytest.mark.functions
+def test_add_column_iterator_too_long(dataframe):
+    with pytest.raises(ValueError):
+        dataframe.add_column("too_long", iter(range(10)))
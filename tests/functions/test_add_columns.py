@@ -1,3 +1,5 @@
+import warnings
+
 import numpy as np
 import pandas as pd
 import pytest
@@ -34,3 +36,24 @@ def test_add_columns(df, x_vals, n_yvals):
         series = pd.Series(y_vals)
         series.name = "y"
         pd.testing.assert_series_equal(df["y"], series)
+
+
+@pytest.mark.functions
+def test_add_columns_many(dataframe):
+    """
+    Adding hundreds of columns should happen in one go, without pandas
+    warning about a fragmented DataFrame.
+    """
+    new_columns = {f"col_{i}": np.arange(len(dataframe)) for i in range(300)}
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", pd.errors.PerformanceWarning)
+        df = dataframe.add_columns(**new_columns)
+    assert df.shape == (len(dataframe), 305)
+    assert list(df.columns[5:]) == list(new_columns)
+
+
+@pytest.mark.functions
+def test_add_columns_already_exists(dataframe):
+    with pytest.raises(ValueError):
+        dataframe.add_columns(x=1, a=2)
+    assert "x" not in dataframe.columns
@@ -1,3 +1,5 @@
+import numpy as np
+import pandas as pd
 import pytest
 
 
@@ -5,3 +7,104 @@ import pytest
 def test_change_type(dataframe):
     df = dataframe.change_type(column="a", dtype=float)
     assert df["a"].dtype == float
+
+
+@pytest.mark.functions
+def test_change_type_many_columns(dataframe):
+    df = dataframe.change_type(["a", "decorated-*"], dtype=float)
+    assert df["a"].dtype == float
+    assert df["decorated-elephant"].dtype == float
+
+
+@pytest.mark.functions
+def test_change_type_tuple_label(multiindex_dataframe):
+    df = multiindex_dataframe.change_type(("a", "b"), float)
+    assert df[("a", "b")].dtype == float
+    assert df[("Bell__Chart", "Normal  Distribution")].dtype == np.int64
+
+    df = multiindex_dataframe.change_type({("a", "b"): str})
+    assert df[("a", "b")].tolist() == ["1", "2", "3"]
+
+
+@pytest.mark.functions
+def test_change_type_wide():
+    df = pd.DataFrame(np.ones((3, 40), dtype=np.int64))
+    df.columns = [f"c{i}" for i in range(40)]
+    df["text"] = "x"
+    result = df.change_type("c1*", "int8")
+
+    assert result.columns.tolist() == df.columns.tolist()
+    changed = ["c1"] + [f"c{i}" for i in range(10, 20)]
+    assert (result.dtypes[changed] == np.int8).all()
+    assert (result.dtypes.drop(changed + ["text"]) == np.int64).all()
+
+
+@pytest.mark.functions
+def test_change_type_ignore_errors():
+    df = pd.DataFrame({"a": ["1", "2"], "b": ["x", "3"]})
+    df = df.change_type(["a", "b"], int, errors="ignore")
+    assert df["a"].dtype == np.int64
+    assert df["b"].tolist() == ["x", "3"]
+
+
+@pytest.mark.functions
+def test_change_type_mapping(dataframe):
+    df = dataframe.change_type({"a": str, "cities": "category"})
+    assert df["a"].tolist() == ["1", "2", "3"] * 3
+    assert df["cities"].dtype == "category"
+    assert df["Bell__Chart"].dtype == float
+
+
+@pytest.mark.functions
+def test_change_type_missing_column(dataframe):
+    with pytest.raises(KeyError):
+        dataframe.change_type("not_a_column", float)
+
+
+@pytest.mark.functions
+def test_change_type_coerce():
+    df = pd.DataFrame({"a": ["1", "x", "3"], "b": ["1.5", "2", "?"]})
+    with pytest.raises(ValueError):
+        df.change_type("a", int)
+
+    df = df.change_type({"a": int, "b": float}, errors="coerce")
+    assert df["a"].dtype == "Int64"
+    assert df["a"].tolist() == [1, pd.NA, 3]
+    assert df["b"].isnull().tolist() == [False, False, True]
+
+
+@pytest.mark.functions
+@pytest.mark.parametrize(
+    "values,expected",
+    [
+        ([0, 1, 127], np.int8),
+        ([0, 1, 255], np.uint8),
+        ([-1, 1, 255], np.int16),
+        ([0, 1, 2 ** 40], np.int64),
+        ([0.5, 1.25, np.nan], np.float32),
+        ([0.1, 1.25, 2.5], np.float64),
+    ],
+)
+def test_change_type_downcast(values, expected):
+    df = pd.DataFrame({"a": values})
+    result = df.change_type("a", downcast="smallest")
+    assert result["a"].dtype == expected
+    np.testing.assert_array_equal(result["a"], df["a"])
+
+
+@pytest.mark.functions
+def test_change_type_downcast_nullable():
+    df = pd.DataFrame({"a": pd.array([1, None, 3], dtype="Int64")})
+    assert df.change_type("a", downcast="smallest")["a"].dtype == "Int8"
+
+
+@pytest.mark.functions
+def test_change_type_report(dataframe):
+    df = dataframe.change_type(
+        ["a", "decorated-elephant"], downcast="smallest", report=True
+    )
+    report = df.memory_report
+    assert list(report.index) == ["a", "decorated-elephant"]
+    assert (report["bytes_before"] == 72).all()
+    assert (report["bytes_after"] == 9).all()
+    assert (report["bytes_saved"] == 63).all()
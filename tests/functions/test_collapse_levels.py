@@ -1,5 +1,7 @@
 import pandas as pd
 import pytest
+from hypothesis import given
+from hypothesis import strategies as st
 
 
 @pytest.mark.functions
@@ -64,3 +66,25 @@ def test_collapse_levels_functionality_3level(
             "decorated-elephantAsDfr.i.p-rhino :'(AsDfdeadly__flamingo",
         ]
     )
+
+
+@pytest.mark.functions
+@given(
+    tuples=st.lists(
+        st.tuples(
+            st.one_of(st.sampled_from(["", "x", "y"]), st.integers(0, 3)),
+            st.sampled_from(["", "mean", "max", None]),
+            st.one_of(st.just(""), st.floats(allow_nan=True, width=16)),
+        ),
+        min_size=1,
+        max_size=20,
+    )
+)
+def test_collapse_levels_matches_joining_tuples(tuples):
+    columns = pd.MultiIndex.from_tuples(tuples)
+    df = pd.DataFrame([range(len(columns))], columns=columns)
+    expected = [
+        "_".join(str(el) for el in tup if str(el) != "")
+        for tup in columns.values
+    ]
+    assert df.collapse_levels().columns.tolist() == expected
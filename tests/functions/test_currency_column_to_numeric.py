@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import janitor.functions
+
+
+@pytest.fixture
+def currency_df():
+    return pd.DataFrame(
+        {
+            "a": ["-$1.00", "", "REPAY"] * 2 + ["$23.00", "", "Other Account"],
+            "d": list("abcdefghi"),
+        }
+    )
+
+
+@pytest.mark.functions
+def test_currency_column_to_numeric(currency_df):
+    df = currency_df.currency_column_to_numeric("a")
+    expected = [-1.0, np.nan, np.nan] * 2 + [23.0, np.nan, np.nan]
+    pd.testing.assert_series_equal(df["a"], pd.Series(expected, name="a"))
+
+
+@pytest.mark.functions
+@pytest.mark.parametrize("use_pyarrow", [True, False])
+def test_currency_column_to_numeric_thousands(monkeypatch, use_pyarrow):
+    if use_pyarrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(janitor.functions, "_has_pyarrow", lambda: False)
+    df = pd.DataFrame({"a": ["$1,234.50", "USD 7", "(3)"]})
+    df = df.currency_column_to_numeric("a")
+    assert df["a"].tolist() == [1234.5, 7.0, 3.0]
+
+
+@pytest.mark.functions
+@pytest.mark.parametrize(
+    "kwargs,expected",
+    [
+        ({"cast_non_numeric": {"REPAY": 22}}, [-1, np.nan, 22, 23, np.nan]),
+        ({"fill_all_non_numeric": 35}, [-1, np.nan, 35, 23, 35]),
+        (
+            {"cast_non_numeric": {"REPAY": 22}, "fill_all_non_numeric": 35},
+            [-1, np.nan, 22, 23, 35],
+        ),
+    ],
+)
+def test_currency_column_to_numeric_non_numeric(kwargs, expected):
+    df = pd.DataFrame({"a": ["-$1.00", "", "REPAY", "$23.00", "Other"]})
+    df = df.currency_column_to_numeric("a", **kwargs)
+    pd.testing.assert_series_equal(
+        df["a"], pd.Series(expected, dtype=float, name="a")
+    )
+
+
+@pytest.mark.functions
+def test_currency_column_to_numeric_remove_non_numeric(currency_df):
+    df = currency_df.currency_column_to_numeric(
+        "a", cast_non_numeric={"REPAY": 22}, remove_non_numeric=True
+    )
+    assert df["d"].tolist() == list("abcdefgh")
+    assert df["a"].tolist()[-2] == 23.0
+    assert df["a"].tolist()[2] == 22.0
+
+
+@pytest.mark.functions
+def test_currency_column_to_numeric_cast_type_error(currency_df):
+    with pytest.raises(TypeError):
+        currency_df.currency_column_to_numeric(
+            "a", cast_non_numeric={"REPAY": "22"}
+        )
+
+
+@pytest.mark.functions
+def test_currency_column_to_numeric_accounting():
+    df = pd.DataFrame({"a": [" (1,000.50) ", "-", "2,000", "(3)"]})
+    df = df.currency_column_to_numeric("a", type="accounting")
+    assert df["a"].tolist() == [-1000.5, 0.0, 2000.0, -3.0]
+
+
+@pytest.mark.functions
+@pytest.mark.parametrize(
+    "number_format,values,expected",
+    [
+        (
+            "de",
+            ["1.234,56 €", "-3,50 €", "1.000.000", "1.234,56-", "(2,5)"],
+            [1234.56, -3.5, 1000000.0, -1234.56, -2.5],
+        ),
+        (
+            "fr",
+            ["1 234,56 €", "−3,50 €", "12 000,10"],
+            [1234.56, -3.5, 12000.1],
+        ),
+        (
+            "en",
+            ["$1,234.56", "¥1,234", "1,234.56-", "(3.25)", "EUR 7"],
+            [1234.56, 1234.0, -1234.56, -3.25, 7.0],
+        ),
+        ("ch", ["CHF 1'234.50", "-1'000"], [1234.5, -1000.0]),
+    ],
+)
+def test_currency_column_to_numeric_number_format(
+    number_format, values, expected
+):
+    df = pd.DataFrame({"a": values})
+    result = df.copy().currency_column_to_numeric(
+        "a", number_format=number_format
+    )
+    assert result["a"].tolist() == expected
+
+    inferred = df.currency_column_to_numeric("a", number_format="auto")
+    assert inferred["a"].tolist() == expected
+
+
+@pytest.mark.functions
+def test_currency_column_to_numeric_number_format_non_numeric():
+    df = pd.DataFrame({"a": ["1,5 €", "", "n/a", "REPAY"]})
+    df = df.currency_column_to_numeric(
+        "a",
+        number_format=",",
+        cast_non_numeric={"REPAY": 0},
+        fill_all_non_numeric=-1,
+    )
+    assert df["a"].tolist()[:1] + df["a"].tolist()[2:] == [1.5, -1, 0]
+    assert np.isnan(df["a"].iloc[1])
+
+
+@pytest.mark.functions
+def test_currency_column_to_numeric_unknown_number_format(currency_df):
+    with pytest.raises(ValueError):
+        currency_df.currency_column_to_numeric("a", number_format="xx")
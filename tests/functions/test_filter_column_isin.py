@@ -1,6 +1,13 @@
+from datetime import datetime
+
+import numpy as np
 import pandas as pd
 import pytest
 from hypothesis import assume, given
+from hypothesis import strategies as st
+
+from janitor import BloomFilter, NGramIndex
+from janitor.functions import _levenshtein
 
 from janitor.testing_utils.strategies import (
     categoricaldf_strategy,
@@ -25,3 +32,203 @@ def test_filter_column_isin(df, iterable):
     assume(len(iterable) >= 1)
     df = df.filter_column_isin("names", iterable)
     assert set(df["names"]).issubset(iterable)
+
+
+@pytest.mark.functions
+@given(
+    df=categoricaldf_strategy(),
+    iterable=names_strategy(),
+    complement=st.booleans(),
+)
+def test_filter_column_isin_bloom(df, iterable, complement):
+    """
+    Prefiltering with a Bloom filter should give exactly the same result as
+    the exact filter, including when taking the complement.
+    """
+    assume(len(iterable) >= 1)
+    bloom = BloomFilter.from_iterable(iterable, error_rate=0.2)
+    expected = df.filter_column_isin("names", iterable, complement=complement)
+    result = df.filter_column_isin(
+        "names", iter(iterable), complement=complement, bloom_filter=bloom
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.functions
+def test_bloom_filter_no_false_negatives():
+    values = np.arange(10_000)
+    bloom = BloomFilter.from_iterable(values, error_rate=0.01)
+    assert bloom.contains(values).all()
+    assert bloom.contains(values.astype(float)).all()
+    assert 42 in bloom
+    # The false positive rate should be in the ballpark of the target rate.
+    assert bloom.contains(np.arange(10_000, 20_000)).mean() < 0.05
+
+
+@pytest.mark.functions
+def test_bloom_filter_requires_capacity_for_generators():
+    with pytest.raises(ValueError):
+        BloomFilter.from_iterable(str(i) for i in range(10))
+
+
+@pytest.mark.functions
+def test_filter_column_isin_bloom_from_file(dataframe, tmp_path):
+    allowed = tmp_path / "allowed.txt"
+    allowed.write_text("Cambridge\nBasel\n")
+    bloom_path = tmp_path / "allowed.bloom"
+    BloomFilter.from_file(allowed).save(bloom_path)
+
+    bloom = BloomFilter.load(bloom_path)
+    df = dataframe.filter_column_isin(
+        "cities", str(allowed), bloom_filter=bloom
+    )
+    assert set(df["cities"]) == {"Cambridge", "Basel"}
+
+    df = dataframe.filter_column_isin(
+        "cities", str(allowed), complement=True, bloom_filter=bloom
+    )
+    assert set(df["cities"]) == {"Shanghai"}
+
+
+DAYS = [
+    pd.Timestamp("2020-01-01"),
+    np.datetime64("2020-01-02"),
+    datetime(2020, 1, 3),
+    pd.Timedelta(days=1),
+]
+
+
+@pytest.mark.functions
+@given(
+    allowed=st.lists(
+        st.one_of(
+            st.integers(-5, 5),
+            st.sampled_from(["a", "b"] + DAYS),
+            st.none(),
+        ),
+        min_size=1,
+    ),
+    values=st.lists(
+        st.one_of(
+            st.integers(-5, 5),
+            st.sampled_from(["a", "b", "nan"] + DAYS),
+        ),
+        min_size=1,
+    ),
+    complement=st.booleans(),
+)
+def test_filter_column_isin_bloom_mixed_types(allowed, values, complement):
+    """
+    Allow-lists mixing numbers, strings, datetimes and NaN give no false
+    negatives, and the same result as the exact filter.
+    """
+    allowed = [np.nan if value is None else value for value in allowed]
+    df = pd.DataFrame({"values": pd.Series(values + [np.nan], dtype=object)})
+    bloom = BloomFilter.from_iterable(allowed, error_rate=0.2)
+
+    assert bloom.contains(allowed).all()
+    expected = df.filter_column_isin("values", allowed, complement=complement)
+    result = df.filter_column_isin(
+        "values", allowed, complement=complement, bloom_filter=bloom
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.functions
+@pytest.mark.parametrize(
+    "allowed",
+    [
+        list(pd.to_datetime(["2020-01-01", "2020-03-01"])),
+        [np.datetime64("2020-01-01"), np.datetime64("2020-03-01", "ns")],
+        [datetime(2020, 1, 1), datetime(2020, 3, 1)],
+        pd.to_datetime(["2020-01-01", "2020-03-01"]),
+    ],
+)
+def test_filter_column_isin_bloom_datetimes(allowed):
+    df = pd.DataFrame(
+        {"d": pd.to_datetime(["2020-01-01", "2020-02-01", None])}
+    )
+    bloom = BloomFilter.from_iterable(allowed)
+
+    assert bloom.contains(df["d"]).tolist()[0]
+    expected = df.filter_column_isin("d", allowed)
+    result = df.filter_column_isin("d", allowed, bloom_filter=bloom)
+    assert len(expected) == 1
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.functions
+def test_filter_column_isin_bloom_numeric_file(tmp_path):
+    allowed = tmp_path / "allowed.txt"
+    allowed.write_text("\n".join(str(i) for i in range(0, 1000, 2)))
+    df = pd.DataFrame({"id": np.arange(1000)})
+
+    bloom = BloomFilter.from_file(allowed, dtype=int)
+    result = df.filter_column_isin(
+        "id", str(allowed), bloom_filter=bloom, dtype=int
+    )
+    assert result["id"].tolist() == list(range(0, 1000, 2))
+
+    # Read as strings, the values cannot match a numeric column.
+    bloom = BloomFilter.from_file(allowed)
+    assert df.filter_column_isin("id", str(allowed), bloom_filter=bloom).empty
+
+
+@pytest.mark.functions
+def test_filter_column_isin_fuzzy():
+    df = pd.DataFrame(
+        {"vendor": ["Acme Corp", "Acme Crop", "Globex", "Initech", None]}
+    )
+    references = ["Acme Corp", "Globex Corporation", "Initech"]
+
+    result = df.filter_column_isin(
+        "vendor", references, fuzzy=True, threshold=0.75
+    )
+    assert list(result["vendor"]) == ["Acme Corp", "Acme Crop", "Initech"]
+    matches = ["Acme Corp", "Acme Corp", "Initech"]
+    assert list(result["vendor_match"]) == matches
+    assert result["vendor_score"].tolist() == [1.0, 7 / 9, 1.0]
+
+    result = df.filter_column_isin(
+        "vendor", NGramIndex(references), complement=True, fuzzy=True
+    )
+    assert list(result.columns) == ["vendor"]
+    assert set(result["vendor"].dropna()) == {"Acme Crop", "Globex"}
+
+
+@pytest.mark.functions
+def test_filter_column_isin_fuzzy_parallel():
+    df = pd.DataFrame({"vendor": ["Acme Corp", "Acme Crop", "Globex"] * 10})
+    references = ["Acme Corp", "Globex Corporation", "Initech"]
+
+    expected = df.filter_column_isin(
+        "vendor", references, fuzzy=True, threshold=0.75
+    )
+    result = df.filter_column_isin(
+        "vendor", references, fuzzy=True, threshold=0.75, n_jobs=2
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.functions
+@given(
+    references=st.lists(st.text(alphabet="abcd", max_size=8), min_size=1),
+    queries=st.lists(st.text(alphabet="abcd", min_size=1, max_size=8)),
+    threshold=st.floats(min_value=0.5, max_value=1.0),
+)
+def test_ngram_index_matches_brute_force(references, queries, threshold):
+    """
+    The n-gram index should find the same best similarity as comparing
+    against every reference string.
+    """
+    index = NGramIndex(references)
+    for query in queries:
+        best = max(
+            1 - _levenshtein(query, ref, 100) / max(len(query), len(ref), 1)
+            for ref in references
+        )
+        _, score = index.match(query, threshold)
+        if best >= threshold:
+            assert score == pytest.approx(best)
+        else:
+            assert np.isnan(score)
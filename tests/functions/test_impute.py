@@ -1,4 +1,8 @@
+import numpy as np
+import pandas as pd
 import pytest
+from hypothesis import given
+from hypothesis import strategies as st
 
 
 @pytest.mark.functions
@@ -7,6 +11,52 @@ def test_impute_single_value(missingdata_df):
     assert set(df["a"]) == set([1, 2, 5])
 
 
+@pytest.mark.functions
+def test_impute_integer_label(null_df):
+    df = null_df.impute(0, value=5)
+    assert not df[0].isnull().any()
+    assert df[1].isnull().any()
+    # The original frame is left as it was.
+    assert null_df[0].isnull().any()
+
+
+@pytest.mark.functions
+def test_impute_tuple_label():
+    df = pd.DataFrame({("a", "b"): [1.0, np.nan], ("a", "c"): [np.nan, 2.0]})
+    df = df.impute(("a", "b"), statistic="max")
+    assert df[("a", "b")].tolist() == [1.0, 1.0]
+    assert df[("a", "c")].isnull().tolist() == [True, False]
+
+
+@pytest.mark.functions
+def test_impute_many_columns():
+    df = pd.DataFrame(
+        {f"c{i}": [float(i), np.nan] for i in range(30)}, index=[5, 5]
+    )
+    df["text"] = ["x", None]
+    result = df.impute([f"c{i}" for i in range(30)], statistic="mean")
+    assert result.columns.tolist() == df.columns.tolist()
+    expected = [[float(i) for i in range(30)]] * 2
+    assert result.loc[:, "c0":"c29"].to_numpy().tolist() == expected
+    assert result["text"].isnull().tolist() == [False, True]
+
+
+@pytest.mark.functions
+def test_impute_series_value():
+    df = pd.DataFrame({"a": [1.0, np.nan, np.nan], "b": [np.nan] * 3})
+    df = df.impute("a", value=pd.Series([9.0, 8.0, 7.0]))
+    assert df["a"].tolist() == [1.0, 8.0, 7.0]
+    assert df["b"].isnull().all()
+
+
+@pytest.mark.functions
+def test_impute_dict_value():
+    df = pd.DataFrame({"a": [1.0, np.nan], "b": [np.nan, 2.0]})
+    df = df.impute(["a", "b"], value={1: 5.0})
+    assert df["a"].tolist() == [1.0, 5.0]
+    assert df["b"].isnull().tolist() == [True, False]
+
+
 @pytest.mark.functions
 @pytest.mark.parametrize(
     "statistic,expected",
@@ -24,3 +74,71 @@ def test_impute_single_value(missingdata_df):
 def test_impute_statistical(missingdata_df, statistic, expected):
     df = missingdata_df.impute("a", statistic=statistic)
     assert set(df["a"]) == expected
+
+
+@pytest.fixture
+def store_df():
+    return pd.DataFrame(
+        {
+            "store": ["a", "a", "a", "b", "b", "b", "c"],
+            "price": [1.0, 3.0, np.nan, 10.0, np.nan, 20.0, np.nan],
+            "category": ["x", "y", None, "z", "z", None, "x"],
+        }
+    )
+
+
+@pytest.mark.functions
+def test_impute_multiple_columns(missingdata_df):
+    df = missingdata_df.impute(["a", "Bell__Chart"], statistic="max")
+    assert not df[["a", "Bell__Chart"]].isnull().any().any()
+    assert df["a"].max() == missingdata_df["a"].max()
+
+
+@pytest.mark.functions
+@pytest.mark.parametrize(
+    "statistic,expected",
+    [
+        ("mean", [1.0, 3.0, 2.0, 10.0, 15.0, 20.0, np.nan]),
+        ("median", [1.0, 3.0, 2.0, 10.0, 15.0, 20.0, np.nan]),
+        ("min", [1.0, 3.0, 1.0, 10.0, 10.0, 20.0, np.nan]),
+        ("max", [1.0, 3.0, 3.0, 10.0, 20.0, 20.0, np.nan]),
+        ("mode", [1.0, 3.0, 1.0, 10.0, 10.0, 20.0, np.nan]),
+    ],
+)
+def test_impute_by_group(store_df, statistic, expected):
+    df = store_df.impute("price", statistic=statistic, by="store")
+    pd.testing.assert_series_equal(
+        df["price"], pd.Series(expected, name="price")
+    )
+
+
+@pytest.mark.functions
+def test_impute_mode_by_group_strings(store_df):
+    df = store_df.impute("category", statistic="mode", by=["store"])
+    assert df["category"].tolist() == ["x", "y", "x", "z", "z", "z", "x"]
+
+
+@pytest.mark.functions
+@given(
+    values=st.lists(
+        st.one_of(st.none(), st.integers(min_value=0, max_value=5)),
+        min_size=1,
+        max_size=30,
+    ),
+    groups=st.lists(st.sampled_from("abc"), min_size=30, max_size=30),
+)
+def test_impute_mode_by_group_matches_loop(values, groups):
+    df = pd.DataFrame(
+        {"group": groups[: len(values)], "value": values}, dtype=object
+    )
+    result = df.impute("value", statistic="mode", by="group")
+
+    for _, group in df.groupby("group"):
+        counts = group["value"].dropna().value_counts()
+        if counts.empty:
+            continue
+        expected = min(counts.index[counts == counts.max()])
+        filled = result.loc[group.index, "value"]
+        missing = group["value"].isnull()
+        assert (filled[missing] == expected).all()
+        assert (filled[~missing] == group["value"][~missing]).all()
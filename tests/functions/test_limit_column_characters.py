@@ -1,3 +1,4 @@
+import pandas as pd
 import pytest
 
 
@@ -47,3 +48,21 @@ def test_limit_column_characters_all_unique(dataframe):
     assert df.columns[2] == "de"
     assert df.columns[3] == "an"
     assert df.columns[4] == "ci"
+
+
+@pytest.mark.functions
+def test_limit_column_characters_many_duplicates():
+    columns = ["name_{}".format(i % 3) for i in range(30)]
+    df = pd.DataFrame([range(30)], columns=columns)
+    df.limit_column_characters(6)
+
+    assert list(df.columns[:6]) == [
+        "name_0",
+        "name_1",
+        "name_2",
+        "name_0_1",
+        "name_1_1",
+        "name_2_1",
+    ]
+    assert df.columns[-1] == "name_2_9"
+    assert df.columns.is_unique
@@ -1,5 +1,10 @@
+import numpy as np
+import pandas as pd
 import pytest
 
+from janitor import MinMaxScaler
+from janitor.errors import JanitorError
+
 
 @pytest.mark.functions
 def test_min_max_scale(dataframe):
@@ -25,3 +30,70 @@ def test_min_max_old_min_max_errors(dataframe):
 def test_min_max_new_min_max_errors(dataframe):
     with pytest.raises(ValueError):
         dataframe.min_max_scale(col_name="a", new_min=10, new_max=0)
+
+
+@pytest.mark.functions
+def test_min_max_scale_per_column(dataframe):
+    columns = ["a", "Bell__Chart", "decorated-elephant"]
+    df = dataframe.min_max_scale(col_name=columns, per_column=True)
+    assert (df[columns].min() == 0).all()
+    assert (df[columns].max() == 1).all()
+    assert df["cities"].equals(dataframe["cities"])
+
+
+@pytest.mark.functions
+def test_min_max_scale_shared_bounds():
+    df = pd.DataFrame({"a": [0, 5], "b": [5, 10]}).min_max_scale()
+    assert df["a"].tolist() == [0, 0.5]
+    assert df["b"].tolist() == [0.5, 1]
+
+
+@pytest.mark.functions
+def test_min_max_scale_tuple_label(multiindex_dataframe):
+    df = multiindex_dataframe.min_max_scale(col_name=("a", "b"))
+    assert df[("a", "b")].tolist() == [0, 0.5, 1]
+    assert df[("Bell__Chart", "Normal  Distribution")].tolist() == [1, 2, 3]
+
+
+@pytest.mark.functions
+def test_min_max_scale_wide():
+    df = pd.DataFrame(np.arange(60).reshape(2, 30))
+    df["text"] = ["x", "y"]
+    columns = list(range(30))
+    result = df.min_max_scale(col_name=columns, per_column=True)
+
+    assert result.columns.tolist() == df.columns.tolist()
+    assert result[columns].to_numpy().tolist() == [[0] * 30, [1] * 30]
+    assert result["text"].tolist() == ["x", "y"]
+
+
+@pytest.mark.functions
+def test_min_max_scale_float32(dataframe):
+    df = dataframe.min_max_scale(col_name="a", dtype=np.float32)
+    assert df["a"].dtype == np.float32
+    assert df["a"].tolist() == [0, 0.5, 1] * 3
+
+
+@pytest.mark.functions
+def test_min_max_scaler_partial_fit(tmp_path):
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame(rng.randn(100, 3), columns=["x", "y", "z"])
+    df.iloc[::7, 1] = np.nan
+
+    scaler = MinMaxScaler(new_min=-1, new_max=1)
+    for start in range(0, len(df), 30):
+        scaler.partial_fit(df.iloc[start:][:30])
+    expected = df.min_max_scale(new_min=-1, new_max=1, per_column=True)
+    pd.testing.assert_frame_equal(scaler.transform(df), expected)
+
+    scaler.save(tmp_path / "scaler.json")
+    loaded = MinMaxScaler.load(tmp_path / "scaler.json")
+    pd.testing.assert_frame_equal(
+        df.min_max_scale(scaler=loaded), expected, check_exact=True
+    )
+
+
+@pytest.mark.functions
+def test_min_max_scaler_not_fit(dataframe):
+    with pytest.raises(JanitorError):
+        MinMaxScaler().transform(dataframe)
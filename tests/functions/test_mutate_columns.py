@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.mark.functions
+def test_mutate_columns(dataframe):
+    with dataframe.mutate_columns() as mutations:
+        mutations.remove_columns(["a", "cities"])
+        mutations.add_column("a", 42)
+        mutations.add_columns(x=range(3), y=np.ones(9), fill_remaining=True)
+
+    df = mutations.df
+    assert list(df.columns) == [
+        "Bell__Chart",
+        "decorated-elephant",
+        "animals@#$%^",
+        "a",
+        "x",
+        "y",
+    ]
+    assert (df["a"] == 42).all()
+    assert list(df["x"]) == [0, 1, 2] * 3
+    # The original DataFrame is left untouched.
+    assert "cities" in dataframe.columns
+
+
+@pytest.mark.functions
+def test_mutate_columns_errors(dataframe):
+    mutations = dataframe.mutate_columns()
+    with pytest.raises(ValueError):
+        mutations.add_column("a", 1)
+    with pytest.raises(ValueError):
+        mutations.add_column("x", [1, 2])
+    with pytest.raises(KeyError):
+        mutations.remove_columns(["not_a_column"])
+
+    mutations.add_column("x", 1)
+    with pytest.raises(ValueError):
+        mutations.add_column("x", 2)
+
+
+@pytest.mark.functions
+def test_mutate_columns_not_applied_on_error(dataframe):
+    with pytest.raises(RuntimeError):
+        with dataframe.mutate_columns() as mutations:
+            mutations.add_column("x", 1)
+            raise RuntimeError
+    assert "x" not in mutations.df.columns
+    pd.testing.assert_frame_equal(mutations.df, dataframe)
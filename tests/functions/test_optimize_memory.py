@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import janitor  # noqa: F401
+
+
+@pytest.fixture
+def wide_df():
+    n = 1000
+    rng = np.random.RandomState(42)
+    return pd.DataFrame(
+        {
+            "flag": rng.randint(0, 2, n),
+            "count": np.arange(n),
+            "ratio": rng.rand(n),
+            "mostly_null": np.where(rng.rand(n) < 0.95, np.nan, 1.5),
+            "category": rng.choice(["a", "b", "c"], n),
+            "identifier": ["id{}".format(i) for i in range(n)],
+            "mixed": [1, "a"] * (n // 2),
+        }
+    )
+
+
+@pytest.mark.functions
+def test_optimize_memory(wide_df):
+    df = wide_df.optimize_memory(arrow_strings=False)
+    assert df["flag"].dtype == bool
+    assert df["count"].dtype == np.int16
+    assert df["ratio"].dtype == np.float64
+    assert isinstance(df["mostly_null"].dtype, pd.SparseDtype)
+    assert df["category"].dtype == "category"
+    assert df["identifier"].dtype == object
+    assert df["mixed"].dtype == object
+    assert (df["flag"] == wide_df["flag"].astype(bool)).all()
+    dense = df["mostly_null"].sparse.to_dense().astype(float)
+    assert dense.equals(wide_df["mostly_null"])
+    assert df["category"].astype(object).equals(wide_df["category"])
+    assert wide_df["category"].dtype == object
+
+
+@pytest.mark.functions
+def test_optimize_memory_report(wide_df):
+    df = wide_df.optimize_memory(arrow_strings=False)
+    report = df.memory_report
+    assert list(report.index) == [
+        "flag",
+        "count",
+        "ratio",
+        "mostly_null",
+        "category",
+    ]
+    assert report.loc["mostly_null", "optimization"] == "sparse"
+    assert (report["bytes_saved"].drop("ratio") > 0).all()
+    assert (
+        report["bytes_after"].sum()
+        < wide_df[report.index].memory_usage(index=False, deep=True).sum()
+    )
+
+
+@pytest.mark.functions
+def test_optimize_memory_arrow_strings(wide_df):
+    pytest.importorskip("pyarrow")
+    df = wide_df.optimize_memory()
+    assert df["identifier"].dtype == "string[pyarrow]"
+    assert df.memory_report.loc["identifier", "optimization"] == (
+        "arrow_string"
+    )
+    assert df["identifier"].astype(object).equals(wide_df["identifier"])
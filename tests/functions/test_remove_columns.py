@@ -5,3 +5,9 @@ import pytest
 def test_remove_columns(dataframe):
     df = dataframe.remove_columns(columns=["a"])
     assert len(df.columns) == 4
+
+
+@pytest.mark.functions
+def test_remove_columns_many(dataframe):
+    df = dataframe.remove_columns(columns=["a", "cities", "Bell__Chart"])
+    assert list(df.columns) == ["decorated-elephant", "animals@#$%^"]
@@ -1,4 +1,8 @@
+import numpy as np
+import pandas as pd
 import pytest
+from hypothesis import given
+from hypothesis import strategies as st
 
 
 @pytest.mark.functions
@@ -13,3 +17,49 @@ def test_round_to_nearest_half(dataframe):
     assert df.iloc[6, 1] == 1.0
     assert df.iloc[7, 1] == 2.5
     assert df.iloc[8, 1] == 3.0
+
+
+@pytest.mark.functions
+@given(
+    values=st.lists(
+        st.floats(min_value=-1e6, max_value=1e6, allow_nan=False), min_size=1
+    ),
+    denominator=st.integers(min_value=1, max_value=16),
+)
+def test_round_to_fraction_matches_python_round(values, denominator):
+    df = pd.DataFrame({"x": values}).round_to_fraction("x", denominator)
+    expected = [round(v * denominator) / denominator for v in values]
+    assert df["x"].tolist() == expected
+
+
+@pytest.mark.functions
+def test_round_to_fraction_nan_and_inf():
+    df = pd.DataFrame({"x": [1.3, np.nan, np.inf, -np.inf]})
+    df = df.round_to_fraction("x", 2)
+    assert df["x"].iloc[0] == 1.5
+    assert np.isnan(df["x"].iloc[1])
+    assert df["x"].iloc[2] == np.inf
+    assert df["x"].iloc[3] == -np.inf
+
+
+@pytest.mark.functions
+def test_round_to_fraction_multiple_columns(dataframe):
+    df = dataframe.round_to_fraction(["a", "Bell__Chart"], 3, digits=2)
+    assert df["a"].tolist() == [1.0, 2.0, 3.0] * 3
+    assert df["Bell__Chart"].tolist() == [1.33, 2.33, 3.33] * 3
+
+
+@pytest.mark.functions
+def test_round_to_fraction_all_numeric_columns(dataframe):
+    df = dataframe.round_to_fraction(denominator=1)
+    assert df["Bell__Chart"].tolist() == [1.0, 2.0, 3.0] * 3
+    assert df["decorated-elephant"].tolist() == [1.0, 2.0, 3.0] * 3
+    assert df["animals@#$%^"].dtype == object
+
+
+@pytest.mark.functions
+def test_round_to_fraction_inplace():
+    values = np.array([0.2, 1.7, 2.5])
+    df = pd.DataFrame({"x": values}, copy=False)
+    df.round_to_fraction("x", 1, inplace=True)
+    assert df["x"].tolist() == [0.0, 2.0, 2.0]
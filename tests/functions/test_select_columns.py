@@ -1,3 +1,6 @@
+import re
+
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -30,3 +33,44 @@ def test_select_columns_glob_inputs(dataframe, invert, expected):
     df = dataframe.select_columns(search_cols=columns, invert=invert)
 
     pd.testing.assert_frame_equal(df, dataframe[expected])
+
+
+@pytest.mark.functions
+def test_select_columns_no_duplicates(dataframe):
+    df = dataframe.select_columns(["a*", "a", "*"])
+    assert list(df.columns) == [
+        "a",
+        "animals@#$%^",
+        "Bell__Chart",
+        "decorated-elephant",
+        "cities",
+    ]
+
+
+@pytest.mark.functions
+@pytest.mark.parametrize(
+    "search_cols,expected",
+    [
+        ([re.compile(r"[A-Z]")], ["Bell__Chart"]),
+        ([re.compile(r".*-")], ["decorated-elephant"]),
+        ([np.number], ["a", "Bell__Chart", "decorated-elephant"]),
+        ([np.dtype(float)], ["Bell__Chart"]),
+        ([lambda s: s.dtype == object], ["animals@#$%^", "cities"]),
+        (["cities", np.integer], ["cities", "a", "decorated-elephant"]),
+    ],
+)
+def test_select_columns_selector_types(dataframe, search_cols, expected):
+    df = dataframe.select_columns(search_cols)
+    pd.testing.assert_frame_equal(df, dataframe[expected])
+
+
+@pytest.mark.functions
+def test_select_columns_invert_selector_types(dataframe):
+    df = dataframe.select_columns([np.number, "c*"], invert=True)
+    pd.testing.assert_frame_equal(df, dataframe[["animals@#$%^"]])
+
+
+@pytest.mark.functions
+def test_select_columns_non_string_labels():
+    df = pd.DataFrame([[1, 2, 3]], columns=[0, 1, "a[0]"])
+    assert list(df.select_columns([1, "a[0]"]).columns) == [1, "a[0]"]
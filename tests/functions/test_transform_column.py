@@ -2,6 +2,8 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from janitor.errors import JanitorError
+
 
 @pytest.mark.functions
 def test_transform_column(dataframe):
@@ -24,3 +26,45 @@ def test_transform_column_with_dest(dataframe):
     )
 
     pd.testing.assert_frame_equal(df, expected_df)
+
+
+@pytest.mark.functions
+def test_transform_column_not_elementwise(dataframe):
+    df = dataframe.transform_column(
+        "a", lambda s: s - s.mean(), elementwise=False
+    )
+    assert df["a"].tolist() == [-1.0, 0.0, 1.0] * 3
+
+
+@pytest.mark.functions
+@pytest.mark.parametrize("elementwise", [True, False])
+def test_transform_column_multiprocessing(dataframe, elementwise):
+    expected = np.sqrt(dataframe["a"])
+    df = dataframe.transform_column(
+        "a",
+        np.sqrt,
+        engine="multiprocessing",
+        elementwise=elementwise,
+        n_jobs=2,
+    )
+    pd.testing.assert_series_equal(df["a"], expected)
+
+
+@pytest.mark.functions
+@pytest.mark.parametrize("elementwise", [True, False])
+def test_transform_column_numba(dataframe, elementwise):
+    pytest.importorskip("numba")
+
+    def double(x):
+        return x * 2
+
+    df = dataframe.transform_column(
+        "a", double, dest_col_name="b", engine="numba", elementwise=elementwise
+    )
+    assert df["b"].tolist() == [2, 4, 6] * 3
+
+
+@pytest.mark.functions
+def test_transform_column_unknown_engine(dataframe):
+    with pytest.raises(JanitorError):
+        dataframe.transform_column("a", np.sqrt, engine="spark")
@@ -22,3 +22,333 @@ def test_smiles2mol(chemdf, progressbar):
 def test_morganbits(chemdf):
     morgans = chemdf.smiles2mol("smiles", "mol").morganbits("mol")
     assert morgans.shape == (10, 2048)
+
+
+@pytest.mark.chemistry
+def test_smiles2mol_parses_each_smiles_once(chemdf, monkeypatch):
+    parsed = []
+    parse_smiles = janitor.chemistry._parse_smiles
+
+    def counting_parse(smiles):
+        parsed.extend(smiles)
+        return parse_smiles(smiles)
+
+    monkeypatch.setattr(janitor.chemistry, "_parse_smiles", counting_parse)
+    repeated = pd.concat([chemdf] * 3, ignore_index=True)
+    repeated = repeated.smiles2mol("smiles", "mol")
+
+    assert sorted(parsed) == sorted(chemdf["smiles"])
+    assert len(repeated) == 30
+    assert repeated["mol"][0] is repeated["mol"][10]
+
+
+@pytest.mark.chemistry
+def test_smiles2mol_invalid_and_missing():
+    from rdkit import Chem
+
+    df = pd.DataFrame({"smiles": ["CCO", "not a smiles", None, "CCO"]})
+    kept = df.copy().smiles2mol("smiles", "mol", drop_nulls=False)
+    assert kept["mol"].isna().tolist() == [False, True, True, False]
+    assert Chem.MolToSmiles(kept["mol"][0]) == "CCO"
+
+    dropped = df.smiles2mol("smiles", "mol")
+    assert dropped["smiles"].tolist() == ["CCO", "CCO"]
+
+
+@pytest.mark.chemistry
+def test_smiles2mol_n_jobs(chemdf):
+    from rdkit import Chem
+
+    serial = chemdf.copy().smiles2mol("smiles", "mol")
+    parallel = chemdf.copy().smiles2mol(
+        "smiles", "mol", progressbar="terminal", n_jobs=2
+    )
+    assert [Chem.MolToSmiles(m) for m in parallel["mol"]] == [
+        Chem.MolToSmiles(m) for m in serial["mol"]
+    ]
+
+
+@pytest.mark.chemistry
+def test_smiles2mol_cache(chemdf, tmp_path, monkeypatch):
+    from rdkit import Chem
+
+    df = chemdf.copy()
+    df.loc[0, "smiles"] = "not a smiles"
+    path = tmp_path / "mols.sqlite"
+    first = df.copy().smiles2mol("smiles", "mol", cache=path)
+
+    def fail(smiles):
+        if smiles:
+            raise AssertionError("SMILES parsed despite the cache")
+        return []
+
+    monkeypatch.setattr(janitor.chemistry, "_parse_smiles", fail)
+    cache = janitor.chemistry.MolCache(path)
+    second = df.copy().smiles2mol("smiles", "mol", cache=cache)
+
+    assert len(second) == 9
+    assert [Chem.MolToSmiles(m) for m in second["mol"]] == [
+        Chem.MolToSmiles(m) for m in first["mol"]
+    ]
+    cache.clear()
+    assert cache.get_many(df["smiles"]) == {}
+
+
+@pytest.mark.parametrize("output", ["dense", "packed", "sparse"])
+@pytest.mark.chemistry
+def test_morganbits_output(chemdf, output):
+    import numpy as np
+    from rdkit.Chem import AllChem
+
+    mols = chemdf.smiles2mol("smiles", "mol")
+    mols.index = mols.index + 100
+    morgans = mols.morganbits("mol", radius=2, nbits=1024, output=output)
+
+    expected = np.zeros((10, 1024), dtype=np.uint8)
+    for row, mol in enumerate(mols["mol"]):
+        fp = AllChem.GetMorganFingerprintAsBitVect(mol, 2, 1024)
+        expected[row, list(fp.GetOnBits())] = 1
+    if output == "packed":
+        assert morgans.shape == (10, 128)
+        bits = np.unpackbits(morgans.to_numpy(), axis=1)
+    elif output == "sparse":
+        assert morgans.sparse.density < 0.1
+        bits = morgans.sparse.to_coo().toarray()
+    else:
+        bits = morgans.to_numpy()
+    assert (morgans.dtypes.map(str) != "float64").all()
+    np.testing.assert_array_equal(bits, expected)
+    assert morgans.index.equals(mols.index)
+
+
+@pytest.mark.chemistry
+def test_morganbits_missing_mols_and_n_jobs(chemdf):
+    mols = chemdf.smiles2mol("smiles", "mol")
+    mols.loc[3, "mol"] = None
+    serial = mols.morganbits("mol", output="packed")
+    parallel = mols.morganbits("mol", output="packed", n_jobs=2)
+
+    assert (serial.loc[3] == 0).all()
+    assert (serial.drop(index=3).sum(axis=1) > 0).all()
+    assert serial.equals(parallel)
+
+
+@pytest.mark.chemistry
+def test_morganbits_invalid_output(chemdf):
+    with pytest.raises(ValueError):
+        chemdf.smiles2mol("smiles", "mol").morganbits("mol", output="bits")
+
+
+def _brute_force_tanimoto(queries, library):
+    import numpy as np
+
+    queries = np.unpackbits(queries, axis=1).astype(int)
+    library = np.unpackbits(library, axis=1).astype(int)
+    common = queries @ library.T
+    union = queries.sum(1)[:, None] + library.sum(1)[None, :] - common
+    return common / np.where(union == 0, 1, union)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+@pytest.mark.chemistry
+def test_tanimoto_topk(n_jobs, monkeypatch):
+    import numpy as np
+
+    monkeypatch.setattr(janitor.chemistry, "_QUERY_BLOCK_SIZE", 128)
+    rng = np.random.default_rng(42)
+    # 100 bits, which is not a whole number of 64-bit words.
+    library = pd.DataFrame(
+        np.packbits(rng.random((700, 100)) < 0.2, axis=1),
+        index=[f"lib{i}" for i in range(700)],
+    )
+    queries = pd.DataFrame(np.packbits(rng.random((300, 100)) < 0.2, axis=1))
+    result = queries.tanimoto_topk(library, k=3, n_jobs=n_jobs, block_size=64)
+
+    expected = _brute_force_tanimoto(queries.to_numpy(), library.to_numpy())
+    assert len(result) == 900
+    for query, group in result.groupby("query"):
+        similarities = np.sort(expected[query])[::-1][:3]
+        np.testing.assert_allclose(group["similarity"], similarities, 1e-6)
+        neighbors = library.index.get_indexer(group["neighbor"])
+        np.testing.assert_allclose(
+            expected[query, neighbors], similarities, 1e-6
+        )
+
+
+@pytest.mark.chemistry
+def test_tanimoto_topk_self_search(chemdf):
+    from rdkit import DataStructs
+    from rdkit.Chem import AllChem
+
+    mols = chemdf.smiles2mol("smiles", "mol")
+    packed = mols.morganbits("mol", radius=2, nbits=1024, output="packed")
+    result = packed.tanimoto_topk(k=20)
+
+    # Each of the 10 molecules against the 9 others.
+    assert len(result) == 90
+    assert (result["query"] != result["neighbor"]).all()
+    fps = [
+        AllChem.GetMorganFingerprintAsBitVect(mol, 2, 1024)
+        for mol in mols["mol"]
+    ]
+    for query, neighbor, similarity in result.itertuples(index=False):
+        expected = DataStructs.TanimotoSimilarity(fps[query], fps[neighbor])
+        assert similarity == pytest.approx(expected, rel=1e-6)
+
+
+@pytest.mark.chemistry
+def test_mol_descriptors(chemdf):
+    import numpy as np
+    from rdkit.Chem import Descriptors
+
+    mols = chemdf.smiles2mol("smiles", "mol", drop_nulls=False)
+    mols.index = mols.index * 2
+    mols.loc[4, "mol"] = None
+    names = ["MolWt", "MolLogP", "TPSA", "RingCount"]
+    serial = mols.mol_descriptors("mol", names)
+    parallel = mols.mol_descriptors("mol", names, n_jobs=2)
+
+    assert serial.columns.tolist() == names
+    assert (serial.dtypes == np.float32).all()
+    assert serial.index.equals(mols.index)
+    assert serial.loc[4].isna().all()
+    assert serial.drop(index=4).notna().all().all()
+    mol = mols.loc[0, "mol"]
+    assert serial.loc[0, "MolWt"] == np.float32(Descriptors.MolWt(mol))
+    assert serial.loc[0, "TPSA"] == np.float32(Descriptors.TPSA(mol))
+    assert serial.equals(parallel)
+
+
+@pytest.mark.chemistry
+def test_mol_descriptors_all_and_unknown(chemdf):
+    from rdkit.Chem import Descriptors
+
+    mols = chemdf.smiles2mol("smiles", "mol")
+    descriptors = mols.mol_descriptors("mol", progressbar="terminal")
+    assert descriptors.shape == (10, len(Descriptors.descList))
+
+    with pytest.raises(ValueError):
+        mols.mol_descriptors("mol", ["MolWt", "NotADescriptor"])
+
+
+@pytest.fixture
+def chem_library():
+    filename = os.path.join(pytest.TEST_DATA_DIR, "corrected_smiles.txt")
+    df = pd.read_csv(filename, sep="\t", header=None).head(100)
+    df.columns = ["id", "smiles"]
+    return df.smiles2mol("smiles", "mol")
+
+
+@pytest.mark.parametrize(
+    "smarts", ["c1ccccc1", "[Cl]", "C(=O)[OH]", "[#7]", "[R]", "C1CCCCC1"]
+)
+@pytest.mark.chemistry
+def test_filter_substructure(chem_library, smarts):
+    from rdkit import Chem
+
+    pattern = Chem.MolFromSmarts(smarts)
+    criteria = [mol.HasSubstructMatch(pattern) for mol in chem_library["mol"]]
+    result = chem_library.filter_substructure("mol", smarts)
+    assert result.index.equals(chem_library.index[criteria])
+
+    parallel = chem_library.filter_substructure("mol", smarts, n_jobs=2)
+    assert parallel.index.equals(result.index)
+
+    complement = chem_library.filter_substructure(
+        "mol", smarts, complement=True
+    )
+    assert complement.index.equals(chem_library.index.difference(result.index))
+
+
+@pytest.mark.chemistry
+def test_filter_substructure_reuses_screens(
+    chem_library, monkeypatch, tmp_path
+):
+    fingerprinted = []
+    pattern_on_bits = janitor.chemistry._pattern_on_bits
+
+    def counting_pattern_on_bits(fp_size, mols):
+        fingerprinted.extend(mols)
+        return pattern_on_bits(fp_size, mols)
+
+    monkeypatch.setattr(
+        janitor.chemistry, "_pattern_on_bits", counting_pattern_on_bits
+    )
+    chem_library.loc[5, "mol"] = None
+    screens = tmp_path / "screens.npz"
+    ring = chem_library.filter_substructure(
+        "mol", "c1ccccc1", screens=str(screens), smiles_col="smiles"
+    )
+    assert 5 not in ring.index
+    # The pattern, then the 100 mols.
+    assert len(fingerprinted) == 101
+
+    # Screens are kept on both frames, and only patterns are fingerprinted.
+    chlorinated = ring.filter_substructure("mol", "[Cl]")
+    chem_library.filter_substructure("mol", "[Cl]")
+    assert len(fingerprinted) == 103
+
+    # They are recomputed if the mols change.
+    changed = chem_library.copy()
+    changed["mol"] = changed["smiles"].map(
+        janitor.chemistry.Chem.MolFromSmiles
+    )
+    changed.filter_substructure("mol", "[Cl]")
+    assert len(fingerprinted) == 204
+
+    # A new frame of the same mols is screened from the file.
+    reloaded = chem_library.copy()
+    assert "substructure_screens" not in reloaded.__dict__
+    result = reloaded.filter_substructure(
+        "mol", "[Cl]", screens=str(screens), smiles_col="smiles"
+    )
+    assert len(fingerprinted) == 205
+    assert result.index.equals(
+        chem_library.filter_substructure("mol", "[Cl]").index
+    )
+    assert set(chlorinated.index) <= set(result.index)
+
+
+@pytest.mark.chemistry
+@pytest.mark.parametrize("name", ["screens.npz", "screens.npy"])
+def test_filter_substructure_screens_file_other_mols(tmp_path, name):
+    screens = str(tmp_path / name)
+
+    def phenols(df):
+        return df.filter_substructure(
+            "m", "c1ccccc1O", screens=screens, smiles_col="smiles"
+        )["smiles"].tolist()
+
+    a = pd.DataFrame({"smiles": ["c1ccccc1O", "CCCC", "CCN"]})
+    a = a.smiles2mol("smiles", "m")
+    assert phenols(a) == ["c1ccccc1O"]
+
+    # The same mols, reordered.
+    b = a.iloc[::-1].reset_index(drop=True)
+    b = b.smiles2mol("smiles", "m")
+    assert phenols(b) == ["c1ccccc1O"]
+
+    # Other mols, as many.
+    c = pd.DataFrame({"smiles": ["CCO", "c1ccccc1OC", "CC"]})
+    c = c.smiles2mol("smiles", "m")
+    assert phenols(c) == ["c1ccccc1OC"]
+
+    # The same SMILES, of which a mol was missing when the file was saved.
+    missing = c.copy()
+    missing.loc[1, "m"] = None
+    assert phenols(missing) == []
+    assert phenols(c.copy()) == ["c1ccccc1OC"]
+
+
+@pytest.mark.chemistry
+def test_filter_substructure_screens_without_smiles_col(chem_library):
+    with pytest.raises(ValueError):
+        chem_library.filter_substructure(
+            "mol", "c1ccccc1", screens="screens.npz"
+        )
+
+
+@pytest.mark.chemistry
+def test_filter_substructure_invalid_smarts(chem_library):
+    with pytest.raises(ValueError):
+        chem_library.filter_substructure("mol", "c1cc(")